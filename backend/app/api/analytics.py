@@ -0,0 +1,66 @@
+# backend/app/api/analytics.py
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.security import get_current_active_staff, get_current_active_admin
+from app.models.user import User
+from app.schemas.analytics import AccessBucket, AccessRollupRebuild
+from app.services.access_rollup_service import query_access_rollups, rebuild_rollups, to_naive_utc
+
+router = APIRouter()
+
+# Longest range served in one request
+MAX_RANGE = timedelta(days=366)
+
+
+@router.get("/access", response_model=List[AccessBucket])
+def read_access_analytics(
+    db: Session = Depends(get_db),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    hotel_id: Optional[str] = None,
+    room_id: Optional[str] = None,
+    lock_id: Optional[str] = None,
+    outcome: Optional[str] = Query(None, pattern="^(granted|denied)$"),
+    granularity: str = Query("hour", pattern="^(hour|day)$"),
+    current_user: User = Depends(get_current_active_staff)
+) -> Any:
+    """
+    Door access counts per hotel, room, lock and outcome (staff only)
+
+    Served from pre-aggregated hourly rollups; defaults to the last 24 hours.
+    Times are UTC.
+    """
+    end = to_naive_utc(end) if end else datetime.now(timezone.utc).replace(tzinfo=None)
+    start = to_naive_utc(start) if start else end - timedelta(hours=24)
+    if start >= end or end - start > MAX_RANGE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid time range"
+        )
+
+    return query_access_rollups(
+        db,
+        start,
+        end,
+        hotel_id=hotel_id,
+        room_id=room_id,
+        lock_id=lock_id,
+        outcome=outcome,
+        granularity=granularity,
+    )
+
+
+@router.post("/access/rebuild", response_model=AccessRollupRebuild)
+def rebuild_access_analytics(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Rebuild access rollups from raw key events (admin only)
+    """
+    return {"events_folded": rebuild_rollups(db)}
@@ -1,6 +1,7 @@
 # backend/app/api/auth.py
+import asyncio
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
@@ -9,7 +10,15 @@ from jose import JWTError, jwt
 from pydantic import EmailStr
 
 from app.db.session import get_db
-from app.security import create_access_token, verify_password, get_password_hash
+from app.security import (
+    create_access_token,
+    get_password_hash,
+    get_password_hash_async,
+    verify_and_update_password_async,
+    get_user_by_subject,
+    invalidate_user_principal,
+)
+from app.utils.worker_pool import PoolSaturatedError
 from app.models.user import User, UserRole
 from app.schemas.user import Token, TokenPayload, User as UserSchema, UserCreate
 from app.config import settings
@@ -19,8 +28,29 @@ from app.utils.email import send_welcome_email, send_password_reset_email
 router = APIRouter()
 
 
+def _password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent authentication requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
+# Database work of the async endpoints below, run in a thread via asyncio.to_thread
+# so only the bcrypt work is awaited on the event loop
+
+def _get_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _save_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
+
 @router.post("/login", response_model=Token)
-def login_access_token(
+async def login_access_token(
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
@@ -28,13 +58,16 @@ def login_access_token(
     OAuth2 compatible token login, get an access token for future requests
     """
     # Find user by email
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await asyncio.to_thread(_get_user_by_email, db, form_data.username)
     
-    # Validate user and password
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        print(f"Password verification result: {verify_password(form_data.password, user.hashed_password)}")
-        print(f"Attempted password: {form_data.password}")
-        print(f"Stored hash: {user.hashed_password}")
+    # Validate user and password (bcrypt runs on the password pool)
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+        except PoolSaturatedError:
+            raise _password_pool_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -48,11 +81,16 @@ def login_access_token(
             detail="Inactive user account"
         )
     
+    # Transparently upgrade hashes created with older cost parameters
+    if new_hash:
+        user.hashed_password = new_hash
+        await asyncio.to_thread(_save_user, db, user)
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
         "access_token": create_access_token(
-            subject=user.email, 
+            subject=user.id, 
             expires_delta=access_token_expires
         ),
         "token_type": "bearer",
@@ -60,7 +98,7 @@ def login_access_token(
 
 
 @router.post("/register", response_model=UserSchema)  # Change User to UserSchema
-def register_user(
+async def register_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
@@ -70,7 +108,7 @@ def register_user(
     Register a new user
     """
     # Check if user already exists
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = await asyncio.to_thread(_get_user_by_email, db, user_in.email)
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -86,7 +124,10 @@ def register_user(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_in.password)
+    try:
+        hashed_password = await get_password_hash_async(user_in.password)
+    except PoolSaturatedError:
+        raise _password_pool_busy()
     db_user = User(
         email=user_in.email,
         hashed_password=hashed_password,
@@ -97,9 +138,7 @@ def register_user(
         is_active=True
     )
     
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await asyncio.to_thread(_save_user, db, db_user)
     
     # Send welcome email in background
     background_tasks.add_task(
@@ -128,7 +167,7 @@ def request_password_reset(
     
     # Generate password reset token
     password_reset_token = create_access_token(
-        subject=user.email,
+        subject=user.id,
         expires_delta=timedelta(hours=24)
     )
 
@@ -166,7 +205,7 @@ def reset_password(
                 detail="Token has expired"
             )
         
-        email = token_data.sub
+        subject = token_data.sub
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -174,7 +213,7 @@ def reset_password(
         )
     
     # Find user
-    user = db.query(User).filter(User.email == email).first()
+    user = get_user_by_subject(db, subject)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -193,5 +232,6 @@ def reset_password(
     user.hashed_password = get_password_hash(new_password)
     db.add(user)
     db.commit()
+    invalidate_user_principal(user.id)
     
     return {"message": "Password updated successfully"}
@@ -0,0 +1,71 @@
+# backend/app/api/events.py
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.security import get_current_active_staff
+from app.models.key_event import EVENT_TYPE_CODES
+from app.models.user import User
+from app.services.event_export_service import export_key_events
+
+router = APIRouter()
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get("/export")
+def export_events(
+    db: Session = Depends(get_db),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    hotel_id: Optional[str] = None,
+    room_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: List[str] = Query(None),
+    current_user: User = Depends(get_current_active_staff)
+):
+    """
+    Export key events for audits (staff only)
+
+    Rows are streamed from a server-side cursor, oldest first, so memory use
+    is constant regardless of the size of the export
+    """
+    # Event types are stored as codes, so only registered types can be matched
+    unknown = [name for name in event_type or [] if name not in EVENT_TYPE_CODES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown event type: {', '.join(unknown)}"
+        )
+
+    # The request session is closed once the endpoint returns, so the stream
+    # gets its own session on the same connection pool
+    stream_db = Session(bind=db.get_bind())
+
+    def stream():
+        try:
+            yield from export_key_events(
+                stream_db,
+                format,
+                hotel_id=hotel_id,
+                room_id=room_id,
+                start=start,
+                end=end,
+                event_types=event_type,
+            )
+        finally:
+            stream_db.close()
+
+    filename = f"key_events_{datetime.now().strftime('%Y%m%d%H%M%S')}.{format}"
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,13 +1,15 @@
 # backend/app/api/hotels.py
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.security import get_current_user, get_current_active_admin
 from app.models.user import User
 from app.models.hotel import Hotel
+from app.services.hotel_service import invalidate_hotel
+from app.utils.pagination import paginate
 from app.schemas.hotel import (
     Hotel as HotelSchema,
     HotelCreate,
@@ -38,6 +40,12 @@ def create_hotel(
         email=hotel_in.email,
         website=hotel_in.website,
         logo_url=hotel_in.logo_url,
+        timezone=hotel_in.timezone or "Europe/Paris",
+        latitude=hotel_in.latitude,
+        longitude=hotel_in.longitude,
+        background_color=hotel_in.background_color,
+        foreground_color=hotel_in.foreground_color,
+        label_color=hotel_in.label_color,
         is_active=True
     )
     
@@ -50,15 +58,24 @@ def create_hotel(
 
 @router.get("", response_model=List[HotelSchema])
 def read_hotels(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """
     Retrieve hotels
     """
-    hotels = db.query(Hotel).filter(Hotel.is_active == True).offset(skip).limit(limit).all()
+    hotels, _ = paginate(
+        db.query(Hotel).filter(Hotel.is_active == True),
+        (Hotel.created_at, Hotel.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        response=response,
+    )
     return hotels
 
 
@@ -106,6 +123,9 @@ def update_hotel(
     db.commit()
     db.refresh(hotel)
 
+    # Make wallet, email and SMS code paths pick up the new values
+    invalidate_hotel(hotel.id)
+
     return hotel
 
 
@@ -132,4 +152,6 @@ def delete_hotel(
     db.add(hotel)
     db.commit()
     
+    invalidate_hotel(hotel.id)
+    
     return None
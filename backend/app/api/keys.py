@@ -9,8 +9,10 @@ from pydantic import BaseModel
 from app.services.wallet_service import create_wallet_pass, settings
 from app.services.key_service import update_checkout_date, activate_key, deactivate_key
 from app.services.wallet_push_service import send_push_notifications, send_push_notifications_production
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status
-from sqlalchemy.orm import Session, joinedload
+from app.services.credential_service import issue_credential
+from app.services.revocation_service import sync_key_revocation
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, status, Response
+from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.security import get_current_user, get_current_active_staff
@@ -19,6 +21,7 @@ from app.models.digital_key import DigitalKey, KeyStatus
 from app.models.key_event import KeyEvent
 from app.models.reservation import Reservation, ReservationStatus
 from app.models.room import Room
+from app.utils.pagination import paginate
 from app.schemas.digital_key import (
     DigitalKey as DigitalKeySchema,
     DigitalKeyCreate,
@@ -31,7 +34,9 @@ from app.services.pass_update_service import update_wallet_pass_status
 from app.utils.date_formatting import format_datetime
 from app.services.sms_service import validate_phone_number, send_sms
 from app.schemas.sms import SMSResponseModel
-from app.services.hotel_service import get_hotel_name
+from app.services.hotel_service import get_hotel_name, get_hotel_timezone
+from app.services.listing_service import key_projection
+from app.utils.serialization import list_response
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -122,13 +127,21 @@ def create_digital_key(
     # Create pass data for wallet pass
     pass_data = {
         "key_uuid": key_uuid,
+        "hotel_id": room.hotel_id,
         "hotel_name": room.hotel.name,
         "room_number": room.room_number,
         "guest_name": f"{user.first_name} {user.last_name}",
         "check_in": reservation.check_in.isoformat(),
         "check_out": reservation.check_out.isoformat(),
+        "valid_from": digital_key.valid_from.isoformat(),
+        "valid_until": digital_key.valid_until.isoformat(),
         "nfc_lock_id": room.nfc_lock_id
     }
+    # Signed offline credential embedded in the pass
+    if room.nfc_lock_id:
+        pass_data["credential"] = issue_credential(
+            key_uuid, room.nfc_lock_id, digital_key.valid_from, digital_key.valid_until
+        )
 
     # Create wallet pass with the database session
     try:
@@ -143,7 +156,12 @@ def create_digital_key(
             event_type="key_created",
             device_info=f"API request by {current_user.email}",
             status="success",
-            details=f"Created {key_in.pass_type.value} pass for room {room.room_number}, valid {digital_key.valid_from} to {digital_key.valid_until}",
+            details={
+                "pass_type": key_in.pass_type.value,
+                "room_number": room.room_number,
+                "valid_from": digital_key.valid_from.isoformat(),
+                "valid_until": digital_key.valid_until.isoformat(),
+            },
             timestamp=datetime.now(timezone.utc)
         )
         db.add(key_event)
@@ -156,7 +174,7 @@ def create_digital_key(
             event_type="key_creation_failed",
             device_info=f"API request by {current_user.email}",
             status="error",
-            details=f"Error creating pass: {str(e)}",
+            details={"error": str(e)},
             timestamp=datetime.now(timezone.utc)
         )
         db.add(key_event)
@@ -190,7 +208,7 @@ def create_digital_key(
                 event_type="key_email_scheduled",
                 device_info=f"API request by {current_user.email}",
                 status="success",
-                details=f"Email scheduled to be sent to {user.email}",
+                details={"email": user.email},
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(key_event)
@@ -204,7 +222,7 @@ def create_digital_key(
                 event_type="key_email_scheduling_failed",
                 device_info=f"API request by {current_user.email}",
                 status="error",
-                details=f"Failed to schedule email: {str(e)}",
+                details={"error": str(e)},
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(key_event)
@@ -220,11 +238,12 @@ def create_digital_key(
         
         if valid_numbers:
             # Create SMS content
-            hotel_name = room.hotel.name if room and hasattr(room, 'hotel') and room.hotel else get_hotel_name(db, room.hotel_id)
+            hotel_name = get_hotel_name(db, room.hotel_id)
+            hotel_timezone = get_hotel_timezone(db, room.hotel_id)
             sms_content = (
                 f"Your digital key for {hotel_name} is ready. "
                 f"Room: {room.room_number}, "
-                f"Check-in: {format_datetime(reservation.check_in)}, "
+                f"Check-in: {format_datetime(reservation.check_in, hotel_timezone)}, "
                 f"Key URL: {pass_url}"
             )
             
@@ -244,7 +263,7 @@ def create_digital_key(
                             event_type="key_sms_sent",
                             device_info=f"API request by {current_user.email}",
                             status="success",
-                            details=f"SMS sent to {phone} for {key_in.pass_type.value} pass",
+                            details={"phone": phone, "pass_type": key_in.pass_type.value},
                             timestamp=datetime.now(timezone.utc)
                         )
                         db.add(key_event)
@@ -257,7 +276,7 @@ def create_digital_key(
                             event_type="key_sms_failed",
                             device_info=f"API request by {current_user.email}",
                             status="error", 
-                            details=f"Failed to send SMS to {phone}: {message}",
+                            details={"phone": phone, "error": message},
                             timestamp=datetime.now(timezone.utc)
                         )
                         db.add(event)
@@ -272,7 +291,7 @@ def create_digital_key(
                         event_type="key_sms_failed",
                         device_info=f"API request by {current_user.email}",
                         status="error", 
-                        details=f"Failed to send SMS to {phone}: {str(e)}",
+                        details={"phone": phone, "error": str(e)},
                         timestamp=datetime.now(timezone.utc)
                     )
                     db.add(event)
@@ -305,21 +324,30 @@ def read_keys(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     reservation_id: str = None,
     current_user: User = Depends(get_current_active_staff)
 ) -> Any:
     """
     Retrieve digital keys, filtered by reservation if provided
+    
+    Newest first, paginated with the X-Next-Cursor response header.
+    Rows are read as columns straight into the response (see listing_service).
     """
-    query = db.query(DigitalKey).options(
-        joinedload(DigitalKey.reservation).joinedload(Reservation.user)
-    )
+    query = key_projection.query(db)
     
     if reservation_id:
         query = query.filter(DigitalKey.reservation_id == reservation_id)
     
-    keys = query.offset(skip).limit(limit).all()
-    return keys
+    rows, next_cursor = paginate(
+        query,
+        (DigitalKey.created_at, DigitalKey.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        descending=True,
+    )
+    return list_response(key_projection.read(rows), next_cursor)
 
 
 @router.get("/{key_id}", response_model=DigitalKeySchema)
@@ -375,6 +403,7 @@ def update_key(
         setattr(key, field, value)
     
     db.add(key)
+    sync_key_revocation(db, key)
     db.commit()
     db.refresh(key)
     
@@ -384,7 +413,7 @@ def update_key(
         event_type="key_updated",
         device_info=f"API request by {current_user.email}",
         status="success",
-        details=f"Updated key status to {key_in.status}",
+        details={"key_status": getattr(key_in.status, "value", key_in.status)},
         timestamp=datetime.now(timezone.utc)
     )
     db.add(event)
@@ -453,6 +482,7 @@ def extend_key_validity(
     # Make sure to save these changes to the database
     db.add(key)
     db.add(reservation)
+    sync_key_revocation(db, key)
     db.commit()
     db.refresh(key)
     
@@ -483,7 +513,10 @@ def extend_key_validity(
         event_type="key_extended",
         device_info=f"API request by {current_user.email}",
         status="success",
-        details=f"Extended from {original_valid_until} until: {key.valid_until}",
+        details={
+            "previous_valid_until": original_valid_until.isoformat(),
+            "valid_until": key.valid_until.isoformat(),
+        },
         timestamp=current_time
     )
     db.add(event)
@@ -569,7 +602,7 @@ def activate_key_endpoint(
             event_type="key_activated",
             device_info=f"API request by {current_user.email}",
             status="success",
-            details=f"Key activated by {current_user.first_name} {current_user.last_name}",
+            details={"user_id": current_user.id},
             timestamp=datetime.now(timezone.utc)
         )
         db.add(event)
@@ -589,7 +622,7 @@ def activate_key_endpoint(
                 event_type="wallet_update_failed",
                 device_info=f"API request by {current_user.email}",
                 status="error",
-                details=f"Failed to update wallet: {str(wallet_error)}",
+                details={"error": str(wallet_error)},
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(error_event)
@@ -626,7 +659,7 @@ def deactivate_key_endpoint(
             event_type="key_deactivated",
             device_info=f"API request by {current_user.email}",
             status="success",
-            details=f"Key deactivated by {current_user.first_name} {current_user.last_name}",
+            details={"user_id": current_user.id},
             timestamp=datetime.now(timezone.utc)
         )
         db.add(event)
@@ -646,7 +679,7 @@ def deactivate_key_endpoint(
                 event_type="wallet_update_failed",
                 device_info=f"API request by {current_user.email}",
                 status="error",
-                details=f"Failed to update wallet: {str(wallet_error)}",
+                details={"error": str(wallet_error)},
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(error_event)
@@ -713,11 +746,14 @@ def send_key_email_endpoint(
     # Create pass data for email
     pass_data = {
         "key_uuid": key.key_uuid,
+        "hotel_id": room.hotel_id,
         "hotel_name": room.hotel.name if room.hotel else settings.HOTEL_NAME,
         "room_number": room.room_number,
         "guest_name": f"{user.first_name} {user.last_name}",
         "check_in": reservation.check_in.isoformat(),
         "check_out": reservation.check_out.isoformat(),
+        "valid_from": key.valid_from.isoformat(),
+        "valid_until": key.valid_until.isoformat(),
         "nfc_lock_id": room.nfc_lock_id
     }
     
@@ -748,7 +784,7 @@ def send_key_email_endpoint(
                 event_type="key_email_failed",
                 device_info=f"API request by {current_user.email}",
                 status="error",
-                details=f"Invalid email: {email_to_use}. {validation_message}",
+                details={"email": email_to_use, "error": validation_message},
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(event)
@@ -776,7 +812,7 @@ def send_key_email_endpoint(
         event_type="key_email_sent",
         device_info=f"API request by {current_user.email}",
         status="success",
-        details=f"Email sent to {email_to_use} for {key.pass_type.value} pass",
+        details={"email": email_to_use, "pass_type": key.pass_type.value},
         timestamp=datetime.now(timezone.utc)
     )
     db.add(event)
@@ -847,11 +883,12 @@ def send_key_sms_endpoint(
         )
     
     # Create SMS content
-    hotel_name = room.hotel.name if room and hasattr(room, 'hotel') and room.hotel else get_hotel_name(db, room.hotel_id)
+    hotel_name = get_hotel_name(db, room.hotel_id)
+    hotel_timezone = get_hotel_timezone(db, room.hotel_id)
     sms_content = (
         f"Your digital key for {hotel_name} is ready. "
         f"Room: {room.room_number}, "
-        f"Check-in: {format_datetime(reservation.check_in)}, "
+        f"Check-in: {format_datetime(reservation.check_in, hotel_timezone)}, "
         f"Key URL: {key.pass_url}"
     )
 
@@ -871,7 +908,7 @@ def send_key_sms_endpoint(
                     event_type="key_sms_sent",
                     device_info=f"API request by {current_user.email}",
                     status="success",
-                    details=f"SMS sent to {phone} for {key.pass_type.value} pass",
+                    details={"phone": phone, "pass_type": key.pass_type.value},
                     timestamp=datetime.now(timezone.utc)
                 )
                 db.add(key_event)
@@ -884,7 +921,7 @@ def send_key_sms_endpoint(
                     event_type="key_sms_failed",
                     device_info=f"API request by {current_user.email}",
                     status="error", 
-                    details=f"Failed to send SMS to {phone}: {message}",
+                    details={"phone": phone, "error": message},
                     timestamp=datetime.now(timezone.utc)
                 )
                 db.add(event)
@@ -899,7 +936,7 @@ def send_key_sms_endpoint(
                 event_type="key_sms_failed",
                 device_info=f"API request by {current_user.email}",
                 status="error", 
-                details=f"Failed to send SMS to {phone}: {str(e)}",
+                details={"phone": phone, "error": str(e)},
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(event)
@@ -928,9 +965,11 @@ def send_key_sms_endpoint(
 @router.get("/{key_id}/events", response_model=List[KeyEventSchema])
 def read_key_events(
     key_id: str,
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_staff)
 ) -> Any:
     """
@@ -943,10 +982,14 @@ def read_key_events(
             detail="Digital key not found"
         )
     
-    events = db.query(KeyEvent).filter(
-        KeyEvent.key_id == key_id
-    ).order_by(
-        KeyEvent.timestamp.desc()
-    ).offset(skip).limit(limit).all()
+    events, _ = paginate(
+        db.query(KeyEvent).filter(KeyEvent.key_id == key_id),
+        (KeyEvent.timestamp, KeyEvent.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        descending=True,
+        response=response,
+    )
     
     return events
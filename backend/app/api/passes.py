@@ -142,6 +142,8 @@ async def get_latest_pass(
         "guest_name": f"{user.first_name} {user.last_name}" if user else "Guest",
         "check_in": reservation.check_in.isoformat(),
         "check_out": reservation.check_out.isoformat(),
+        "valid_from": digital_key.valid_from.isoformat(),
+        "valid_until": digital_key.valid_until.isoformat(),
         "nfc_lock_id": room.nfc_lock_id if room else None,
         "is_active": digital_key.is_active
     }
@@ -186,7 +188,7 @@ async def get_changed_passes(
     db: Session = Depends(get_db)
 ):
     """Return serial numbers of passes that have changed since a timestamp"""
-    logger.info(f"What changed request for pass type: {pass_type_id}, since: {passesUpdatedSince}")
+    logger.debug(f"What changed request for pass type: {pass_type_id}, since: {passesUpdatedSince}")
     
     # Parse the timestamp if provided
     update_since = None
@@ -212,8 +214,10 @@ async def get_changed_passes(
     
     for key in query.all():
         serial_numbers.append(key.key_uuid)
-        if key.updated_at and (not last_updated or key.updated_at > last_updated):
-            last_updated = key.updated_at
+        # Stored timestamps are naive UTC
+        key_updated_at = key.updated_at.replace(tzinfo=timezone.utc) if key.updated_at else None
+        if key_updated_at and (not last_updated or key_updated_at > last_updated):
+            last_updated = key_updated_at
     
     # Format the timestamp in ISO 8601 format
     last_updated_str = last_updated.strftime("%Y-%m-%dT%H:%M:%SZ")
@@ -224,7 +228,7 @@ async def get_changed_passes(
         "lastUpdated": last_updated_str  # This is the field required by Apple
     }
     
-    logger.info(f"Returning response: {response}")
+    logger.info(f"Returning {len(serial_numbers)} changed passes for {pass_type_id}, last updated {last_updated_str}")
     return response
 
 
@@ -334,7 +338,7 @@ async def log_message(
     try:
         # Parse the request body
         body = await request.json()
-        logger.info(f"Received log from device: {body}")
+        logger.debug(f"Received log from device: {body}")
         
         # Extract logs array from the request
         logs = body.get("logs", [])
@@ -345,7 +349,7 @@ async def log_message(
         
         # Get device information from headers if available
         device_id = request.headers.get("User-Agent", "unknown-device")
-        logger.info(f"Processing logs for device: {device_id}")
+        logger.debug(f"Processing logs for device: {device_id}")
         
         # For each log message in the array
         for log_message in logs:
@@ -358,8 +362,6 @@ async def log_message(
                     if serial_match:
                         serial_number = serial_match.group(1)
                 
-                logger.info(f"Extracted serial number: {serial_number}")
-                
                 # Determine log level based on content
                 log_level = "info"
                 if "error" in log_message.lower():
@@ -379,17 +381,14 @@ async def log_message(
                     timestamp=datetime.now(timezone.utc)
                 )
                 
-                logger.info(f"Created device log entry with ID: {log_id}")
-                
                 # Save to database
                 db.add(device_log)
-                logger.info(f"Added device log to session, preparing to commit")
             except Exception as individual_error:
                 logger.error(f"Error processing individual log message: {str(individual_error)}")
         
         # Commit all logs in a single transaction
         db.commit()
-        logger.info(f"Successfully committed {len(logs)} device logs to database")
+        logger.info(f"Stored {len(logs)} device logs from {device_id}")
         
         # Return success response
         return Response(status_code=200)
@@ -0,0 +1,88 @@
+# backend/app/api/profiling.py
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.security import get_current_active_admin
+from app.models.user import User
+from app.schemas.profiling import ProfilerStart, ProfilerStatus
+from app.utils.sampling_profiler import ProfilerBusyError, find_route, profiler
+
+router = APIRouter()
+
+
+def _current_session():
+    if profiler.session is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No profile has been recorded"
+        )
+    return profiler.session
+
+
+@router.post("", response_model=ProfilerStatus, status_code=status.HTTP_201_CREATED)
+def start_profiler(
+    profile_in: ProfilerStart,
+    request: Request,
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Start sampling a route's handler stacks (admin only)
+
+    Profiles one in sample_every matching requests for duration_seconds,
+    in every worker. Starting a new profile discards the previous one's stacks.
+    """
+    method = profile_in.method.upper()
+    route = find_route(request.app.routes, profile_in.route, method)
+    if route is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No route {method} {profile_in.route}"
+        )
+
+    try:
+        session = profiler.start(
+            route,
+            method,
+            profile_in.sample_every,
+            profile_in.duration_seconds,
+            profile_in.interval_ms / 1000,
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return session.status()
+
+
+@router.get("", response_model=ProfilerStatus)
+def read_profiler_status(
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Status of the running or last profile (admin only)
+    """
+    return profiler.status(_current_session())
+
+
+@router.post("/stop", response_model=ProfilerStatus)
+def stop_profiler(
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Stop the running profile early; its stacks stay available (admin only)
+    """
+    session = _current_session()
+    profiler.stop()
+    return profiler.status(session)
+
+
+@router.get("/stacks", response_class=PlainTextResponse)
+def read_profiler_stacks(
+    current_user: User = Depends(get_current_active_admin)
+) -> Any:
+    """
+    Sampled stacks in collapsed format, one "frame;frame;frame count" per line (admin only)
+
+    Feed to flamegraph.pl or load in speedscope.
+    """
+    return PlainTextResponse(profiler.collapsed(_current_session()))
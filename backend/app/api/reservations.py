@@ -1,10 +1,10 @@
 # backend/app/api/reservations.py
-from typing import Any, List
+from typing import Any, List, Optional
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
 from app.db.session import get_db
@@ -13,12 +13,16 @@ from app.dependencies import check_reservation_permissions
 from app.models.user import User
 from app.models.reservation import Reservation, ReservationStatus
 from app.models.room import Room
+from app.services.revocation_service import sync_key_revocation
 from app.schemas.reservation import (
     Reservation as ReservationSchema,
     ReservationCreate,
     ReservationUpdate
 )
 from app.models.user import UserRole
+from app.services.listing_service import reservation_projection
+from app.utils.pagination import paginate
+from app.utils.serialization import list_response
 
 router = APIRouter()
 
@@ -120,29 +124,34 @@ def read_reservations(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     status: List[str] = Query(None),
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """
     Retrieve reservations with room, hotel, and user information
+    
+    Latest check-in first. Pass the X-Next-Cursor response header back as
+    `cursor` to get the next page.
     """
-    # Use joinedload to eagerly load the room, hotel, and user relationships
-    query = db.query(Reservation).options(
-        joinedload(Reservation.room).joinedload(Room.hotel),
-        joinedload(Reservation.user)
-    )
+    # Room, hotel and user come from outer joins, read as columns straight into the response
+    query = reservation_projection.query(db)
     
-    # Rest of the function remains the same
     if status:
         query = query.filter(Reservation.status.in_(status))
     
     if current_user.role not in [UserRole.ADMIN, UserRole.HOTEL_STAFF]:   
         query = query.filter(Reservation.user_id == current_user.id)
     
-    query = query.order_by(Reservation.check_in.desc())
-    
-    reservations = query.offset(skip).limit(limit).all()
-    return reservations
+    rows, next_cursor = paginate(
+        query,
+        (Reservation.check_in, Reservation.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        descending=True,
+    )
+    return list_response(reservation_projection.read(rows), next_cursor)
 
 # TODO implement this when use roomschema
 # @router.get("", response_model=List[ReservationSchema])
@@ -179,7 +188,10 @@ def read_reservations(
 
 @router.get("/active", response_model=List[ReservationSchema])
 def read_active_reservations(
+    response: Response,
     db: Session = Depends(get_db),
+    limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ) -> Any:
     """
@@ -199,9 +211,13 @@ def read_active_reservations(
         query = query.filter(Reservation.user_id == current_user.id)
     
     # Order by check-in date (soonest first)
-    query = query.order_by(Reservation.check_in)
-    
-    reservations = query.all()
+    reservations, _ = paginate(
+        query,
+        (Reservation.check_in, Reservation.id),
+        limit=limit,
+        cursor=cursor,
+        response=response,
+    )
     return reservations
 
 
@@ -327,6 +343,7 @@ def check_out_reservation(
             key.is_active = False
             key.status = "expired"
             db.add(key)
+            sync_key_revocation(db, key)
     
     db.add(reservation)
     db.commit()
@@ -375,6 +392,7 @@ def cancel_reservation(
             key.is_active = False
             key.status = "revoked"
             db.add(key)
+            sync_key_revocation(db, key)
     
     db.add(reservation)
     db.commit()
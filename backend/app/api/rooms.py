@@ -1,15 +1,16 @@
 # backend/app/api/rooms.py
-from typing import Any, List
+from typing import Any, List, Optional
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.security import get_current_user, get_current_active_staff
 from app.models.user import User
 from app.models.room import Room, RoomType
+from app.utils.pagination import paginate
 from app.schemas.room import (
     Room as RoomSchema,
     RoomCreate,
@@ -73,9 +74,11 @@ def create_room(
 
 @router.get("", response_model=List[RoomSchema])
 def read_rooms(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     hotel_id: str = None,
     room_type: List[RoomType] = Query(None),
     is_active: bool = None,
@@ -97,9 +100,14 @@ def read_rooms(
         query = query.filter(Room.is_active == is_active)
     
     # Order by room number
-    query = query.order_by(Room.room_number)
-    
-    rooms = query.offset(skip).limit(limit).all()
+    rooms, _ = paginate(
+        query,
+        (Room.room_number, Room.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        response=response,
+    )
     return rooms
 
 
@@ -1,7 +1,7 @@
 # backend/app/api/router.py
 from fastapi import APIRouter
 
-from app.api import users, auth, hotels, rooms, reservations, keys, verify, passes
+from app.api import users, auth, hotels, rooms, reservations, keys, verify, passes, events, analytics, profiling
 
 api_router = APIRouter()
 
@@ -14,3 +14,6 @@ api_router.include_router(reservations.router, prefix="/reservations", tags=["re
 api_router.include_router(keys.router, prefix="/keys", tags=["digital keys"])
 api_router.include_router(verify.router, prefix="/verify", tags=["verification"])
 api_router.include_router(passes.router, prefix="/passes", tags=["passes"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(profiling.router, prefix="/admin/profiler", tags=["profiling"])
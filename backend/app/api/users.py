@@ -1,13 +1,14 @@
 # backend/app/api/users.py
-from typing import Any, List, Dict
+from typing import Any, List, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.security import get_current_user, get_current_active_admin, get_password_hash
+from app.security import get_current_user, get_current_active_admin, get_password_hash, invalidate_user_principal
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
@@ -48,21 +49,31 @@ def update_user_me(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    invalidate_user_principal(current_user.id)
     
     return current_user
 
 
 @router.get("", response_model=List[UserSchema])
 def read_users(
+    response: Response,
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_admin)
 ):
     """
     Retrieve users (admin only)
     """
-    users = db.query(User).offset(skip).limit(limit).all()
+    users, _ = paginate(
+        db.query(User),
+        (User.created_at, User.id),
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        response=response,
+    )
     return users
 
 
@@ -154,6 +165,7 @@ def update_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    invalidate_user_principal(user.id)
     
     return user
 
@@ -179,5 +191,6 @@ def delete_user(
     user.is_active = False
     db.add(user)
     db.commit()
+    invalidate_user_principal(user.id)
     
     return None
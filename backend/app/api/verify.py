@@ -1,10 +1,10 @@
 # backend/app/api/verify.py
-from typing import Any
+from dataclasses import asdict
+from typing import Any, Optional
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-import pytz
 
 from app.db.session import get_db
 from app.models.digital_key import DigitalKey
@@ -12,7 +12,21 @@ from app.models.key_event import KeyEvent, EventType
 from app.models.reservation import Reservation
 from app.models.room import Room
 from app.models.user import User
-from app.schemas.digital_key import KeyVerificationRequest, KeyVerification
+from app.config import settings
+from app.security import verify_access_log_signature
+from app.schemas.digital_key import (
+    KeyVerificationRequest,
+    KeyVerification,
+    KeyVerificationBatch,
+    KeyVerificationBatchResult,
+    CredentialKeySet,
+    OfflineAccessLogBatch,
+    OfflineAccessLogResult,
+    RevocationFeed,
+)
+from app.services.credential_service import get_public_keys
+from app.services.revocation_service import encode_feed, get_revocation_feed
+from app.services.verification_service import is_within_validity, record_offline_access_logs, verify_key_batch
 
 router = APIRouter()
 
@@ -31,9 +45,9 @@ def verify_key(
     # Find key by UUID
     key = db.query(DigitalKey).filter(DigitalKey.key_uuid == verification.key_uuid).first()
 
-    # Create event record
-    local_tz = pytz.timezone('Europe/Paris')
-    now = datetime.now(local_tz)
+    # Create event record; naive UTC like every other stored time, so rollups
+    # bucket it by UTC hour
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
     
     # Create initial access attempt event
     event = KeyEvent(
@@ -42,8 +56,8 @@ def verify_key(
         device_info=verification.device_info,
         timestamp=now,
         location=verification.location,
+        lock_id=verification.lock_id,
         status="pending",
-        details=f"Lock ID: {verification.lock_id}"
     )
     db.add(event)
     db.commit()
@@ -52,7 +66,7 @@ def verify_key(
     if not key:
         event.status = "failure"
         event.event_type = EventType.PHYSICAL_ACCESS_DENIED
-        event.details = "Key not found"
+        event.details = {"reason": "key_not_found"}
         db.add(event)
         db.commit()
         
@@ -65,7 +79,7 @@ def verify_key(
     if not key.is_active:
         event.status = "failure"
         event.event_type = EventType.PHYSICAL_ACCESS_DENIED
-        event.details = "Key is inactive"
+        event.details = {"reason": "key_inactive"}
         db.add(event)
         db.commit()
         
@@ -74,24 +88,11 @@ def verify_key(
             "message": "Key is inactive"
         }
 
-    # For key validation
-    valid_from = key.valid_from
-    valid_until = key.valid_until
-
     # Check key validity period
-    # If dates from database don't have timezone info
-    if valid_from.tzinfo is None:
-        # First convert to datetime with local timezone
-        valid_from = local_tz.localize(valid_from)
-
-    if valid_until.tzinfo is None:
-        # First convert to datetime with local timezone
-        valid_until = local_tz.localize(valid_until)
-
-    if now < valid_from or now > valid_until:
+    if not is_within_validity(key, now):
         event.status = "failure"
         event.event_type = EventType.PHYSICAL_ACCESS_DENIED
-        event.details = "Key outside validity period"
+        event.details = {"reason": "outside_validity_period"}
         db.add(event)
         db.commit()
 
@@ -108,7 +109,10 @@ def verify_key(
     if not reservation or reservation.status not in ["confirmed", "checked_in"]:
         event.status = "failure"
         event.event_type = EventType.PHYSICAL_ACCESS_DENIED
-        event.details = f"Invalid reservation status: {reservation.status if reservation else 'None'}"
+        event.details = {
+            "reason": "invalid_reservation",
+            "reservation_status": reservation.status.value if reservation else None,
+        }
         db.add(event)
         db.commit()
         
@@ -123,7 +127,7 @@ def verify_key(
     if room.nfc_lock_id != verification.lock_id:
         event.status = "failure"
         event.event_type = EventType.PHYSICAL_ACCESS_DENIED
-        event.details = f"Lock ID mismatch: Expected {room.nfc_lock_id}, got {verification.lock_id}"
+        event.details = {"reason": "lock_mismatch", "expected_lock_id": room.nfc_lock_id}
         db.add(event)
         db.commit()
         
@@ -143,7 +147,8 @@ def verify_key(
     # Update event status for successful access
     event.status = "success"
     event.event_type = EventType.PHYSICAL_ACCESS_GRANTED
-    event.details = f"Access granted to room {room.room_number} for {user.first_name} {user.last_name}"
+    # Key, lock and therefore room and guest are already on the row
+    event.details = None
     db.add(event)
     
     db.commit()
@@ -154,3 +159,92 @@ def verify_key(
         "room_number": room.room_number,
         "guest_name": f"{user.first_name} {user.last_name}" if user else None
     }
+
+
+@router.post("/keys", response_model=KeyVerificationBatchResult)
+def verify_keys(
+    *,
+    db: Session = Depends(get_db),
+    batch: KeyVerificationBatch
+) -> Any:
+    """
+    Verify a batch of taps
+
+    Called by gateways that aggregate taps from many locks; results are in
+    the order of the taps
+    """
+    if len(batch.taps) > settings.KEY_VERIFICATION_MAX_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.KEY_VERIFICATION_MAX_BATCH} taps per batch"
+        )
+    return {"results": verify_key_batch(db, batch.taps)}
+
+
+@router.get("/credential-keys", response_model=CredentialKeySet)
+def read_credential_keys() -> Any:
+    """
+    Public keys for verifying offline key credentials
+
+    Locks fetch these once and then validate taps locally
+    """
+    return {"keys": get_public_keys()}
+
+
+@router.post(
+    "/access-logs",
+    response_model=OfflineAccessLogResult,
+    dependencies=[Depends(verify_access_log_signature)],
+)
+def upload_access_logs(
+    *,
+    db: Session = Depends(get_db),
+    batch: OfflineAccessLogBatch
+) -> Any:
+    """
+    Upload access decisions that a lock made offline
+
+    Locks buffer taps verified from credentials and send them here in batches,
+    signed with the shared ACCESS_LOG_SECRET (see verify_access_log_signature)
+    """
+    if len(batch.entries) > settings.ACCESS_LOG_MAX_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.ACCESS_LOG_MAX_BATCH} entries per batch"
+        )
+    return record_offline_access_logs(db, batch.entries)
+
+
+@router.get(
+    "/revocations",
+    response_model=RevocationFeed,
+    responses={200: {"content": {"application/octet-stream": {}}}, 304: {"description": "Feed unchanged"}},
+)
+def read_revocations(
+    *,
+    db: Session = Depends(get_db),
+    hotel_id: str = Query(...),
+    since: Optional[int] = Query(None, ge=0, description="Feed version the client already holds"),
+    format: str = Query("json", pattern="^(json|binary)$"),
+    if_none_match: Optional[str] = Header(None, alias="if-none-match")
+) -> Any:
+    """
+    Keys of a hotel revoked before their credentials expire
+
+    Without since, returns the full deny-set; with since, only the keys added
+    to or removed from it after that version (or a full snapshot if that
+    version is too old). format=binary returns the layout documented in
+    revocation_service, with key UUIDs as sorted 16-byte values.
+    """
+    state = get_revocation_feed(db, hotel_id, since)
+    headers = {
+        "ETag": f'W/"{state.version}"',
+        "X-Revocation-Version": str(state.version),
+        "Cache-Control": "no-cache",
+    }
+    if since == state.version or (if_none_match and headers["ETag"] in if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if format == "binary":
+        return Response(content=encode_feed(state), media_type="application/octet-stream", headers=headers)
+    return Response(content=RevocationFeed(**asdict(state)).model_dump_json(), media_type="application/json", headers=headers)
@@ -66,6 +66,8 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = get_env("POSTGRES_PASSWORD", "password")
     POSTGRES_DB: str = get_env("POSTGRES_DB", "hotel_keys")
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    # Migrations own the schema; create missing tables at startup only for local development
+    AUTO_CREATE_TABLES: bool = get_env("AUTO_CREATE_TABLES", "False")
 
     # Create the database URI manually
     @model_validator(mode='after')
@@ -109,6 +111,88 @@ class Settings(BaseSettings):
     # if ngrok don't work:
     FRONTEND_URL: str = get_env("FRONTEND_URL", "http://localhost:3000")
     PASS_BASE_URL: str = get_env("PASS_BASE_URL", "https://cc1d-2a01-e0a-159-2b50-2d64-56ca-b251-5192.ngrok-free.app/api/v1/passes/")
+
+    # QR code cache (memory LRU + optional disk tier, empty dir disables disk)
+    QR_CACHE_MAX_ENTRIES: int = get_env("QR_CACHE_MAX_ENTRIES", "512")
+    QR_CACHE_MAX_BYTES: int = get_env("QR_CACHE_MAX_BYTES", str(8 * 1024 * 1024))
+    QR_CACHE_DIR: str = get_env("QR_CACHE_DIR", "./cache/qr_codes")
+
+    # Password hashing (bcrypt runs on a dedicated bounded pool)
+    BCRYPT_ROUNDS: int = get_env("BCRYPT_ROUNDS", "12")
+    PASSWORD_HASH_WORKERS: int = get_env("PASSWORD_HASH_WORKERS", "2")
+    PASSWORD_HASH_MAX_QUEUE: int = get_env("PASSWORD_HASH_MAX_QUEUE", "64")
+
+    # Key event partition maintenance and retention (0 months keeps everything)
+    KEY_EVENT_MAINTENANCE_ENABLED: bool = get_env("KEY_EVENT_MAINTENANCE_ENABLED", "False")
+    KEY_EVENT_MAINTENANCE_INTERVAL_SECONDS: int = get_env("KEY_EVENT_MAINTENANCE_INTERVAL_SECONDS", "86400")
+    KEY_EVENT_PARTITION_MONTHS_AHEAD: int = get_env("KEY_EVENT_PARTITION_MONTHS_AHEAD", "3")
+    KEY_EVENT_RETENTION_MONTHS: int = get_env("KEY_EVENT_RETENTION_MONTHS", "0")
+    KEY_EVENT_RETENTION_MODE: str = get_env("KEY_EVENT_RETENTION_MODE", "archive")  # archive or drop
+    KEY_EVENT_ARCHIVE_SCHEMA: str = get_env("KEY_EVENT_ARCHIVE_SCHEMA", "archive")
+
+    # Door access rollups for dashboards
+    ACCESS_ROLLUP_ENABLED: bool = get_env("ACCESS_ROLLUP_ENABLED", "True")
+    ACCESS_ROLLUP_INTERVAL_SECONDS: int = get_env("ACCESS_ROLLUP_INTERVAL_SECONDS", "60")
+    ACCESS_ROLLUP_BATCH_SIZE: int = get_env("ACCESS_ROLLUP_BATCH_SIZE", "5000")
+    ACCESS_ROLLUP_LAG_SECONDS: int = get_env("ACCESS_ROLLUP_LAG_SECONDS", "5")
+
+    # Offline key credentials (Ed25519 PKCS8 PEM; an ephemeral key is used if missing)
+    KEY_CREDENTIAL_SIGNING_KEY_PATH: str = get_env("KEY_CREDENTIAL_SIGNING_KEY_PATH", "./certificates/credentials/ed25519.pem")
+    ACCESS_LOG_MAX_BATCH: int = get_env("ACCESS_LOG_MAX_BATCH", "1000")
+    # Secret shared with locks and gateways; access log uploads carry an HMAC-SHA256 of
+    # the body keyed with it. Uploads are refused while it is unset
+    ACCESS_LOG_SECRET: str = get_env("ACCESS_LOG_SECRET", "")
+    # Taps per /verify/keys request from lock gateways
+    KEY_VERIFICATION_MAX_BATCH: int = get_env("KEY_VERIFICATION_MAX_BATCH", "500")
+
+    # Revocation feed maintenance (removals older than the retention are only served in snapshots)
+    REVOCATION_MAINTENANCE_INTERVAL_SECONDS: int = get_env("REVOCATION_MAINTENANCE_INTERVAL_SECONDS", "3600")
+    REVOCATION_DELTA_RETENTION_SECONDS: int = get_env("REVOCATION_DELTA_RETENTION_SECONDS", "604800")
+
+    # Responses smaller than this are sent uncompressed
+    GZIP_MINIMUM_SIZE: int = get_env("GZIP_MINIMUM_SIZE", "1000")
+
+    # Authenticated user principal cache
+    USER_PRINCIPAL_CACHE_TTL_SECONDS: int = get_env("USER_PRINCIPAL_CACHE_TTL_SECONDS", "30")
+    USER_PRINCIPAL_CACHE_MAX_ENTRIES: int = get_env("USER_PRINCIPAL_CACHE_MAX_ENTRIES", "1024")
+
+    # Hotel metadata cache
+    HOTEL_CACHE_TTL_SECONDS: int = get_env("HOTEL_CACHE_TTL_SECONDS", "300")
+    HOTEL_CACHE_MAX_ENTRIES: int = get_env("HOTEL_CACHE_MAX_ENTRIES", "256")
+
+    # SQL profiler: per-request query counts and DB time in /metrics, slow-query log
+    SQL_PROFILER_ENABLED: bool = get_env("SQL_PROFILER_ENABLED", "False")
+    # Adds X-DB-Query-Count and X-DB-Time-Ms to responses; for debugging only
+    SQL_PROFILER_HEADERS: bool = get_env("SQL_PROFILER_HEADERS", "False")
+    SQL_PROFILER_TOP_N: int = get_env("SQL_PROFILER_TOP_N", "3")
+    SLOW_QUERY_THRESHOLD_MS: float = get_env("SLOW_QUERY_THRESHOLD_MS", "100")
+    SLOW_REQUEST_DB_THRESHOLD_MS: float = get_env("SLOW_REQUEST_DB_THRESHOLD_MS", "500")
+
+    # Logging (records are queued and written by a background thread)
+    LOG_LEVEL: str = get_env("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = get_env("LOG_FORMAT", "text")  # text or json
+    LOG_QUEUE_SIZE: int = get_env("LOG_QUEUE_SIZE", "10000")
+    # Share of sub-WARNING records kept per logger, e.g. app.api.passes=0.1,uvicorn.access=0.01
+    LOG_SAMPLE_RATES: str = get_env("LOG_SAMPLE_RATES", "")
+
+    # Email templates (precompiled at startup; bytecode cache is optional)
+    TEMPLATE_BYTECODE_CACHE_DIR: str = get_env("TEMPLATE_BYTECODE_CACHE_DIR", "")
+    TEMPLATE_AUTO_RELOAD: bool = get_env("TEMPLATE_AUTO_RELOAD", "False")
+
+    # Readiness probe (/readyz): results are reused for this long, so probes add no load
+    READINESS_CACHE_SECONDS: float = get_env("READINESS_CACHE_SECONDS", "2")
+    # Not ready below this many free DB connections, or above this share of a worker pool's queue
+    READINESS_MIN_FREE_DB_CONNECTIONS: int = get_env("READINESS_MIN_FREE_DB_CONNECTIONS", "1")
+    READINESS_MAX_QUEUE_FRACTION: float = get_env("READINESS_MAX_QUEUE_FRACTION", "0.8")
+
+    # Cross-worker cache invalidation: postgres (LISTEN/NOTIFY), local (one process) or auto (postgres on PostgreSQL)
+    INVALIDATION_BUS: str = get_env("INVALIDATION_BUS", "auto")
+    INVALIDATION_CHANNEL: str = get_env("INVALIDATION_CHANNEL", "cache_invalidation")
+
+    # Directory the workers of one server share /metrics snapshots and profiler stacks through
+    # (gunicorn.conf.py creates one when unset); empty means each process reports only its own
+    WORKER_STATE_DIR: str = get_env("WORKER_STATE_DIR", "")
+    METRICS_FLUSH_INTERVAL_SECONDS: float = get_env("METRICS_FLUSH_INTERVAL_SECONDS", "5")
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -11,4 +11,6 @@ from app.models.reservation import Reservation  # Depends on User and Room
 # Finally import models that depend on Reservation
 from app.models.digital_key import DigitalKey   # Depends on Reservation
 from app.models.key_event import KeyEvent       # Depends on DigitalKey
-from app.models.device import DeviceRegistration  # Depends on DigitalKey 
\ No newline at end of file
+from app.models.device import DeviceRegistration  # Depends on DigitalKey
+from app.models.access_rollup import AccessRollup, RollupWatermark  # Built from KeyEvent 
+from app.models.key_revocation import KeyRevocation, RevocationFeed  # Maintained from DigitalKey changes
@@ -19,6 +19,9 @@ from app.models.reservation import Reservation
 from app.models.digital_key import DigitalKey
 from app.models.key_event import KeyEvent
 from app.models.device import DeviceRegistration
+from app.models.device_log import DeviceLog
+from app.models.access_rollup import AccessRollup, RollupWatermark
+from app.models.key_revocation import KeyRevocation, RevocationFeed
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,225 @@
+"""Initial schema
+
+Revision ID: 1a6d0e3f5c27
+Revises:
+Create Date: 2025-02-22 09:00:00.000000
+
+The tables as they were before the first migration. Databases that were
+created with create_all() at that point already have them and should be
+stamped at this revision (alembic stamp 1a6d0e3f5c27) before upgrading.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a6d0e3f5c27'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _base_columns():
+    return [
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        'user',
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('first_name', sa.String(), nullable=False),
+        sa.Column('last_name', sa.String(), nullable=False),
+        sa.Column('phone_number', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('role', sa.Enum('ADMIN', 'HOTEL_STAFF', 'GUEST', name='userrole'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_email', 'user', ['email'], unique=True)
+    op.create_index('ix_user_id', 'user', ['id'])
+
+    op.create_table(
+        'hotel',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('address', sa.String(), nullable=False),
+        sa.Column('city', sa.String(), nullable=False),
+        sa.Column('state', sa.String(), nullable=False),
+        sa.Column('country', sa.String(), nullable=False),
+        sa.Column('postal_code', sa.String(), nullable=True),
+        sa.Column('phone_number', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('website', sa.String(), nullable=True),
+        sa.Column('logo_url', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        *_base_columns(),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_hotel_id', 'hotel', ['id'])
+
+    op.create_table(
+        'hotelstaff',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('hotel_id', sa.String(), nullable=False),
+        sa.Column('position', sa.String(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['hotel_id'], ['hotel.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_hotelstaff_id', 'hotelstaff', ['id'])
+
+    op.create_table(
+        'room',
+        sa.Column('hotel_id', sa.String(), nullable=False),
+        sa.Column('room_number', sa.String(), nullable=False),
+        sa.Column('floor', sa.Integer(), nullable=True),
+        sa.Column(
+            'room_type',
+            sa.Enum('STANDARD', 'DELUXE', 'SUITE', 'EXECUTIVE', 'PRESIDENTIAL', name='roomtype'),
+            nullable=False,
+        ),
+        sa.Column('max_occupancy', sa.Integer(), nullable=True),
+        sa.Column('nfc_lock_id', sa.String(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['hotel_id'], ['hotel.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_room_nfc_lock_id', 'room', ['nfc_lock_id'], unique=True)
+    op.create_index('ix_room_id', 'room', ['id'])
+
+    op.create_table(
+        'roomlock',
+        sa.Column('room_id', sa.String(), nullable=False),
+        sa.Column('lock_serial', sa.String(), nullable=False),
+        sa.Column('lock_model', sa.String(), nullable=True),
+        sa.Column('firmware_version', sa.String(), nullable=True),
+        sa.Column('battery_level', sa.Integer(), nullable=True),
+        sa.Column('last_connection', sa.String(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['room_id'], ['room.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('lock_serial'),
+    )
+    op.create_index('ix_roomlock_id', 'roomlock', ['id'])
+
+    op.create_table(
+        'reservation',
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('room_id', sa.String(), nullable=False),
+        sa.Column('confirmation_code', sa.String(), nullable=False),
+        sa.Column('check_in', sa.DateTime(), nullable=False),
+        sa.Column('check_out', sa.DateTime(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('PENDING', 'CONFIRMED', 'CHECKED_IN', 'CHECKED_OUT', 'CANCELLED', 'NO_SHOW', name='reservationstatus'),
+            nullable=False,
+        ),
+        sa.Column('number_of_guests', sa.Integer(), nullable=True),
+        sa.Column('special_requests', sa.String(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['room_id'], ['room.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_reservation_confirmation_code', 'reservation', ['confirmation_code'], unique=True)
+    op.create_index('ix_reservation_id', 'reservation', ['id'])
+
+    op.create_table(
+        'digitalkey',
+        sa.Column('reservation_id', sa.String(), nullable=False),
+        sa.Column('key_uuid', sa.String(), nullable=False),
+        sa.Column('pass_url', sa.String(), nullable=True),
+        sa.Column('pass_type', sa.Enum('APPLE', 'GOOGLE', name='keytype'), nullable=False),
+        sa.Column('valid_from', sa.DateTime(), nullable=False),
+        sa.Column('valid_until', sa.DateTime(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('status', sa.Enum('CREATED', 'ACTIVE', 'EXPIRED', 'REVOKED', name='keystatus'), nullable=False),
+        sa.Column('activated_at', sa.DateTime(), nullable=True),
+        sa.Column('last_used', sa.DateTime(), nullable=True),
+        sa.Column('access_count', sa.Integer(), nullable=True),
+        sa.Column('auth_token', sa.String(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['reservation_id'], ['reservation.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_digitalkey_key_uuid', 'digitalkey', ['key_uuid'], unique=True)
+    op.create_index('ix_digitalkey_id', 'digitalkey', ['id'])
+
+    op.create_table(
+        'device_registrations',
+        sa.Column('device_library_id', sa.String(), nullable=False),
+        sa.Column('pass_type_id', sa.String(), nullable=False),
+        sa.Column('serial_number', sa.String(), nullable=False),
+        sa.Column('push_token', sa.String(), nullable=False),
+        sa.Column('active', sa.Boolean(), server_default='true', nullable=True),
+        sa.Column('digital_key_id', sa.String(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['digital_key_id'], ['digitalkey.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('device_library_id', 'pass_type_id', 'serial_number', name='device_pass_unique'),
+    )
+    op.create_index('ix_device_registrations_id', 'device_registrations', ['id'])
+
+    op.create_table(
+        'device_logs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('device_id', sa.String(), nullable=False),
+        sa.Column('pass_type', sa.String(), nullable=False),
+        sa.Column('serial_number', sa.String(), nullable=False),
+        sa.Column('log_level', sa.String(), nullable=True),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('timestamp', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_device_logs_id', 'device_logs', ['id'])
+
+    op.create_table(
+        'keyevent',
+        sa.Column('key_id', sa.String(), nullable=True),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('device_info', sa.String(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('details', sa.String(), nullable=True),
+        *_base_columns(),
+        sa.ForeignKeyConstraint(['key_id'], ['digitalkey.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_keyevent_id', 'keyevent', ['id'])
+
+
+def downgrade():
+    op.drop_index('ix_keyevent_id', table_name='keyevent')
+    op.drop_table('keyevent')
+    op.drop_index('ix_device_logs_id', table_name='device_logs')
+    op.drop_table('device_logs')
+    op.drop_index('ix_device_registrations_id', table_name='device_registrations')
+    op.drop_table('device_registrations')
+    op.drop_index('ix_digitalkey_id', table_name='digitalkey')
+    op.drop_index('ix_digitalkey_key_uuid', table_name='digitalkey')
+    op.drop_table('digitalkey')
+    op.drop_index('ix_reservation_id', table_name='reservation')
+    op.drop_index('ix_reservation_confirmation_code', table_name='reservation')
+    op.drop_table('reservation')
+    op.drop_index('ix_roomlock_id', table_name='roomlock')
+    op.drop_table('roomlock')
+    op.drop_index('ix_room_id', table_name='room')
+    op.drop_index('ix_room_nfc_lock_id', table_name='room')
+    op.drop_table('room')
+    op.drop_index('ix_hotelstaff_id', table_name='hotelstaff')
+    op.drop_table('hotelstaff')
+    op.drop_index('ix_hotel_id', table_name='hotel')
+    op.drop_table('hotel')
+    op.drop_index('ix_user_id', table_name='user')
+    op.drop_index('ix_user_email', table_name='user')
+    op.drop_table('user')
+    # create_table() created the PostgreSQL enum types; drop_table() leaves them
+    for enum_name in ('keystatus', 'keytype', 'reservationstatus', 'roomtype', 'userrole'):
+        sa.Enum(name=enum_name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,118 @@
+"""Partition keyevent by month on timestamp
+
+Revision ID: 3c9e2f4a7b1d
+Revises: 1a6d0e3f5c27
+Create Date: 2025-03-01 09:00:00.000000
+
+Converts keyevent into a PostgreSQL table range-partitioned by month on
+timestamp, with a default partition as a safety net, and adds the
+(key_id, timestamp DESC) and (event_type, timestamp) indexes. Existing rows
+are copied into their monthly partitions. On other databases only the
+indexes are created.
+
+The primary key becomes (id, timestamp) because PostgreSQL requires the
+partition key in every unique constraint on a partitioned table.
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e2f4a7b1d'
+down_revision = '1a6d0e3f5c27'
+branch_labels = None
+depends_on = None
+
+# Partitions created past the current month; the maintenance job keeps this window
+MONTHS_AHEAD = 3
+
+
+def _add_months(value, months):
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _create_indexes():
+    # Tables created by create_all() may already have them
+    op.create_index(
+        'ix_keyevent_key_id_timestamp', 'keyevent', ['key_id', sa.text('timestamp DESC')],
+        if_not_exists=True,
+    )
+    op.create_index(
+        'ix_keyevent_event_type_timestamp', 'keyevent', ['event_type', 'timestamp'],
+        if_not_exists=True,
+    )
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        _create_indexes()
+        return
+
+    op.execute('ALTER TABLE keyevent RENAME TO keyevent_unpartitioned')
+    # Index names are schema-wide, so free them for the new table
+    op.execute('DROP INDEX IF EXISTS ix_keyevent_id')
+    op.execute('DROP INDEX IF EXISTS ix_keyevent_key_id_timestamp')
+    op.execute('DROP INDEX IF EXISTS ix_keyevent_event_type_timestamp')
+    op.execute('ALTER TABLE keyevent_unpartitioned RENAME CONSTRAINT keyevent_pkey TO keyevent_unpartitioned_pkey')
+
+    op.execute("""
+        CREATE TABLE keyevent (
+            id VARCHAR NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            key_id VARCHAR REFERENCES digitalkey (id),
+            event_type VARCHAR NOT NULL,
+            device_info VARCHAR,
+            timestamp TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            location VARCHAR,
+            status VARCHAR,
+            details VARCHAR,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute('CREATE TABLE keyevent_default PARTITION OF keyevent DEFAULT')
+
+    # One partition per month from the oldest event up to MONTHS_AHEAD months ahead
+    oldest = bind.execute(sa.text('SELECT min(timestamp) FROM keyevent_unpartitioned')).scalar()
+    now = datetime.now(timezone.utc)
+    month = datetime((oldest or now).year, (oldest or now).month, 1)
+    last = _add_months(datetime(now.year, now.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE keyevent_y{month.year}m{month.month:02d} PARTITION OF keyevent "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        )
+        month = upper
+
+    op.execute("""
+        INSERT INTO keyevent (id, created_at, updated_at, key_id, event_type, device_info,
+                              timestamp, location, status, details)
+        SELECT id, created_at, updated_at, key_id, event_type, device_info,
+               timestamp, location, status, details
+        FROM keyevent_unpartitioned
+    """)
+    op.execute('DROP TABLE keyevent_unpartitioned')
+
+    op.create_index('ix_keyevent_id', 'keyevent', ['id'])
+    _create_indexes()
+
+
+def downgrade():
+    bind = op.get_bind()
+    op.drop_index('ix_keyevent_event_type_timestamp', table_name='keyevent')
+    op.drop_index('ix_keyevent_key_id_timestamp', table_name='keyevent')
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE TABLE keyevent_unpartitioned (LIKE keyevent INCLUDING DEFAULTS)')
+    op.execute('INSERT INTO keyevent_unpartitioned SELECT * FROM keyevent')
+    op.execute('DROP TABLE keyevent CASCADE')
+    op.execute('ALTER TABLE keyevent_unpartitioned RENAME TO keyevent')
+    op.execute('ALTER TABLE keyevent ADD PRIMARY KEY (id)')
+    op.execute('ALTER TABLE keyevent ADD FOREIGN KEY (key_id) REFERENCES digitalkey (id)')
+    op.create_index('ix_keyevent_id', 'keyevent', ['id'])
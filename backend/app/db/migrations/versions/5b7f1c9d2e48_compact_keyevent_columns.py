@@ -0,0 +1,149 @@
+"""Store keyevent event_type/status as small int codes and details as JSON
+
+Revision ID: 5b7f1c9d2e48
+Revises: 8d41b6e0c2a5
+Create Date: 2025-03-15 09:00:00.000000
+
+event_type and status become SMALLINT codes from the registry in
+app/models/key_event.py, and details becomes JSONB on PostgreSQL (JSON
+elsewhere). Existing free-text details are kept as {"message": ...}; event
+types that were never registered are stored as code 0 and their original
+value is kept in details under "event_type".
+
+On PostgreSQL each column is converted with a single ALTER ... USING, which
+rewrites the table (and every partition) once and rebuilds its indexes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7f1c9d2e48'
+down_revision = '8d41b6e0c2a5'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the registry at this revision
+EVENT_TYPE_CODES = {
+    'key_created': 1,
+    'key_activated': 2,
+    'key_deactivated': 3,
+    'physical_access_attempt': 4,
+    'physical_access_granted': 5,
+    'physical_access_denied': 6,
+    'digital_access': 7,
+    'key_email_sent': 8,
+    'key_email_failed': 9,
+    'key_sms_sent': 10,
+    'key_sms_failed': 11,
+    'key_updated': 12,
+    'key_extended': 13,
+    'key_creation_failed': 14,
+    'key_email_scheduled': 15,
+    'key_email_scheduling_failed': 16,
+    'key_expired': 17,
+    'key_regenerated': 18,
+    'access_attempt': 19,
+    'push_notification_sent': 20,
+    'push_notification_failed': 21,
+    'push_notification_error': 22,
+    'wallet_pass_updated': 23,
+    'wallet_pass_update_failed': 24,
+    'wallet_update_failed': 25,
+}
+
+EVENT_STATUS_CODES = {
+    'success': 1,
+    'error': 2,
+    'pending': 3,
+    'failure': 4,
+}
+
+UNKNOWN_CODE = 0
+
+
+def _to_code(column, codes, default):
+    cases = ' '.join(f"WHEN '{value}' THEN {code}" for value, code in codes.items())
+    return f"CASE {column} {cases} ELSE {default} END"
+
+
+def _to_value(column, codes, default):
+    cases = ' '.join(f"WHEN {code} THEN '{value}'" for value, code in codes.items())
+    return f"CASE {column} {cases} ELSE {default} END"
+
+
+def _registered(column):
+    return f"{column} IN ({', '.join(repr(value) for value in EVENT_TYPE_CODES)})"
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # details first, while event_type still holds the original strings
+        op.execute(f"""
+            ALTER TABLE keyevent ALTER COLUMN details TYPE JSONB USING (
+                CASE
+                    WHEN {_registered('event_type')} THEN
+                        CASE WHEN details IS NULL THEN NULL
+                             ELSE jsonb_build_object('message', details) END
+                    ELSE jsonb_strip_nulls(jsonb_build_object('message', details, 'event_type', event_type))
+                END
+            )
+        """)
+        op.execute(
+            f"ALTER TABLE keyevent ALTER COLUMN event_type TYPE SMALLINT "
+            f"USING ({_to_code('event_type', EVENT_TYPE_CODES, UNKNOWN_CODE)})"
+        )
+        op.execute(
+            f"ALTER TABLE keyevent ALTER COLUMN status TYPE SMALLINT "
+            f"USING ({_to_code('status', EVENT_STATUS_CODES, 'NULL')})"
+        )
+        return
+
+    # Other databases: rewrite the values in place, then change the column types
+    op.execute(f"""
+        UPDATE keyevent SET
+            details = CASE
+                WHEN {_registered('event_type')} THEN
+                    CASE WHEN details IS NULL THEN NULL ELSE json_object('message', details) END
+                WHEN details IS NULL THEN json_object('event_type', event_type)
+                ELSE json_object('message', details, 'event_type', event_type)
+            END,
+            event_type = {_to_code('event_type', EVENT_TYPE_CODES, UNKNOWN_CODE)},
+            status = {_to_code('status', EVENT_STATUS_CODES, 'NULL')}
+    """)
+    with op.batch_alter_table('keyevent') as batch_op:
+        batch_op.alter_column('event_type', type_=sa.SmallInteger(), existing_nullable=False)
+        batch_op.alter_column('status', type_=sa.SmallInteger(), existing_nullable=True)
+        batch_op.alter_column('details', type_=sa.JSON(), existing_nullable=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        unregistered = "COALESCE(details->>'event_type', 'unknown')"
+        op.execute(
+            f"ALTER TABLE keyevent ALTER COLUMN event_type TYPE VARCHAR "
+            f"USING ({_to_value('event_type', EVENT_TYPE_CODES, unregistered)})"
+        )
+        op.execute(
+            f"ALTER TABLE keyevent ALTER COLUMN status TYPE VARCHAR "
+            f"USING ({_to_value('status', EVENT_STATUS_CODES, 'NULL')})"
+        )
+        op.execute(
+            "ALTER TABLE keyevent ALTER COLUMN details TYPE VARCHAR "
+            "USING (COALESCE(details->>'message', details::text))"
+        )
+        return
+
+    with op.batch_alter_table('keyevent') as batch_op:
+        batch_op.alter_column('event_type', type_=sa.String(), existing_nullable=False)
+        batch_op.alter_column('status', type_=sa.String(), existing_nullable=True)
+        batch_op.alter_column('details', type_=sa.String(), existing_nullable=True)
+    unregistered = "COALESCE(json_extract(details, '$.event_type'), 'unknown')"
+    op.execute(f"""
+        UPDATE keyevent SET
+            event_type = {_to_value('CAST(event_type AS INTEGER)', EVENT_TYPE_CODES, unregistered)},
+            status = {_to_value('CAST(status AS INTEGER)', EVENT_STATUS_CODES, 'NULL')},
+            details = COALESCE(json_extract(details, '$.message'), details)
+    """)
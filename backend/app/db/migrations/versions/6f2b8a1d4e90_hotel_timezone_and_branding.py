@@ -0,0 +1,40 @@
+"""Add hotel timezone, location and wallet pass branding colors
+
+Revision ID: 6f2b8a1d4e90
+Revises: e27a4c6b9f13
+Create Date: 2025-03-29 09:00:00.000000
+
+Existing hotels get Europe/Paris, the timezone the application assumed
+before it was stored per hotel. Colors left NULL fall back to the defaults
+in app/services/hotel_service.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2b8a1d4e90'
+down_revision = 'e27a4c6b9f13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('hotel') as batch_op:
+        batch_op.add_column(sa.Column('timezone', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('background_color', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('foreground_color', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('label_color', sa.String(), nullable=True))
+    op.execute("UPDATE hotel SET timezone = 'Europe/Paris' WHERE timezone IS NULL")
+
+
+def downgrade():
+    with op.batch_alter_table('hotel') as batch_op:
+        batch_op.drop_column('label_color')
+        batch_op.drop_column('foreground_color')
+        batch_op.drop_column('background_color')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+        batch_op.drop_column('timezone')
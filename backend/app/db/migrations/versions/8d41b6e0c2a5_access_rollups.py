@@ -0,0 +1,61 @@
+"""Add keyevent.lock_id and door access rollup tables
+
+Revision ID: 8d41b6e0c2a5
+Revises: 3c9e2f4a7b1d
+Create Date: 2025-03-08 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41b6e0c2a5'
+down_revision = '3c9e2f4a7b1d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('keyevent', sa.Column('lock_id', sa.String(), nullable=True))
+    op.create_index('ix_keyevent_created_at_id', 'keyevent', ['created_at', 'id'])
+
+    op.create_table(
+        'accessrollup',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('hotel_id', sa.String(), nullable=False),
+        sa.Column('room_id', sa.String(), nullable=False),
+        sa.Column('lock_id', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('outcome', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hotel_id', 'room_id', 'lock_id', 'bucket_start', 'outcome', name='accessrollup_bucket_unique'),
+    )
+    op.create_index('ix_accessrollup_id', 'accessrollup', ['id'])
+    op.create_index('ix_accessrollup_hotel_bucket', 'accessrollup', ['hotel_id', 'bucket_start'])
+
+    op.create_table(
+        'rollupwatermark',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('last_created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_event_id', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name'),
+    )
+    op.create_index('ix_rollupwatermark_id', 'rollupwatermark', ['id'])
+
+
+def downgrade():
+    op.drop_index('ix_rollupwatermark_id', table_name='rollupwatermark')
+    op.drop_table('rollupwatermark')
+    op.drop_index('ix_accessrollup_hotel_bucket', table_name='accessrollup')
+    op.drop_index('ix_accessrollup_id', table_name='accessrollup')
+    op.drop_table('accessrollup')
+    op.drop_index('ix_keyevent_created_at_id', table_name='keyevent')
+    op.drop_column('keyevent', 'lock_id')
@@ -0,0 +1,29 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 9a3c5e7f1b24
+Revises: 6f2b8a1d4e90
+Create Date: 2025-04-05 09:00:00.000000
+
+One index per list endpoint sort key, ending with id so the order is total.
+keyevent's (created_at, id) index was added with the access rollups.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9a3c5e7f1b24'
+down_revision = '6f2b8a1d4e90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_digitalkey_created_at_id', 'digitalkey', ['created_at', 'id'])
+    op.create_index('ix_reservation_check_in_id', 'reservation', ['check_in', 'id'])
+    op.create_index('ix_room_room_number_id', 'room', ['room_number', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_room_room_number_id', table_name='room')
+    op.drop_index('ix_reservation_check_in_id', table_name='reservation')
+    op.drop_index('ix_digitalkey_created_at_id', table_name='digitalkey')
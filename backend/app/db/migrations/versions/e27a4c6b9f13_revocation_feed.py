@@ -0,0 +1,97 @@
+"""Add per-hotel revocation feed tables
+
+Revision ID: e27a4c6b9f13
+Revises: 5b7f1c9d2e48
+Create Date: 2025-03-22 09:00:00.000000
+
+Keys that are already revoked or expired but still inside their validity
+window are loaded into the feed at version 1 of their hotel.
+"""
+from datetime import datetime, timezone
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e27a4c6b9f13'
+down_revision = '5b7f1c9d2e48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'keyrevocation',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('hotel_id', sa.String(), nullable=False),
+        sa.Column('key_uuid', sa.String(), nullable=False),
+        sa.Column('valid_until', sa.DateTime(), nullable=False),
+        sa.Column('revoked', sa.Boolean(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('key_uuid'),
+    )
+    op.create_index('ix_keyrevocation_id', 'keyrevocation', ['id'])
+    op.create_index('ix_keyrevocation_hotel_version', 'keyrevocation', ['hotel_id', 'version'])
+
+    op.create_table(
+        'revocationfeed',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('hotel_id', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('compacted_version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hotel_id'),
+    )
+    op.create_index('ix_revocationfeed_id', 'revocationfeed', ['id'])
+
+    # Backfill; digitalkey.status holds enum names
+    connection = op.get_bind()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    rows = connection.execute(sa.text(
+        "SELECT room.hotel_id, digitalkey.key_uuid, digitalkey.valid_until "
+        "FROM digitalkey "
+        "JOIN reservation ON reservation.id = digitalkey.reservation_id "
+        "JOIN room ON room.id = reservation.room_id "
+        "WHERE (digitalkey.is_active = :inactive OR digitalkey.status IN ('REVOKED', 'EXPIRED')) "
+        "AND digitalkey.valid_until > :now"
+    ).columns(hotel_id=sa.String, key_uuid=sa.String, valid_until=sa.DateTime), {"inactive": False, "now": now}).all()
+    if not rows:
+        return
+
+    keyrevocation = sa.table(
+        'keyrevocation',
+        sa.column('id', sa.String), sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+        sa.column('hotel_id', sa.String), sa.column('key_uuid', sa.String), sa.column('valid_until', sa.DateTime),
+        sa.column('revoked', sa.Boolean), sa.column('version', sa.BigInteger),
+    )
+    revocationfeed = sa.table(
+        'revocationfeed',
+        sa.column('id', sa.String), sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+        sa.column('hotel_id', sa.String), sa.column('version', sa.BigInteger), sa.column('compacted_version', sa.BigInteger),
+    )
+    op.bulk_insert(keyrevocation, [
+        {
+            'id': str(uuid.uuid4()), 'created_at': now, 'updated_at': now, 'hotel_id': hotel_id,
+            'key_uuid': key_uuid, 'valid_until': valid_until, 'revoked': True, 'version': 1,
+        }
+        for hotel_id, key_uuid, valid_until in rows
+    ])
+    op.bulk_insert(revocationfeed, [
+        {'id': str(uuid.uuid4()), 'created_at': now, 'updated_at': now, 'hotel_id': hotel_id, 'version': 1, 'compacted_version': 0}
+        for hotel_id in sorted({row[0] for row in rows})
+    ])
+
+
+def downgrade():
+    op.drop_index('ix_revocationfeed_id', table_name='revocationfeed')
+    op.drop_table('revocationfeed')
+    op.drop_index('ix_keyrevocation_hotel_version', table_name='keyrevocation')
+    op.drop_index('ix_keyrevocation_id', table_name='keyrevocation')
+    op.drop_table('keyrevocation')
@@ -1,16 +1,63 @@
 # backend/app/db/session.py
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
 
 from app.config import settings
+from app.utils.metrics import histogram
+from app.utils.query_profiler import record_query
+
+db_query_duration = histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements, by statement type",
+    ("operation",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+_QUERY_OPERATIONS = {"select", "insert", "update", "delete"}
+
+
+def _query_operation(statement: str) -> str:
+    words = statement.split(None, 1)
+    operation = words[0].lower() if words else ""
+    return operation if operation in _QUERY_OPERATIONS else "other"
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context.query_start_time = time.perf_counter()
+
+
+def _observe_query_time(conn, cursor, statement, parameters, context, executemany):
+    # Statements that fail never get here, so nothing is left behind
+    start = getattr(context, "query_start_time", None)
+    if start is not None:
+        duration = time.perf_counter() - start
+        db_query_duration.observe(duration, operation=_query_operation(statement))
+        record_query(statement, duration)
+
+
+def track_query_time(engine: Engine) -> None:
+    """
+    Time every statement run on engine
+
+    Durations go to db_query_duration_seconds and, with the SQL profiler
+    enabled, to the current request's query profile. Safe to call twice.
+    """
+    if event.contains(engine, "before_cursor_execute", _start_query_timer):
+        return
+    event.listen(engine, "before_cursor_execute", _start_query_timer)
+    event.listen(engine, "after_cursor_execute", _observe_query_time)
+
 
 # Convert the PostgresDsn object to a string
 DATABASE_URL = str(settings.SQLALCHEMY_DATABASE_URI)
 
 # Create SQLAlchemy engine
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+track_query_time(engine)
 
 # Create test session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
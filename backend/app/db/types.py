@@ -0,0 +1,61 @@
+# backend/app/db/types.py
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy import JSON, SmallInteger
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+
+
+class CodedString(TypeDecorator):
+    """
+    String values stored as small integer codes
+
+    The mapping is part of the schema: codes must never be reused or
+    renumbered, only appended. Unregistered values are rejected on write;
+    unknown codes read back as `unknown_value`.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, codes: Mapping[str, int], unknown_value: Optional[str] = None):
+        super().__init__()
+        # Stored as tuples so the type stays hashable for the statement cache
+        self.codes = tuple(sorted(codes.items()))
+        self.unknown_value = unknown_value
+        self._by_value = dict(self.codes)
+        self._by_code = {code: value for value, code in self.codes}
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        # Enum members carry their string in .value
+        value = getattr(value, "value", value)
+        try:
+            return self._by_value[value]
+        except KeyError:
+            raise ValueError(f"Unregistered value: {value}")
+
+    def process_result_value(self, value: Optional[int], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return self._by_code.get(value, self.unknown_value)
+
+
+class StructuredDetails(TypeDecorator):
+    """
+    JSON object column, stored as JSONB on PostgreSQL
+
+    Plain strings from older callers are wrapped as {"message": ...}.
+    """
+    impl = JSON
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[Dict[str, Any]]:
+        if isinstance(value, str):
+            return {"message": value}
+        return value
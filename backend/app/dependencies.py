@@ -1,4 +1,5 @@
 # backend/app/dependencies.py
+import logging
 from typing import Generator
 
 from fastapi import Depends, HTTPException, status, Path
@@ -11,6 +12,8 @@ from app.models.hotel import Hotel
 from app.models.room import Room
 from app.models.reservation import Reservation
 
+logger = logging.getLogger(__name__)
+
 
 def get_current_user_hotel(
     db: Session = Depends(get_db),
@@ -61,11 +64,7 @@ def get_reservation_or_404(
             detail="Reservation not found"
         )
     
-    # Debug prints
-    print(f"Reservation found: {reservation.id}")
-    print(f"Room data: {reservation.room}")
-    if reservation.room:
-        print(f"Hotel data: {reservation.room.hotel}")
+    logger.debug(f"Reservation found: {reservation.id} (room {reservation.room_id})")
     
     return reservation
 
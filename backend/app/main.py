@@ -3,17 +3,30 @@ import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.utils.pagination import NEXT_CURSOR_HEADER
 import logging
-from logging.config import dictConfig
 from app.db.session import SessionLocal
-import time
 import asyncio
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from app.api.router import api_router
 from app.config import settings
 from app.db.session import engine
 from app.models.base import Base
+from app.utils.metrics import registry as metrics_registry
+from app.utils.request_metrics import MetricsMiddleware
+from app.utils.query_profiler import QueryProfilerMiddleware
+from app.utils.sampling_profiler import ProfilerMiddleware, profiler
+from app.services.template_service import template_registry
+from app.services.credential_service import warm_signing_key
+from app.services.health_service import readiness
+from app.utils.invalidation import invalidation_bus
+from app.services.event_retention_service import run_key_event_maintenance
+from app.services.access_rollup_service import run_access_rollup
+from app.services.revocation_service import run_revocation_maintenance
+from app.utils.periodic import run_in_background, run_periodically
+from app.utils.log_config import configure_logging, parse_sample_rates
 
 
 # Get the directory where the main.py file is located
@@ -22,55 +35,17 @@ log_dir = os.path.join(base_dir, "..", "logs")
 os.makedirs(log_dir, exist_ok=True)
 
 
-logging_config = {
-    "version": 1,
-    "disable_existing_loggers": False,
-    "formatters": {
-        "default": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        },
-    },
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "level": "INFO",
-            "formatter": "default",
-        },
-        "file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "level": "INFO",
-            "formatter": "default",
-            "filename": os.path.join(log_dir, "app.log"),
-            "maxBytes": 10485760,  # 10 MB
-            "backupCount": 5,
-        },
-    },
-    "loggers": {
-        # Set propagate=False for app and its subloggers
-        "app": {"handlers": ["console", "file"], "level": "INFO", "propagate": False},
-        "app.api": {"level": "INFO", "propagate": True},  # Will inherit from "app"
-        "app.services": {"level": "INFO", "propagate": True},  # Will inherit from "app"
-        "uvicorn": {"handlers": ["console", "file"], "level": "INFO", "propagate": False},
-    },
-    # Root logger has no handlers - messages propagate up to their parent loggers
-    "root": {"level": "INFO"},
-}
-
-dictConfig(logging_config)
+# Console and file output run on a listener thread, off the request path
+configure_logging(
+    log_dir,
+    level=settings.LOG_LEVEL,
+    fmt=settings.LOG_FORMAT,
+    sample_rates=parse_sample_rates(settings.LOG_SAMPLE_RATES),
+    queue_size=settings.LOG_QUEUE_SIZE,
+)
 logger = logging.getLogger("app")
 
 
-# Request timing middleware
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        logger.info(f"Request took {process_time:.4f}s: {request.method} {request.url.path}")
-        return response
-
-
 def create_tables():
     """
     Create database tables based on SQLAlchemy models
@@ -83,7 +58,7 @@ def create_tables():
         raise
 
 def startup_event():
-    """Run tasks at application startup"""
+    """One-off startup tasks; run in the background once the app is serving"""
     db = SessionLocal()
     try:
         # Update auth tokens for existing keys
@@ -96,6 +71,7 @@ def startup_event():
         # deactivated = expire_outdated_keys(db)
         # if deactivated > 0:
         #     logger.info(f"Startup: Deactivated {deactivated} expired keys")
+        return updated
     finally:
         db.close()
 
@@ -109,11 +85,59 @@ async def lifespan(app: FastAPI):
     # Startup tasks
     logger.info("Starting up application...")
     
-    # Create database tables
-    create_tables()
+    # Migrations own the schema; create_all is only a local development shortcut
+    if settings.AUTO_CREATE_TABLES:
+        create_tables()
+    
+    # Apply cache invalidations published by other workers
+    invalidation_bus.start()
+    
+    # Profile sessions run in every worker; their stacks meet in WORKER_STATE_DIR
+    profiler.share(invalidation_bus, app.routes, settings.WORKER_STATE_DIR)
+    
+    # Startup tasks and warm-ups run after startup, in worker threads; /readyz
+    # reports the worker unready until they finish (anything not warmed yet
+    # is loaded on first use)
+    background_tasks = [
+        asyncio.create_task(run_in_background("startup_tasks", readiness.warm_up("startup_tasks", startup_event))),
+        asyncio.create_task(run_in_background("template_warmup", readiness.warm_up("templates", template_registry.warm))),
+        asyncio.create_task(run_in_background("credential_key_warmup", readiness.warm_up("credential_keys", warm_signing_key))),
+    ]
+    
+    # Keep key event partitions ahead of time and apply retention
+    if settings.KEY_EVENT_MAINTENANCE_ENABLED:
+        background_tasks.append(asyncio.create_task(run_periodically(
+            "key_event_maintenance",
+            settings.KEY_EVENT_MAINTENANCE_INTERVAL_SECONDS,
+            run_key_event_maintenance,
+        )))
+    
+    # Fold new door access events into dashboard rollups
+    if settings.ACCESS_ROLLUP_ENABLED:
+        background_tasks.append(asyncio.create_task(run_periodically(
+            "access_rollup",
+            settings.ACCESS_ROLLUP_INTERVAL_SECONDS,
+            run_access_rollup,
+            initial_delay=settings.ACCESS_ROLLUP_INTERVAL_SECONDS,
+        )))
     
-    # Run startup tasks
-    startup_event()
+    # Drop keys whose validity ended from the revocation feeds
+    background_tasks.append(asyncio.create_task(run_periodically(
+        "revocation_maintenance",
+        settings.REVOCATION_MAINTENANCE_INTERVAL_SECONDS,
+        run_revocation_maintenance,
+        initial_delay=settings.REVOCATION_MAINTENANCE_INTERVAL_SECONDS,
+    )))
+    
+    # /metrics adds up every worker's snapshot, so any worker can answer a scrape
+    if settings.WORKER_STATE_DIR:
+        metrics_registry.share(settings.WORKER_STATE_DIR)
+        background_tasks.append(asyncio.create_task(run_periodically(
+            "metrics_flush",
+            settings.METRICS_FLUSH_INTERVAL_SECONDS,
+            metrics_registry.flush,
+            log_results=False,
+        )))
     
     logger.info("Application startup complete")
     
@@ -123,7 +147,11 @@ async def lifespan(app: FastAPI):
     # Shutdown tasks
     logger.info("Shutting down application...")
     
-    # No scheduled_key_expiration task to cancel
+    for task in background_tasks:
+        task.cancel()
+    invalidation_bus.stop()
+    # Keep this worker's counts once it is recycled
+    metrics_registry.flush()
     
     logger.info("Application shutdown complete")
 
@@ -147,10 +175,20 @@ def get_application():
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=[NEXT_CURSOR_HEADER],
         )
     
-    # Add timing middleware
-    app.add_middleware(TimingMiddleware)
+    # Marks requests picked by an admin profiling session (no-op otherwise)
+    app.add_middleware(ProfilerMiddleware)
+    
+    # Per-request SQL counts and DB time (no-op unless SQL_PROFILER_ENABLED)
+    app.add_middleware(QueryProfilerMiddleware)
+    
+    # Per-route latency histograms and status counters, exposed at /metrics
+    app.add_middleware(MetricsMiddleware)
+    
+    # Compress larger responses (exports, lists) for clients that accept gzip
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
     
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -158,6 +196,24 @@ def get_application():
     @app.get("/health", tags=["health"])
     def health_check():
         return {"status": "healthy"}
+
+    # Liveness only: async so it answers even when the request threadpool is busy
+    @app.get("/livez", tags=["health"])
+    async def liveness_check():
+        return {"status": "alive"}
+
+    # Readiness: warm-ups done, DB pool has room, worker queues not backed up
+    @app.get("/readyz", tags=["health"])
+    def readiness_check():
+        status = readiness.status()
+        return JSONResponse(
+            {"status": "ready" if status["ready"] else "not_ready", "checks": status["checks"]},
+            status_code=200 if status["ready"] else 503,
+        )
+
+    @app.get("/metrics", tags=["health"], include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
     
     return app
 
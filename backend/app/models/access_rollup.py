@@ -0,0 +1,48 @@
+# backend/app/models/access_rollup.py
+from sqlalchemy import Column, String, DateTime, Integer, UniqueConstraint, Index
+
+from app.models.base import BaseModel
+
+
+class AccessOutcome:
+    GRANTED = "granted"
+    DENIED = "denied"
+
+
+class AccessRollup(BaseModel):
+    """
+    Hourly door access counters per (hotel, room, lock, outcome)
+
+    Built incrementally from KeyEvent rows by the access rollup job; unknown
+    hotel/room/lock are stored as "" so the unique key works on every database.
+    """
+    __tablename__ = "accessrollup"
+
+    hotel_id = Column(String, nullable=False, default="")
+    room_id = Column(String, nullable=False, default="")
+    lock_id = Column(String, nullable=False, default="")
+    bucket_start = Column(DateTime, nullable=False)
+    outcome = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint('hotel_id', 'room_id', 'lock_id', 'bucket_start', 'outcome', name='accessrollup_bucket_unique'),
+        Index("ix_accessrollup_hotel_bucket", "hotel_id", "bucket_start"),
+    )
+
+    def __repr__(self):
+        return f"<AccessRollup {self.lock_id} {self.bucket_start} {self.outcome}={self.count}>"
+
+
+class RollupWatermark(BaseModel):
+    """
+    Position up to which raw events have been folded into a rollup
+
+    Events are ordered by (created_at, id) so late-arriving events with old
+    timestamps are still picked up.
+    """
+    __tablename__ = "rollupwatermark"
+
+    name = Column(String, unique=True, nullable=False)
+    last_created_at = Column(DateTime)
+    last_event_id = Column(String)
@@ -1,5 +1,5 @@
 # backend/app/models/digital_key.py
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime, timezone
@@ -24,6 +24,10 @@ class DigitalKey(BaseModel):
     Digital Key model for virtual room keys
     """
     __tablename__ = "digitalkey"
+    __table_args__ = (
+        # Keyset pagination sort key
+        Index("ix_digitalkey_created_at_id", "created_at", "id"),
+    )
     
     # Your existing columns
     reservation_id = Column(String, ForeignKey("reservation.id"), nullable=False)
@@ -1,5 +1,5 @@
 # backend/app/models/hotel.py
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Float
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -19,6 +19,13 @@ class Hotel(BaseModel):
     email = Column(String)
     website = Column(String)
     logo_url = Column(String)
+    timezone = Column(String, default="Europe/Paris")
+    latitude = Column(Float)
+    longitude = Column(Float)
+    # Wallet pass branding, as CSS-style rgb() strings
+    background_color = Column(String)
+    foreground_color = Column(String)
+    label_color = Column(String)
     is_active = Column(Boolean, default=True)
     
     # Relationships
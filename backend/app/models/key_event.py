@@ -1,9 +1,10 @@
 from datetime import datetime, timezone
 from enum import Enum
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from typing import Optional
 
+from app.db.types import CodedString, StructuredDetails
 from app.models.base import BaseModel
 
 class EventType(str, Enum):
@@ -20,17 +21,84 @@ class EventType(str, Enum):
     KEY_SMS_FAILED = "key_sms_failed"
     KEY_UPDATED = "key_updated"
     KEY_EXTENDED = "key_extended"
+    KEY_CREATION_FAILED = "key_creation_failed"
+    KEY_EMAIL_SCHEDULED = "key_email_scheduled"
+    KEY_EMAIL_SCHEDULING_FAILED = "key_email_scheduling_failed"
+    KEY_EXPIRED = "key_expired"
+    KEY_REGENERATED = "key_regenerated"
+    ACCESS_ATTEMPT = "access_attempt"
+    PUSH_NOTIFICATION_SENT = "push_notification_sent"
+    PUSH_NOTIFICATION_FAILED = "push_notification_failed"
+    PUSH_NOTIFICATION_ERROR = "push_notification_error"
+    WALLET_PASS_UPDATED = "wallet_pass_updated"
+    WALLET_PASS_UPDATE_FAILED = "wallet_pass_update_failed"
+    WALLET_UPDATE_FAILED = "wallet_update_failed"
+
+class EventStatus(str, Enum):
+    SUCCESS = "success"
+    ERROR = "error"
+    PENDING = "pending"
+    FAILURE = "failure"
+
+# Stored codes for event_type and status. These are persisted, so existing
+# codes must never change; add new values at the end. Code 0 is reserved
+# for legacy rows whose value was not registered when they were migrated.
+UNKNOWN_EVENT_TYPE = "unknown"
+
+EVENT_TYPE_CODES = {
+    EventType.KEY_CREATED.value: 1,
+    EventType.KEY_ACTIVATED.value: 2,
+    EventType.KEY_DEACTIVATED.value: 3,
+    EventType.PHYSICAL_ACCESS_ATTEMPT.value: 4,
+    EventType.PHYSICAL_ACCESS_GRANTED.value: 5,
+    EventType.PHYSICAL_ACCESS_DENIED.value: 6,
+    EventType.DIGITAL_ACCESS.value: 7,
+    EventType.KEY_EMAIL_SENT.value: 8,
+    EventType.KEY_EMAIL_FAILED.value: 9,
+    EventType.KEY_SMS_SENT.value: 10,
+    EventType.KEY_SMS_FAILED.value: 11,
+    EventType.KEY_UPDATED.value: 12,
+    EventType.KEY_EXTENDED.value: 13,
+    EventType.KEY_CREATION_FAILED.value: 14,
+    EventType.KEY_EMAIL_SCHEDULED.value: 15,
+    EventType.KEY_EMAIL_SCHEDULING_FAILED.value: 16,
+    EventType.KEY_EXPIRED.value: 17,
+    EventType.KEY_REGENERATED.value: 18,
+    EventType.ACCESS_ATTEMPT.value: 19,
+    EventType.PUSH_NOTIFICATION_SENT.value: 20,
+    EventType.PUSH_NOTIFICATION_FAILED.value: 21,
+    EventType.PUSH_NOTIFICATION_ERROR.value: 22,
+    EventType.WALLET_PASS_UPDATED.value: 23,
+    EventType.WALLET_PASS_UPDATE_FAILED.value: 24,
+    EventType.WALLET_UPDATE_FAILED.value: 25,
+}
+
+EVENT_STATUS_CODES = {
+    EventStatus.SUCCESS.value: 1,
+    EventStatus.ERROR.value: 2,
+    EventStatus.PENDING.value: 3,
+    EventStatus.FAILURE.value: 4,
+}
 
 class KeyEvent(BaseModel):
     __tablename__ = "keyevent"
+    __table_args__ = (
+        # Per-key history, newest first
+        Index("ix_keyevent_key_id_timestamp", "key_id", text("timestamp DESC")),
+        # Hotel-wide reports and exports by event type
+        Index("ix_keyevent_event_type_timestamp", "event_type", "timestamp"),
+        # Incremental rollups scan events in insertion order
+        Index("ix_keyevent_created_at_id", "created_at", "id"),
+    )
 
     key_id = Column(String, ForeignKey("digitalkey.id"))
-    event_type = Column(String, nullable=False)
+    event_type = Column(CodedString(EVENT_TYPE_CODES, UNKNOWN_EVENT_TYPE), nullable=False)
     device_info = Column(String, nullable=True)
     timestamp = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     location = Column(String, nullable=True)
-    status = Column(String, nullable=True)
-    details = Column(String, nullable=True)
+    lock_id = Column(String, nullable=True)
+    status = Column(CodedString(EVENT_STATUS_CODES), nullable=True)
+    details = Column(StructuredDetails, nullable=True)
 
     # Relationship
     digital_key = relationship("DigitalKey", back_populates="events")
@@ -38,13 +106,12 @@ class KeyEvent(BaseModel):
     @classmethod
     def create(cls, key_id: str, event_type: str, **kwargs) -> "KeyEvent":
         # Validate event type
-        if event_type not in EventType.__members__.values():
+        if getattr(event_type, "value", event_type) not in EVENT_TYPE_CODES:
             raise ValueError(f"Invalid event type: {event_type}")
         
         # Validate status
         status = kwargs.get('status', 'success')
-        valid_statuses = ['success', 'error', 'pending']
-        if status not in valid_statuses:
+        if status not in EVENT_STATUS_CODES:
             raise ValueError(f"Invalid status: {status}")
         
         # Create the event with all fields
@@ -0,0 +1,43 @@
+# backend/app/models/key_revocation.py
+from sqlalchemy import Column, String, DateTime, Boolean, BigInteger, Index
+
+from app.models.base import BaseModel
+
+
+class KeyRevocation(BaseModel):
+    """
+    Revocation state of a key in its hotel's revocation feed
+
+    Rows are kept after a key is restored or its validity ends (revoked =
+    False) so delta clients learn to drop it; version is the feed version of
+    the last change.
+    """
+    __tablename__ = "keyrevocation"
+
+    hotel_id = Column(String, nullable=False)
+    key_uuid = Column(String, unique=True, nullable=False)
+    valid_until = Column(DateTime, nullable=False)
+    revoked = Column(Boolean, nullable=False, default=True)
+    version = Column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        # Delta queries: changes of one hotel after a version
+        Index("ix_keyrevocation_hotel_version", "hotel_id", "version"),
+    )
+
+    def __repr__(self):
+        return f"<KeyRevocation {self.key_uuid} revoked={self.revoked} v{self.version}>"
+
+
+class RevocationFeed(BaseModel):
+    """
+    Version counter of a hotel's revocation feed
+
+    Deltas are only available after compacted_version; older clients get a
+    full snapshot.
+    """
+    __tablename__ = "revocationfeed"
+
+    hotel_id = Column(String, unique=True, nullable=False)
+    version = Column(BigInteger, nullable=False, default=0)
+    compacted_version = Column(BigInteger, nullable=False, default=0)
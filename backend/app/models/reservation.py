@@ -1,5 +1,5 @@
 # backend/app/models/reservation.py
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Integer
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Integer, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime, timezone
@@ -20,6 +20,11 @@ class Reservation(BaseModel):
     """
     Reservation model representing guest bookings
     """
+    __table_args__ = (
+        # Keyset pagination sort key
+        Index("ix_reservation_check_in_id", "check_in", "id"),
+    )
+    
     user_id = Column(String, ForeignKey("user.id"), nullable=False)
     room_id = Column(String, ForeignKey("room.id"), nullable=False)
     confirmation_code = Column(String, unique=True, index=True, nullable=False)
@@ -1,5 +1,5 @@
 # backend/app/models/room.py
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Enum
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -18,6 +18,11 @@ class Room(BaseModel):
     """
     Room model representing individual hotel rooms
     """
+    __table_args__ = (
+        # Keyset pagination sort key
+        Index("ix_room_room_number_id", "room_number", "id"),
+    )
+    
     hotel_id = Column(String, ForeignKey("hotel.id"), nullable=False)
     room_number = Column(String, nullable=False)
     floor = Column(Integer)
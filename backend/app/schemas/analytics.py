@@ -0,0 +1,17 @@
+# backend/app/schemas/analytics.py
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class AccessBucket(BaseModel):
+    hotel_id: Optional[str] = None
+    room_id: Optional[str] = None
+    lock_id: Optional[str] = None
+    bucket_start: datetime
+    outcome: str
+    count: int
+
+
+class AccessRollupRebuild(BaseModel):
+    events_folded: int
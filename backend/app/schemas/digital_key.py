@@ -1,6 +1,6 @@
 # backend/app/schemas/digital_key.py
 from pydantic import BaseModel, field_validator, model_validator
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -60,7 +60,7 @@ class KeyEvent(BaseModel):
     event_type: str
     device_info: Optional[str] = None
     status: str
-    details: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
     timestamp: datetime
 
     model_config = {
@@ -95,6 +95,58 @@ class KeyVerification(BaseModel):
     guest_name: Optional[str] = None
 
 
+class KeyVerificationBatch(BaseModel):
+    taps: List[KeyVerificationRequest]
+
+
+class BatchKeyVerification(KeyVerification):
+    # Denial reason code, as stored in the access event details
+    reason: Optional[str] = None
+
+
+class KeyVerificationBatchResult(BaseModel):
+    results: List[BatchKeyVerification]
+
+
+# Offline verification schemas
+class CredentialPublicKey(BaseModel):
+    kid: str
+    alg: str
+    public_key: str
+
+
+class CredentialKeySet(BaseModel):
+    keys: List[CredentialPublicKey]
+
+
+class OfflineAccessLog(BaseModel):
+    key_uuid: Optional[str] = None
+    lock_id: str
+    timestamp: datetime
+    granted: bool
+    reason: Optional[str] = None
+    device_info: Optional[str] = None
+    location: Optional[str] = None
+
+
+class OfflineAccessLogBatch(BaseModel):
+    entries: List[OfflineAccessLog]
+
+
+class OfflineAccessLogResult(BaseModel):
+    accepted: int
+    unknown_keys: int
+
+
+class RevocationFeed(BaseModel):
+    hotel_id: str
+    version: int
+    # True for a full snapshot (added is the whole deny-set), False for a delta
+    full: bool
+    added: List[str]
+    removed: List[str]
+
+
 # Key event schemas TODO: move to key_event.py
 class KeyEventBase(BaseModel):
     key_id: str
@@ -102,7 +154,7 @@ class KeyEventBase(BaseModel):
     device_info: Optional[str] = None
     location: Optional[str] = None
     status: str
-    details: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
 
 
 class KeyEventCreate(KeyEventBase):
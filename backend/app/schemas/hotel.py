@@ -16,6 +16,12 @@ class HotelBase(BaseModel):
     email: Optional[EmailStr] = None
     website: Optional[str] = None
     logo_url: Optional[str] = None
+    timezone: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    background_color: Optional[str] = None
+    foreground_color: Optional[str] = None
+    label_color: Optional[str] = None
 
 
 # Properties to receive on hotel creation
@@ -35,6 +41,12 @@ class HotelUpdate(BaseModel):
     email: Optional[EmailStr] = None
     website: Optional[str] = None
     logo_url: Optional[str] = None
+    timezone: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    background_color: Optional[str] = None
+    foreground_color: Optional[str] = None
+    label_color: Optional[str] = None
     is_active: Optional[bool] = None
 
 
@@ -0,0 +1,25 @@
+# backend/app/schemas/profiling.py
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class ProfilerStart(BaseModel):
+    route: str  # Route template, e.g. /api/v1/verify/key
+    method: str = "GET"
+    sample_every: int = Field(1, ge=1, le=10000)  # Profile one in N matching requests
+    duration_seconds: float = Field(60, gt=0, le=3600)
+    interval_ms: float = Field(5, ge=1, le=1000)
+
+
+class ProfilerStatus(BaseModel):
+    route: str
+    method: str
+    sample_every: int
+    interval_ms: float
+    started_at: datetime
+    ends_at: datetime
+    active: bool
+    requests_seen: int
+    requests_profiled: int
+    samples: int
+    distinct_stacks: int
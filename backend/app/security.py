@@ -1,8 +1,12 @@
 # backend/app/security.py
+import hashlib
+import hmac
+import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional, Union
+from typing import Any, Optional, Tuple, Union
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -12,14 +16,63 @@ from app.db.session import get_db
 from app.models.user import User, UserRole
 from app.schemas.user import TokenPayload
 from app.config import settings
+from app.utils.cache import LRUCache
+from app.utils.invalidation import invalidation_bus
+from app.utils.metrics import counter
+from app.utils.worker_pool import BoundedWorkerPool
+
+logger = logging.getLogger(__name__)
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt is deliberately slow, so it runs on its own small pool instead of the
+# event loop or the request threadpool shared with lock verification
+password_pool = BoundedWorkerPool(
+    "password_hash",
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+password_rehashes = counter(
+    "password_rehashes_total",
+    "Password hashes upgraded on login after a cost parameter change",
+)
 
 # OAuth2 configuration
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Cacheable snapshot of an authenticated user, used for permission checks"""
+    id: str
+    email: str
+    role: UserRole
+    is_active: bool
+    first_name: str
+    last_name: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            is_active=bool(user.is_active),
+            first_name=user.first_name,
+            last_name=user.last_name,
+        )
+
+
+# Short-lived cache of principals keyed by token subject (the user id)
+_principal_cache = LRUCache(
+    max_entries=settings.USER_PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+invalidation_bus.subscribe_cache("user_principal", _principal_cache)
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hashed password"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -30,6 +83,25 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash on the password pool"""
+    return await password_pool.run(pwd_context.hash, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the password pool
+    
+    Returns:
+        (valid, new_hash) where new_hash is set when the stored hash uses
+        outdated parameters and should be replaced
+    """
+    valid, new_hash = await password_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+    if valid and new_hash:
+        password_rehashes.inc()
+    return valid, new_hash
+
+
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     if expires_delta:
@@ -42,40 +114,83 @@ def create_access_token(subject: Union[str, Any], expires_delta: Optional[timede
     return encoded_jwt
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+def get_user_by_subject(db: Session, subject: str) -> Optional[User]:
     """
-    Get the current user from the token
+    Load the user a token subject refers to
     
-    Dependency to be used in FastAPI endpoints to get the authenticated user
+    Subjects are user ids; tokens issued before that change carry the email.
     """
-    credentials_exception = HTTPException(
+    if "@" in subject:
+        return db.query(User).filter(User.email == subject).first()
+    return db.get(User, subject)
+
+
+def invalidate_user_principal(user_id: Optional[str] = None) -> None:
+    """Drop a cached principal (or all of them if user_id is None) in every worker"""
+    invalidation_bus.publish("user_principal", user_id)
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def get_current_principal(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> UserPrincipal:
+    """
+    Get the authenticated user's principal from the token
     
+    Principals are cached for a short time, so permission checks on repeated
+    requests don't need the database
+    """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         token_data = TokenPayload(**payload)
         
         if datetime.fromtimestamp(token_data.exp, tz=timezone.utc) < datetime.now(timezone.utc):
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
     
-    user = db.query(User).filter(User.email == token_data.sub).first()
-    if not user:
-        raise credentials_exception
-    if not user.is_active:
+    principal = _principal_cache.get(token_data.sub)
+    if principal is None:
+        user = get_user_by_subject(db, token_data.sub)
+        if not user:
+            raise _credentials_exception()
+        principal = UserPrincipal.from_user(user)
+        # Legacy email subjects are not cached, so invalidation by id stays exhaustive
+        if "@" not in token_data.sub:
+            _principal_cache.set(token_data.sub, principal)
+    
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user account"
         )
     
+    return principal
+
+
+def get_current_user(
+    db: Session = Depends(get_db),
+    principal: UserPrincipal = Depends(get_current_principal)
+) -> User:
+    """
+    Get the current user from the token
+    
+    Dependency to be used in FastAPI endpoints to get the authenticated user
+    """
+    user = db.get(User, principal.id)
+    if not user:
+        invalidate_user_principal(principal.id)
+        raise _credentials_exception()
+    
     return user
 
 
-def get_current_active_staff(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_staff(current_user: UserPrincipal = Depends(get_current_principal)) -> UserPrincipal:
     """
     Check if the current user is staff
     
@@ -89,7 +204,7 @@ def get_current_active_staff(current_user: User = Depends(get_current_user)) ->
     return current_user
 
 
-def get_current_active_admin(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_admin(current_user: UserPrincipal = Depends(get_current_principal)) -> UserPrincipal:
     """
     Check if the current user is admin
     
@@ -101,3 +216,34 @@ def get_current_active_admin(current_user: User = Depends(get_current_user)) ->
             detail="Not enough permissions"
         )
     return current_user
+
+
+# Header carrying "sha256=<hex HMAC of the request body>" on lock uploads
+ACCESS_LOG_SIGNATURE_HEADER = "X-Access-Log-Signature"
+
+
+def sign_access_log_batch(body: bytes, secret: str) -> str:
+    """Signature header value for an access log upload body"""
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+async def verify_access_log_signature(
+    request: Request,
+    signature: Optional[str] = Header(None, alias=ACCESS_LOG_SIGNATURE_HEADER),
+) -> None:
+    """
+    Only accept access log batches signed with ACCESS_LOG_SECRET
+
+    Locks and gateways have no user account, so they prove themselves with
+    an HMAC of the exact request body instead of a token.
+    """
+    unauthorized = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or missing access log signature",
+    )
+    if not settings.ACCESS_LOG_SECRET:
+        logger.warning("Access log upload refused: ACCESS_LOG_SECRET is not set")
+        raise unauthorized
+    expected = sign_access_log_batch(await request.body(), settings.ACCESS_LOG_SECRET)
+    if not signature or not hmac.compare_digest(signature, expected):
+        raise unauthorized
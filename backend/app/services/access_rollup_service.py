@@ -0,0 +1,273 @@
+# backend/app/services/access_rollup_service.py
+import logging
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import get_db_context
+from app.models.access_rollup import AccessOutcome, AccessRollup, RollupWatermark
+from app.models.digital_key import DigitalKey
+from app.models.key_event import KeyEvent, EventType
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.utils.date_formatting import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_NAME = "access_rollup"
+
+# Event types folded into the rollup and the outcome they count towards
+OUTCOMES = {
+    EventType.PHYSICAL_ACCESS_GRANTED.value: AccessOutcome.GRANTED,
+    EventType.PHYSICAL_ACCESS_DENIED.value: AccessOutcome.DENIED,
+}
+
+BucketKey = Tuple[str, str, str, datetime, str]
+
+
+def hour_bucket(value: datetime) -> datetime:
+    """Start of the UTC hour containing value, as a naive datetime"""
+    return to_naive_utc(value).replace(minute=0, second=0, microsecond=0)
+
+
+def _get_watermark(db: Session) -> RollupWatermark:
+    # Row lock so concurrent workers can't fold the same events twice
+    watermark = db.query(RollupWatermark).filter(
+        RollupWatermark.name == WATERMARK_NAME
+    ).with_for_update().first()
+    if watermark is None:
+        watermark = RollupWatermark(name=WATERMARK_NAME)
+        db.add(watermark)
+        db.flush()
+    return watermark
+
+
+def _event_batch_query(db: Session, watermark: RollupWatermark, until: datetime, batch_size: int):
+    """Next batch of access events after the watermark, with their room resolved"""
+    # Room of the lock that was tapped, falling back to the key's room for
+    # events recorded before lock_id was stored
+    lock_room = db.query(Room.id, Room.hotel_id, Room.nfc_lock_id).subquery("lock_room")
+    key_room = db.query(
+        DigitalKey.id.label("key_id"), Room.id, Room.hotel_id, Room.nfc_lock_id
+    ).join(
+        Reservation, Reservation.id == DigitalKey.reservation_id
+    ).join(
+        Room, Room.id == Reservation.room_id
+    ).subquery("key_room")
+
+    query = db.query(
+        KeyEvent.id,
+        KeyEvent.created_at,
+        KeyEvent.timestamp,
+        KeyEvent.event_type,
+        func.coalesce(KeyEvent.lock_id, key_room.c.nfc_lock_id, "").label("lock_id"),
+        func.coalesce(lock_room.c.id, key_room.c.id, "").label("room_id"),
+        func.coalesce(lock_room.c.hotel_id, key_room.c.hotel_id, "").label("hotel_id"),
+    ).outerjoin(
+        lock_room, lock_room.c.nfc_lock_id == KeyEvent.lock_id
+    ).outerjoin(
+        key_room, key_room.c.key_id == KeyEvent.key_id
+    ).filter(
+        KeyEvent.event_type.in_(list(OUTCOMES)),
+        KeyEvent.created_at <= until,
+    )
+
+    if watermark.last_created_at is not None:
+        query = query.filter(
+            tuple_(KeyEvent.created_at, KeyEvent.id) > tuple_(watermark.last_created_at, watermark.last_event_id)
+        )
+
+    return query.order_by(KeyEvent.created_at, KeyEvent.id).limit(batch_size)
+
+
+def _upsert_counts(db: Session, counts: Dict[BucketKey, int]) -> None:
+    """Add counts to their rollup rows, creating missing buckets"""
+    if not counts:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "hotel_id": hotel_id,
+                "room_id": room_id,
+                "lock_id": lock_id,
+                "bucket_start": bucket_start,
+                "outcome": outcome,
+                "count": count,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for (hotel_id, room_id, lock_id, bucket_start, outcome), count in counts.items()
+        ]
+        statement = insert(AccessRollup).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=["hotel_id", "room_id", "lock_id", "bucket_start", "outcome"],
+            set_={
+                "count": AccessRollup.count + statement.excluded.count,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        db.execute(statement)
+        return
+
+    for (hotel_id, room_id, lock_id, bucket_start, outcome), count in counts.items():
+        rollup = db.query(AccessRollup).filter(
+            AccessRollup.hotel_id == hotel_id,
+            AccessRollup.room_id == room_id,
+            AccessRollup.lock_id == lock_id,
+            AccessRollup.bucket_start == bucket_start,
+            AccessRollup.outcome == outcome,
+        ).with_for_update().first()
+        if rollup is None:
+            db.add(AccessRollup(
+                hotel_id=hotel_id, room_id=room_id, lock_id=lock_id,
+                bucket_start=bucket_start, outcome=outcome, count=count,
+            ))
+        else:
+            rollup.count += count
+    db.flush()
+
+
+def fold_new_events(db: Session, batch_size: Optional[int] = None, lag_seconds: Optional[int] = None) -> int:
+    """
+    Fold access events recorded since the watermark into the hourly rollup
+
+    Each batch's counters and the advanced watermark are committed together,
+    so every event is counted exactly once even if the job is interrupted.
+    Events younger than lag_seconds are left for the next run, as their
+    outcome may still be being written.
+
+    Returns:
+        Number of events folded
+    """
+    batch_size = batch_size or settings.ACCESS_ROLLUP_BATCH_SIZE
+    lag = settings.ACCESS_ROLLUP_LAG_SECONDS if lag_seconds is None else lag_seconds
+    until = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=lag)
+
+    folded = 0
+    while True:
+        watermark = _get_watermark(db)
+        events = _event_batch_query(db, watermark, until, batch_size).all()
+        if not events:
+            db.commit()
+            break
+
+        counts: Counter = Counter()
+        for event in events:
+            counts[(
+                event.hotel_id,
+                event.room_id,
+                event.lock_id,
+                hour_bucket(event.timestamp),
+                OUTCOMES[event.event_type],
+            )] += 1
+
+        _upsert_counts(db, counts)
+        last = events[-1]
+        watermark.last_created_at = last.created_at
+        watermark.last_event_id = last.id
+        db.add(watermark)
+        db.commit()
+
+        folded += len(events)
+        if len(events) < batch_size:
+            break
+
+    if folded:
+        logger.info(f"Folded {folded} access events into rollups")
+    return folded
+
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Rebuild the access rollup from raw key events
+
+    Use after changing bucketing rules or to repair counts; raw events that
+    were removed by retention are no longer counted.
+
+    Returns:
+        Number of events folded
+    """
+    db.query(AccessRollup).delete(synchronize_session=False)
+    db.query(RollupWatermark).filter(RollupWatermark.name == WATERMARK_NAME).delete(synchronize_session=False)
+    db.commit()
+    logger.info("Access rollups cleared, rebuilding from raw events")
+    return fold_new_events(db)
+
+
+def query_access_rollups(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    hotel_id: Optional[str] = None,
+    room_id: Optional[str] = None,
+    lock_id: Optional[str] = None,
+    outcome: Optional[str] = None,
+    granularity: str = "hour",
+) -> List[Dict]:
+    """
+    Read access counters for a time range
+
+    Cost depends on the number of buckets in the range, not on the number of
+    raw events.
+
+    Returns:
+        List of bucket dicts ordered by bucket_start
+    """
+    query = db.query(
+        AccessRollup.hotel_id,
+        AccessRollup.room_id,
+        AccessRollup.lock_id,
+        AccessRollup.bucket_start,
+        AccessRollup.outcome,
+        AccessRollup.count,
+    ).filter(
+        AccessRollup.bucket_start >= hour_bucket(start),
+        AccessRollup.bucket_start < to_naive_utc(end),
+    )
+    if hotel_id:
+        query = query.filter(AccessRollup.hotel_id == hotel_id)
+    if room_id:
+        query = query.filter(AccessRollup.room_id == room_id)
+    if lock_id:
+        query = query.filter(AccessRollup.lock_id == lock_id)
+    if outcome:
+        query = query.filter(AccessRollup.outcome == outcome)
+
+    totals: Dict[BucketKey, int] = {}
+    for row in query.order_by(AccessRollup.bucket_start):
+        bucket_start = row.bucket_start
+        if granularity == "day":
+            bucket_start = bucket_start.replace(hour=0)
+        key = (row.hotel_id, row.room_id, row.lock_id, bucket_start, row.outcome)
+        totals[key] = totals.get(key, 0) + row.count
+
+    return [
+        {
+            "hotel_id": key[0] or None,
+            "room_id": key[1] or None,
+            "lock_id": key[2] or None,
+            "bucket_start": key[3],
+            "outcome": key[4],
+            "count": count,
+        }
+        for key, count in totals.items()
+    ]
+
+
+def run_access_rollup() -> int:
+    """Fold new events using a short-lived session (periodic job entry point)"""
+    with get_db_context() as db:
+        return fold_new_events(db)
@@ -0,0 +1,195 @@
+# backend/app/services/credential_service.py
+import base64
+import hashlib
+import logging
+import struct
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+from app.config import settings
+from app.utils.date_formatting import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+# Credential layout (all integers big-endian):
+#   version   1 byte
+#   kid       4 bytes, SHA-256 prefix of the raw public key that signed it
+#   key_uuid  16 bytes
+#   valid_from, valid_until  uint32 seconds since the epoch, UTC
+#   lock_id   1 byte length + UTF-8
+#   signature 64 bytes Ed25519 over everything above
+# encoded as unpadded base64url. nfc_simulator/offline_verifier.py decodes it.
+CREDENTIAL_VERSION = 1
+KID_SIZE = 4
+SIGNATURE_SIZE = 64
+_HEADER = struct.Struct(">B4s16sII")
+
+_signing_key: Optional[Ed25519PrivateKey] = None
+_signing_key_lock = threading.Lock()
+
+
+class CredentialError(ValueError):
+    """Raised when a credential can't be decoded or its signature is invalid"""
+
+
+@dataclass(frozen=True)
+class KeyCredential:
+    """Claims carried by an offline key credential"""
+    key_uuid: str
+    lock_id: str
+    valid_from: datetime
+    valid_until: datetime
+    kid: str
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _epoch(value: datetime) -> int:
+    # Same convention as every verification path: naive datetimes are UTC
+    return int(to_naive_utc(value).replace(tzinfo=timezone.utc).timestamp())
+
+
+def key_id(public_key: Ed25519PublicKey) -> bytes:
+    """Short identifier of a public key, so locks can hold several during rotation"""
+    raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return hashlib.sha256(raw).digest()[:KID_SIZE]
+
+
+def get_signing_key() -> Ed25519PrivateKey:
+    """
+    Load the Ed25519 credential signing key
+
+    Read once from KEY_CREDENTIAL_SIGNING_KEY_PATH (PKCS8 PEM). Without one an
+    ephemeral key is generated, so credentials stop verifying after a restart
+    (under gunicorn the master generates it, so all workers share it).
+    """
+    global _signing_key
+    if _signing_key is None:
+        with _signing_key_lock:
+            if _signing_key is None:
+                path = Path(settings.KEY_CREDENTIAL_SIGNING_KEY_PATH)
+                if path.exists():
+                    loaded = serialization.load_pem_private_key(path.read_bytes(), password=None)
+                    if not isinstance(loaded, Ed25519PrivateKey):
+                        raise ValueError(f"{path} is not an Ed25519 private key")
+                    _signing_key = loaded
+                else:
+                    logger.warning(f"Credential signing key {path} not found, using an ephemeral key")
+                    _signing_key = Ed25519PrivateKey.generate()
+    return _signing_key
+
+
+def issue_credential(key_uuid: str, lock_id: str, valid_from: datetime, valid_until: datetime) -> str:
+    """
+    Sign an offline credential for a key on one lock
+
+    Args:
+        key_uuid: Digital key UUID
+        lock_id: NFC lock the key opens
+        valid_from: Start of validity (naive values are UTC)
+        valid_until: End of validity (naive values are UTC)
+
+    Returns:
+        Credential as unpadded base64url text
+    """
+    signing_key = get_signing_key()
+    lock_bytes = (lock_id or "").encode("utf-8")
+    if len(lock_bytes) > 255:
+        raise ValueError(f"Lock ID too long for a credential: {lock_id}")
+
+    payload = _HEADER.pack(
+        CREDENTIAL_VERSION,
+        key_id(signing_key.public_key()),
+        uuid.UUID(key_uuid).bytes,
+        _epoch(valid_from),
+        _epoch(valid_until),
+    ) + bytes([len(lock_bytes)]) + lock_bytes
+    return _b64encode(payload + signing_key.sign(payload))
+
+
+def decode_credential(token: str, public_keys: Optional[Dict[bytes, Ed25519PublicKey]] = None) -> KeyCredential:
+    """
+    Check a credential's signature and return its claims
+
+    Validity times and the lock are returned, not checked; that is up to the
+    verifier at the door.
+    """
+    if public_keys is None:
+        public_key = get_signing_key().public_key()
+        public_keys = {key_id(public_key): public_key}
+
+    try:
+        data = _b64decode(token)
+    except ValueError:
+        raise CredentialError("Credential is not valid base64url")
+    if len(data) < _HEADER.size + 1 + SIGNATURE_SIZE:
+        raise CredentialError("Credential is too short")
+
+    payload, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+    version, kid, key_uuid, valid_from, valid_until = _HEADER.unpack_from(payload)
+    if version != CREDENTIAL_VERSION:
+        raise CredentialError(f"Unsupported credential version: {version}")
+    lock_length = payload[_HEADER.size]
+    if len(payload) != _HEADER.size + 1 + lock_length:
+        raise CredentialError("Credential length mismatch")
+
+    public_key = public_keys.get(kid)
+    if public_key is None:
+        raise CredentialError(f"Unknown credential key: {kid.hex()}")
+    try:
+        public_key.verify(signature, payload)
+    except InvalidSignature:
+        raise CredentialError("Invalid credential signature")
+
+    return KeyCredential(
+        key_uuid=str(uuid.UUID(bytes=key_uuid)),
+        lock_id=payload[_HEADER.size + 1:].decode("utf-8"),
+        valid_from=datetime.fromtimestamp(valid_from, timezone.utc),
+        valid_until=datetime.fromtimestamp(valid_until, timezone.utc),
+        kid=kid.hex(),
+    )
+
+
+def credential_for_pass(pass_data: Dict) -> Optional[str]:
+    """
+    Credential embedded in a wallet pass, issued from the pass data if not already set
+
+    Signs the key's validity window (valid_from/valid_until), which can differ
+    from the reservation dates once a key is extended.
+    """
+    if pass_data.get("credential"):
+        return pass_data["credential"]
+    if not pass_data.get("nfc_lock_id"):
+        return None
+    return issue_credential(
+        pass_data["key_uuid"],
+        pass_data["nfc_lock_id"],
+        datetime.fromisoformat(pass_data["valid_from"]),
+        datetime.fromisoformat(pass_data["valid_until"]),
+    )
+
+
+def get_public_keys() -> List[Dict[str, str]]:
+    """Public keys locks should trust, for the key distribution endpoint"""
+    public_key = get_signing_key().public_key()
+    raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return [{"kid": key_id(public_key).hex(), "alg": "Ed25519", "public_key": _b64encode(raw)}]
+
+
+def warm_signing_key() -> str:
+    """Load the signing key ahead of the first credential or key distribution request; returns its kid"""
+    return key_id(get_signing_key().public_key()).hex()
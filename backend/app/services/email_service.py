@@ -2,52 +2,30 @@
 import logging
 import smtplib
 import re
-import dns.resolver
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.image import MIMEImage
-from datetime import datetime
-import os
 import time
-from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
-import qrcode
-from io import BytesIO
-import base64
 
 from app.config import settings
 from app.utils.date_formatting import format_datetime
 from app.db.session import get_db_context
-from app.services.hotel_service import get_hotel_name
-from app.models.digital_key import DigitalKey
-from app.models.reservation import Reservation
-from app.models.room import Room
+from app.services import hotel_service
+from app.services.template_service import template_registry
+from app.utils.qr_cache import qr_code_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Set up Jinja2 environment for email templates
-templates_dir = Path(__file__).parent.parent.parent / "templates"
-env = Environment(loader=FileSystemLoader(templates_dir))
 
+def generate_qr_code(url, box_size=10, border=4, error_correction="L"):
+    """
+    Generate QR code for the wallet pass URL
 
-def generate_qr_code(url):
-    """Generate QR code for the wallet pass URL"""
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(url)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert PIL image to bytes for email embedding
-    buffered = BytesIO()
-    img.save(buffered, format="PNG")
-    return buffered.getvalue()
+    The pass URL for a key never changes, so the PNG is served from the QR
+    code cache and only rendered on the first request for a URL.
+    """
+    return qr_code_cache.get_png(url, box_size=box_size, border=border, error_correction=error_correction)
 
 
 def validate_email(email):
@@ -59,6 +37,8 @@ def validate_email(email):
     
     # Check if domain exists and has MX records
     domain = email.split('@')[1]
+    # Imported on first use: dnspython takes longer to load than the rest of this module
+    import dns.resolver
     try:
         mx_records = dns.resolver.resolve(domain, 'MX')
         if not mx_records:
@@ -70,6 +50,12 @@ def validate_email(email):
         return False, f"Error checking domain: {str(e)}"
 
 
+def get_hotel_id_for_key(key_id):
+    """Resolve the hotel of a digital key with a single query"""
+    with get_db_context() as db:
+        return hotel_service.get_hotel_id_for_key(db, key_id=key_id)
+
+
 def send_key_email(recipient_email, guest_name, pass_url, key_id, pass_data, max_retries=3):
     """Send email with digital key information to guest"""
      # First validate the email
@@ -78,33 +64,16 @@ def send_key_email(recipient_email, guest_name, pass_url, key_id, pass_data, max
         logger.error(f"Invalid email address: {recipient_email}. {validation_message}")
         return False, validation_message
     try:
-        # Get hotel name from database
-        with get_db_context() as db:
-            # Get the digital key
-            key = db.query(DigitalKey).filter(DigitalKey.id == key_id).first()
-            if not key:
-                logger.error(f"Key not found: {key_id}")
-                return False
-                
-            # Get the reservation
-            reservation = db.query(Reservation).filter(Reservation.id == key.reservation_id).first()
-            if not reservation:
-                logger.error(f"Reservation not found for key: {key_id}")
-                return False
-                
-            # Get the room
-            room = db.query(Room).filter(Room.id == reservation.room_id).first()
-            if not room:
-                logger.error(f"Room not found for reservation: {reservation.id}")
-                return False
-                
-            # Now that we have the hotel_id, use your existing function
-            hotel_id = room.hotel_id
-            hotel_name = get_hotel_name(db, hotel_id)
-            
-            # Fallback if no hotel name is found
-            if not hotel_name:
-                hotel_name = settings.HOTEL_NAME
+        # Resolve the hotel, preferring the id already carried in the pass data
+        hotel_id = pass_data.get("hotel_id") or get_hotel_id_for_key(key_id)
+        if not hotel_id:
+            logger.error(f"Hotel not found for key: {key_id}")
+            return False
+        hotel_context = template_registry.hotel_context(hotel_id)
+        hotel_name = hotel_context["hotel_name"]
+        # Guests read check-in/check-out in the hotel's local time
+        check_in = format_datetime(pass_data["check_in"], hotel_context["hotel_timezone"])
+        check_out = format_datetime(pass_data["check_out"], hotel_context["hotel_timezone"])
         
         # Create message
         msg = MIMEMultipart('related')
@@ -115,20 +84,15 @@ def send_key_email(recipient_email, guest_name, pass_url, key_id, pass_data, max
         # Generate QR code for pass URL
         qr_code_bytes = generate_qr_code(pass_url)
         
-        # Load email template
-        template = env.get_template('email_key.html')
-        
-        # Render HTML content with template
-        html_content = template.render(
-            hotel_name=hotel_name,
-            hotel_logo_url=settings.HOTEL_LOGO_URL,
-            hotel_website=settings.FRONTEND_URL,
+        # Render HTML content with the precompiled template and hotel branding
+        html_content = template_registry.render_for_hotel(
+            'email_key.html',
+            hotel_id,
             guest_name=guest_name,
             room_number=pass_data["room_number"],
-            check_in=format_datetime(pass_data["check_in"]),
-            check_out=format_datetime(pass_data["check_out"]),
-            pass_url=pass_url,
-            current_year=datetime.now().year
+            check_in=check_in,
+            check_out=check_out,
+            pass_url=pass_url
         )
         
         # Create alternative part for email (plain text and HTML)
@@ -144,8 +108,8 @@ def send_key_email(recipient_email, guest_name, pass_url, key_id, pass_data, max
             Your digital room key is ready. Here are your reservation details:
 
             Room: {pass_data["room_number"]}
-            Check-in: {format_datetime(pass_data["check_in"])}
-            Check-out: {format_datetime(pass_data["check_out"])}
+            Check-in: {check_in}
+            Check-out: {check_out}
 
             To add your key to your wallet, visit: {pass_url}
 
@@ -198,33 +162,11 @@ def send_key_email(recipient_email, guest_name, pass_url, key_id, pass_data, max
 def send_key_download_link(recipient_email, guest_name, key_id):
     """Send email with a download link for the digital key"""
     try:
-        # Get hotel name from database using key_id
-        with get_db_context() as db:
-            # Get the digital key
-            key = db.query(DigitalKey).filter(DigitalKey.id == key_id).first()
-            if not key:
-                logger.error(f"Key not found: {key_id}")
-                return False
-                
-            # Get the reservation
-            reservation = db.query(Reservation).filter(Reservation.id == key.reservation_id).first()
-            if not reservation:
-                logger.error(f"Reservation not found for key: {key_id}")
-                return False
-                
-            # Get the room
-            room = db.query(Room).filter(Room.id == reservation.room_id).first()
-            if not room:
-                logger.error(f"Room not found for reservation: {reservation.id}")
-                return False
-                
-            # Now that we have the hotel_id, use your existing function
-            hotel_id = room.hotel_id
-            hotel_name = get_hotel_name(db, hotel_id)
-            
-            # Fallback if no hotel name is found
-            if not hotel_name:
-                hotel_name = settings.HOTEL_NAME
+        hotel_id = get_hotel_id_for_key(key_id)
+        if not hotel_id:
+            logger.error(f"Hotel not found for key: {key_id}")
+            return False
+        hotel_name = template_registry.hotel_context(hotel_id)["hotel_name"]
         # Create message
         msg = MIMEMultipart()
         msg['Subject'] = f"Your Digital Room Key Download Link - {hotel_name}"
@@ -234,17 +176,12 @@ def send_key_download_link(recipient_email, guest_name, key_id):
         # Generate download link
         download_url = f"{settings.FRONTEND_URL}/download-key/{key_id}"
         
-        # Load email template
-        template = env.get_template('email_download.html')
-        
-        # Render HTML content with template
-        html_content = template.render(
-            hotel_name=hotel_name,
-            hotel_logo_url=settings.HOTEL_LOGO_URL,
-            hotel_website=settings.FRONTEND_URL,
+        # Render HTML content with the precompiled template and hotel branding
+        html_content = template_registry.render_for_hotel(
+            'email_download.html',
+            hotel_id,
             guest_name=guest_name,
-            download_url=download_url,
-            current_year=datetime.now().year
+            download_url=download_url
         )
         
         # Create plain text version
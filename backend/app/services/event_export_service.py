@@ -0,0 +1,176 @@
+# backend/app/services/event_export_service.py
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.digital_key import DigitalKey
+from app.models.key_event import KeyEvent
+from app.models.reservation import Reservation
+from app.models.room import Room
+
+logger = logging.getLogger(__name__)
+
+# Columns written to every export, in order
+EXPORT_FIELDS = [
+    "id",
+    "timestamp",
+    "event_type",
+    "status",
+    "hotel_id",
+    "room_id",
+    "room_number",
+    "key_id",
+    "key_uuid",
+    "lock_id",
+    "device_info",
+    "location",
+    "details",
+]
+
+# Rows fetched from the database cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+# Approximate size of each chunk handed to the response
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def build_export_query(
+    hotel_id: Optional[str] = None,
+    room_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_types: Optional[List[str]] = None,
+):
+    """
+    Build the projected key event export query
+
+    Only the exported columns are selected, so no ORM objects are built and
+    the session identity map stays empty however many rows are streamed.
+    """
+    query = select(
+        KeyEvent.id,
+        KeyEvent.timestamp,
+        KeyEvent.event_type,
+        KeyEvent.status,
+        Room.hotel_id,
+        Room.id.label("room_id"),
+        Room.room_number,
+        KeyEvent.key_id,
+        DigitalKey.key_uuid,
+        KeyEvent.lock_id,
+        KeyEvent.device_info,
+        KeyEvent.location,
+        KeyEvent.details,
+    ).select_from(KeyEvent).outerjoin(
+        DigitalKey, DigitalKey.id == KeyEvent.key_id
+    ).outerjoin(
+        Reservation, Reservation.id == DigitalKey.reservation_id
+    ).outerjoin(
+        Room, Room.id == Reservation.room_id
+    )
+
+    if hotel_id:
+        query = query.where(Room.hotel_id == hotel_id)
+    if room_id:
+        query = query.where(Room.id == room_id)
+    if start:
+        query = query.where(KeyEvent.timestamp >= start)
+    if end:
+        query = query.where(KeyEvent.timestamp < end)
+    if event_types:
+        query = query.where(KeyEvent.event_type.in_(event_types))
+
+    return query.order_by(KeyEvent.timestamp, KeyEvent.id)
+
+
+def iter_export_rows(db: Session, query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows of an export query as dicts
+
+    yield_per makes the driver use a server-side cursor where supported, so
+    memory use does not grow with the number of rows.
+    """
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for row in result:
+        yield dict(row._mapping)
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        # Enum members
+        return value.value
+    return value
+
+
+def _chunked(lines: Iterator[str]) -> Iterator[bytes]:
+    """Group small lines into larger chunks to cut per-write overhead"""
+    buffer: List[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_BYTES:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def stream_ndjson(rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """Encode rows as newline-delimited JSON"""
+    return _chunked(
+        json.dumps({field: _serialize(row.get(field)) for field in EXPORT_FIELDS}) + "\n"
+        for row in rows
+    )
+
+
+def _serialize_cell(value: Any) -> Any:
+    # Structured details are written as a JSON string in their cell
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return _serialize(value)
+
+
+def stream_csv(rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """Encode rows as CSV with a header line"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def lines():
+        writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            writer.writerow([_serialize_cell(row.get(field)) for field in EXPORT_FIELDS])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        # Header only, when there are no rows
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    return _chunked(lines())
+
+
+def export_key_events(db: Session, export_format: str = "ndjson", **filters) -> Iterator[bytes]:
+    """
+    Stream key events matching the filters as NDJSON or CSV bytes
+
+    Args:
+        db: Database session used only for the duration of the stream
+        export_format: "ndjson" or "csv"
+        **filters: hotel_id, room_id, start, end, event_types
+
+    Returns:
+        Iterator of encoded chunks
+    """
+    rows = iter_export_rows(db, build_export_query(**filters))
+    if export_format == "csv":
+        return stream_csv(rows)
+    return stream_ndjson(rows)
@@ -0,0 +1,171 @@
+# backend/app/services/event_retention_service.py
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import get_db_context
+from app.models.key_event import KeyEvent
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "keyevent"
+PARTITION_NAME_RE = re.compile(r"^keyevent_y(\d{4})m(\d{2})$")
+
+# Rows deleted per statement when the table is not partitioned
+DELETE_BATCH_SIZE = 5000
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of the month containing value (naive, like KeyEvent.timestamp)"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months"""
+    index = value.year * 12 + (value.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(start: datetime) -> str:
+    return f"{PARENT_TABLE}_y{start.year}m{start.month:02d}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether keyevent is a partitioned PostgreSQL table"""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return db.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name"
+    ), {"name": PARENT_TABLE}).first() is not None
+
+
+def list_partitions(db: Session) -> List[Tuple[str, datetime]]:
+    """Monthly partitions of keyevent as (name, month start), oldest first"""
+    rows = db.execute(text(
+        "SELECT child.relname FROM pg_inherits i "
+        "JOIN pg_class parent ON parent.oid = i.inhparent "
+        "JOIN pg_class child ON child.oid = i.inhrelid "
+        "WHERE parent.relname = :name"
+    ), {"name": PARENT_TABLE}).scalars()
+
+    partitions = []
+    for name in rows:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions.append((name, datetime(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def ensure_future_partitions(db: Session, months_ahead: int, now: Optional[datetime] = None) -> List[str]:
+    """
+    Create monthly partitions from the current month up to months_ahead months ahead
+
+    Partitions must exist before rows for their month arrive, otherwise those
+    rows land in the default partition.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    if not is_partitioned(db):
+        return []
+
+    existing = {name for name, _ in list_partitions(db)}
+    start = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for offset in range(months_ahead + 1):
+        lower = add_months(start, offset)
+        name = partition_name(lower)
+        if name in existing:
+            continue
+        db.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+            f"FOR VALUES FROM ('{lower:%Y-%m-%d}') TO ('{add_months(lower, 1):%Y-%m-%d}')"
+        ))
+        created.append(name)
+    db.commit()
+
+    if created:
+        logger.info(f"Created key event partitions: {', '.join(created)}")
+    return created
+
+
+def apply_retention(
+    db: Session,
+    retention_months: int,
+    mode: str = "archive",
+    archive_schema: str = "archive",
+    now: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Remove key events older than retention_months whole months
+
+    On a partitioned table whole partitions are dropped ("drop") or detached
+    and moved to archive_schema ("archive"), which is instantaneous and leaves
+    no dead tuples behind. Otherwise old rows are deleted in batches; archiving
+    is only supported on partitioned tables.
+
+    Returns:
+        Counts of dropped/archived partitions and deleted rows
+    """
+    result = {"dropped": 0, "archived": 0, "deleted_rows": 0}
+    if retention_months <= 0:
+        return result
+
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+
+    if is_partitioned(db):
+        if mode == "archive":
+            db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+        for name, lower in list_partitions(db):
+            # Only partitions entirely before the cutoff
+            if add_months(lower, 1) > cutoff:
+                break
+            if mode == "archive":
+                db.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+                db.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+                result["archived"] += 1
+            else:
+                db.execute(text(f'DROP TABLE "{name}"'))
+                result["dropped"] += 1
+            logger.info(f"Key event retention: {mode} partition {name}")
+        db.commit()
+        return result
+
+    if mode == "archive":
+        logger.warning("Key event archiving requires a partitioned PostgreSQL table; skipping retention")
+        return result
+
+    while True:
+        ids = [row[0] for row in db.query(KeyEvent.id).filter(
+            KeyEvent.timestamp < cutoff
+        ).limit(DELETE_BATCH_SIZE).all()]
+        if not ids:
+            break
+        db.query(KeyEvent).filter(KeyEvent.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        result["deleted_rows"] += len(ids)
+
+    if result["deleted_rows"]:
+        logger.info(f"Key event retention: deleted {result['deleted_rows']} events before {cutoff:%Y-%m-%d}")
+    return result
+
+
+def run_key_event_maintenance() -> Dict[str, int]:
+    """Create upcoming partitions and apply the configured retention policy"""
+    with get_db_context() as db:
+        created = ensure_future_partitions(db, settings.KEY_EVENT_PARTITION_MONTHS_AHEAD)
+        result = apply_retention(
+            db,
+            settings.KEY_EVENT_RETENTION_MONTHS,
+            mode=settings.KEY_EVENT_RETENTION_MODE,
+            archive_schema=settings.KEY_EVENT_ARCHIVE_SCHEMA,
+        )
+        result["created"] = len(created)
+        return result
@@ -0,0 +1,133 @@
+# backend/app/services/health_service.py
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.db.session import engine
+from app.security import password_pool
+from app.utils.invalidation import invalidation_bus
+from app.utils.metrics import gauge
+from app.utils.worker_pool import BoundedWorkerPool
+
+logger = logging.getLogger(__name__)
+
+readiness_status = gauge(
+    "readiness_status",
+    "Result of the last readiness check, by check (1 passing, 0 failing)",
+    ("check",),
+)
+
+# A check returns whether it passes and details to show in /readyz
+Check = Callable[[], Tuple[bool, Dict[str, Any]]]
+
+
+class Readiness:
+    """
+    Whether this worker should receive traffic
+
+    Runs the registered checks at most once per cache_seconds and serves the
+    cached result in between, so load balancer probes cost next to nothing.
+    Warm-up jobs registered with warm_up() keep the worker unready until they
+    finish; a failed warm-up is reported but doesn't block readiness, since
+    everything it warms is also loaded on first use.
+    """
+
+    def __init__(self, cache_seconds: float):
+        self.cache_seconds = cache_seconds
+        self._checks: Dict[str, Check] = {}
+        self._pending: set = set()
+        self._failed: set = set()
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def add_check(self, name: str, check: Check) -> None:
+        self._checks[name] = check
+
+    def warm_up(self, name: str, job: Callable[[], Any]) -> Callable[[], Any]:
+        """Register a warm-up job as pending and return it wrapped to mark it done when it ends"""
+        with self._lock:
+            self._pending.add(name)
+            self._failed.discard(name)
+            self._result = None
+
+        def run() -> Any:
+            try:
+                return job()
+            except Exception:
+                with self._lock:
+                    self._failed.add(name)
+                raise
+            finally:
+                with self._lock:
+                    self._pending.discard(name)
+                    self._result = None
+
+        return run
+
+    def check_warm_up(self) -> Tuple[bool, Dict[str, Any]]:
+        with self._lock:
+            pending, failed = sorted(self._pending), sorted(self._failed)
+        return not pending, {"pending": pending, "failed": failed}
+
+    def status(self) -> Dict[str, Any]:
+        """Cached readiness report: {"ready": bool, "checks": {name: {"ok": bool, ...}}}"""
+        # One probe runs the checks while concurrent ones wait for its result
+        with self._refresh_lock:
+            with self._lock:
+                if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+                    return self._result
+
+            checks = {}
+            for name, check in self._checks.items():
+                try:
+                    ok, details = check()
+                except Exception as e:
+                    logger.error(f"Readiness check {name} failed: {str(e)}")
+                    ok, details = False, {"error": str(e)}
+                checks[name] = {"ok": ok, **details}
+                readiness_status.set(1 if ok else 0, check=name)
+            result = {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+
+            with self._lock:
+                self._result = result
+                self._checked_at = time.monotonic()
+            return result
+
+
+def check_database() -> Tuple[bool, Dict[str, Any]]:
+    """Free pooled connections, then a round trip; the ping is skipped when it would wait for the pool"""
+    pool = engine.pool
+    details: Dict[str, Any] = {}
+    max_overflow = getattr(pool, "_max_overflow", None)
+    if hasattr(pool, "checkedout") and max_overflow is not None and max_overflow >= 0:
+        free = pool.size() + max_overflow - pool.checkedout()
+        details.update({"checked_out": pool.checkedout(), "free": free})
+        if free < settings.READINESS_MIN_FREE_DB_CONNECTIONS:
+            return False, details
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return True, details
+
+
+def check_worker_pools(pools: List[BoundedWorkerPool]) -> Tuple[bool, Dict[str, Any]]:
+    ok = True
+    details = {}
+    for pool in pools:
+        busy = pool.queue_depth > 0 and pool.queue_depth >= pool.max_queue * settings.READINESS_MAX_QUEUE_FRACTION
+        details[pool.name] = {"queue_depth": pool.queue_depth, "max_queue": pool.max_queue}
+        ok = ok and not busy
+    return ok, details
+
+
+readiness = Readiness(settings.READINESS_CACHE_SECONDS)
+readiness.add_check("warm_up", readiness.check_warm_up)
+readiness.add_check("database", check_database)
+readiness.add_check("worker_pools", lambda: check_worker_pools([password_pool]))
+readiness.add_check("invalidation_bus", invalidation_bus.check)
@@ -1,37 +1,163 @@
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, List, Optional
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.db.session import get_db_context
 from app.models.hotel import Hotel  # Adjust import based on your actual model structure
+from app.models.digital_key import DigitalKey
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.utils.cache import LRUCache
+from app.utils.invalidation import invalidation_bus
 import logging
 
-# Cache the hotel name to avoid frequent DB queries
-_hotel_name_cache = {}
-
 logger = logging.getLogger(__name__)
 
+# Defaults used when a hotel has no branding or location configured
+DEFAULT_TIMEZONE = "Europe/Paris"
+DEFAULT_LATITUDE = 7.1216
+DEFAULT_LONGITUDE = 43.5483
+DEFAULT_BACKGROUND_COLOR = "rgb(44, 62, 80)"
+DEFAULT_FOREGROUND_COLOR = "rgb(255, 255, 255)"
+DEFAULT_LABEL_COLOR = "rgb(255, 255, 255)"
+
+
+@dataclass(frozen=True)
+class HotelMetadata:
+    """Read-only snapshot of the hotel fields used by wallet, email and SMS code paths"""
+    id: str
+    name: str
+    logo_url: Optional[str]
+    website: Optional[str]
+    timezone: str
+    latitude: float
+    longitude: float
+    background_color: str
+    foreground_color: str
+    label_color: str
+    is_active: bool
+
+    @classmethod
+    def from_hotel(cls, hotel: Hotel) -> "HotelMetadata":
+        return cls(
+            id=hotel.id,
+            name=hotel.name,
+            logo_url=hotel.logo_url,
+            website=hotel.website,
+            timezone=hotel.timezone or DEFAULT_TIMEZONE,
+            latitude=hotel.latitude if hotel.latitude is not None else DEFAULT_LATITUDE,
+            longitude=hotel.longitude if hotel.longitude is not None else DEFAULT_LONGITUDE,
+            background_color=hotel.background_color or DEFAULT_BACKGROUND_COLOR,
+            foreground_color=hotel.foreground_color or DEFAULT_FOREGROUND_COLOR,
+            label_color=hotel.label_color or DEFAULT_LABEL_COLOR,
+            is_active=bool(hotel.is_active),
+        )
+
+
+# Shared hotel metadata cache, bounded and expiring so renames are picked up
+_hotel_cache = LRUCache(
+    max_entries=settings.HOTEL_CACHE_MAX_ENTRIES,
+    ttl=settings.HOTEL_CACHE_TTL_SECONDS,
+)
+
+# Callbacks run whenever a hotel entry is invalidated (e.g. bound template contexts)
+_invalidation_listeners: List[Callable[[Optional[str]], None]] = []
+
+
+def get_hotel_metadata(db: Optional[Session], hotel_id: Optional[str]) -> Optional[HotelMetadata]:
+    """
+    Get cached metadata for a hotel, loading it from the database on a miss.
+    If no session is given, a short-lived one is opened only when needed.
+    Returns None if the hotel does not exist.
+    """
+    if not hotel_id:
+        return None
+
+    metadata = _hotel_cache.get(hotel_id)
+    if metadata is not None:
+        return metadata
+
+    if db is None:
+        with get_db_context() as session:
+            hotel = session.query(Hotel).filter(Hotel.id == hotel_id).first()
+            metadata = HotelMetadata.from_hotel(hotel) if hotel else None
+    else:
+        hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
+        metadata = HotelMetadata.from_hotel(hotel) if hotel else None
+
+    if metadata is None:
+        logger.warning(f"Hotel with ID {hotel_id} not found in database")
+        return None
+
+    _hotel_cache.set(hotel_id, metadata)
+    return metadata
+
+
 def get_hotel_name(db: Session, hotel_id: Optional[str] = None) -> str:
     """
     Get the hotel name from the database.
     If hotel_id is None, returns the default hotel name.
-    Uses caching to improve performance.
+    Uses the shared hotel metadata cache.
     """
     # If no hotel_id is provided, return error message instead of default
     if not hotel_id:
         return "Hotel"
-    
-    # Check cache first
-    if hotel_id in _hotel_name_cache:
-        return _hotel_name_cache[hotel_id]
-    
-    # Query the database for the specific hotel
-    hotel = db.query(Hotel).filter(Hotel.id == hotel_id).first()
-    
-    if not hotel:
-        # Log warning if hotel not found with specific ID
-        logger.warning(f"Hotel with ID {hotel_id} not found in database")
-        result = "Unknown Hotel"
+
+    metadata = get_hotel_metadata(db, hotel_id)
+    return metadata.name if metadata else "Unknown Hotel"
+
+
+def get_hotel_timezone(db: Optional[Session], hotel_id: Optional[str]) -> str:
+    """
+    Get the timezone guest-facing times of a hotel are shown in.
+    Uses the shared hotel metadata cache.
+    """
+    metadata = get_hotel_metadata(db, hotel_id)
+    return metadata.timezone if metadata else DEFAULT_TIMEZONE
+
+
+def get_hotel_id_for_key(db: Session, key_id: Optional[str] = None, key_uuid: Optional[str] = None) -> Optional[str]:
+    """Resolve the hotel of a digital key (by id or key_uuid) with a single query"""
+    query = db.query(Room.hotel_id).join(
+        Reservation, Reservation.room_id == Room.id
+    ).join(
+        DigitalKey, DigitalKey.reservation_id == Reservation.id
+    )
+    if key_id:
+        query = query.filter(DigitalKey.id == key_id)
+    elif key_uuid:
+        query = query.filter(DigitalKey.key_uuid == key_uuid)
+    else:
+        return None
+
+    row = query.first()
+    return row[0] if row else None
+
+
+def invalidate_hotel(hotel_id: Optional[str] = None) -> None:
+    """
+    Drop a hotel from the metadata cache (or every hotel if hotel_id is None)
+    and notify listeners holding data derived from it, in every worker
+    """
+    invalidation_bus.publish("hotel", hotel_id)
+
+
+def _drop_hotel(hotel_id: Optional[str]) -> None:
+    if hotel_id is None:
+        _hotel_cache.clear()
     else:
-        result = hotel.name
-    
-    # Cache the result
-    _hotel_name_cache[hotel_id] = result
-    return result
+        _hotel_cache.invalidate(hotel_id)
+
+    for listener in _invalidation_listeners:
+        try:
+            listener(hotel_id)
+        except Exception as e:
+            logger.error(f"Error in hotel invalidation listener: {str(e)}")
+
+
+def add_invalidation_listener(listener: Callable[[Optional[str]], None]) -> None:
+    """Register a callback run whenever a hotel is invalidated"""
+    _invalidation_listeners.append(listener)
+
+
+invalidation_bus.subscribe("hotel", _drop_hotel)
@@ -2,7 +2,7 @@
 import logging
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 from sqlalchemy.orm import Session
 
@@ -14,6 +14,7 @@ from app.models.user import User
 from app.services.wallet_service import create_wallet_pass
 from app.services.email_service import send_key_email
 from app.services.pass_update_service import update_wallet_pass_status
+from app.services.revocation_service import sync_key_revocation
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,7 @@ def activate_key(db: Session, key_id: str) -> DigitalKey:
         
         db.add(key)
         db.add(event)
+        sync_key_revocation(db, key)
         db.commit()
         db.refresh(key)
         
@@ -99,6 +101,7 @@ def deactivate_key(db: Session, key_id: str) -> DigitalKey:
         
         db.add(key)
         db.add(event)
+        sync_key_revocation(db, key)
         db.commit()
         db.refresh(key)
         
@@ -154,6 +157,7 @@ def update_checkout_date(serial_number, new_checkout_date, db):
         db.add(digital_key)
         if reservation:
             db.add(reservation)
+        sync_key_revocation(db, digital_key)
         db.commit()
         
         # Refresh the key to get updated data
@@ -174,6 +178,8 @@ def update_checkout_date(serial_number, new_checkout_date, db):
             "guest_name": f"{user.first_name} {user.last_name}" if user else "Guest",
             "check_in": reservation.check_in.isoformat() if reservation else digital_key.valid_from.isoformat(),
             "check_out": reservation.check_out.isoformat() if reservation else digital_key.valid_until.isoformat(),
+            "valid_from": digital_key.valid_from.isoformat(),
+            "valid_until": digital_key.valid_until.isoformat(),
             "nfc_lock_id": room.nfc_lock_id if room else None,
             "is_active": digital_key.is_active
         }
@@ -273,6 +279,7 @@ def regenerate_key(db: Session, key_id: str) -> Tuple[DigitalKey, str]:
         old_key.is_active = False
         old_key.status = KeyStatus.REVOKED
         db.add(old_key)
+        sync_key_revocation(db, old_key)
         
         # Log deactivation
         event = KeyEvent(
@@ -348,11 +355,12 @@ def expire_outdated_keys(db: Session) -> int:
                 event_type="key_expired",
                 timestamp=datetime.now(timezone.utc),
                 status="success",
-                details="Key automatically expired by system"
+                details={"reason": "expired"}
             )
             
             db.add(key)
             db.add(event)
+            sync_key_revocation(db, key)
             
             # Update the key in the database first
             db.commit()
@@ -368,7 +376,7 @@ def expire_outdated_keys(db: Session) -> int:
                     key_id=key.id,
                     event_type="wallet_update_failed",
                     status="error",
-                    details=f"Failed to update wallet after expiration: {str(wallet_error)}",
+                    details={"reason": "expired", "error": str(wallet_error)},
                     timestamp=datetime.now(timezone.utc)
                 )
                 db.add(error_event)
@@ -387,6 +395,28 @@ def expire_outdated_keys(db: Session) -> int:
         return 0
 
 
+def iter_key_usage_history(db: Session, key_id: str, batch_size: int = 500) -> Iterator[KeyEvent]:
+    """
+    Stream usage history for a specific key, newest first
+    
+    Events are fetched in batches from a server-side cursor instead of
+    being loaded into one list
+    
+    Args:
+        db: Database session
+        key_id: Key ID
+        batch_size: Number of events fetched per round trip
+    
+    Returns:
+        Iterator of KeyEvent objects
+    """
+    return db.query(KeyEvent).filter(
+        KeyEvent.key_id == key_id
+    ).order_by(
+        KeyEvent.timestamp.desc()
+    ).yield_per(batch_size)
+
+
 def get_key_usage_history(db: Session, key_id: str) -> List[KeyEvent]:
     """
     Get usage history for a specific key
@@ -399,13 +429,7 @@ def get_key_usage_history(db: Session, key_id: str) -> List[KeyEvent]:
         List of KeyEvent objects
     """
     try:
-        events = db.query(KeyEvent).filter(
-            KeyEvent.key_id == key_id
-        ).order_by(
-            KeyEvent.timestamp.desc()
-        ).all()
-        
-        return events
+        return list(iter_key_usage_history(db, key_id))
     
     except Exception as e:
         logger.error(f"Error getting key usage history: {str(e)}")
@@ -0,0 +1,22 @@
+# backend/app/services/listing_service.py
+from app.models.digital_key import DigitalKey
+from app.models.hotel import Hotel
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.models.user import User
+from app.schemas.digital_key import DigitalKey as DigitalKeySchema
+from app.schemas.hotel import Hotel as HotelSchema
+from app.schemas.reservation import Reservation as ReservationSchema
+from app.schemas.room import Room as RoomSchema
+from app.schemas.user import User as UserSchema
+from app.utils.serialization import Projection
+
+# Column projections behind the key and reservation lists. They produce the
+# same JSON as validating the ORM objects through the response schemas,
+# room and hotel included, in a single query.
+reservation_projection = Projection(ReservationSchema, Reservation, {
+    "room": Projection(RoomSchema, Room, {"hotel": Projection(HotelSchema, Hotel)}),
+    "user": Projection(UserSchema, User),
+})
+
+key_projection = Projection(DigitalKeySchema, DigitalKey, {"reservation": reservation_projection})
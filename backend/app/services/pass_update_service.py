@@ -11,6 +11,7 @@ from app.models.room import Room
 from app.models.user import User
 from app.services.wallet_service import create_apple_wallet_pass, create_google_wallet_pass
 from app.models.key_event import KeyEvent
+from app.services.revocation_service import sync_key_revocation
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
@@ -48,6 +49,8 @@ def update_wallet_pass_status(db: Session, key_id: str, is_active: bool = True):
             "guest_name": f"{user.first_name} {user.last_name}",
             "check_in": reservation.check_in.isoformat(),
             "check_out": reservation.check_out.isoformat(),
+            "valid_from": key.valid_from.isoformat(),
+            "valid_until": key.valid_until.isoformat(),
             "nfc_lock_id": room.nfc_lock_id,
             "is_active": is_active,
             "voided": not is_active  # Make the pass appear voided if not active
@@ -59,10 +62,11 @@ def update_wallet_pass_status(db: Session, key_id: str, is_active: bool = True):
             event_type="wallet_pass_updated",
             device_info="System",
             status="pending",
-            details=f"Updating wallet pass status to {'active' if is_active else 'inactive'}",
+            details={"is_active": is_active},
             timestamp=datetime.now(timezone.utc)
         )
         db.add(event)
+        sync_key_revocation(db, key)
         db.commit()
         
         try:
@@ -77,7 +81,8 @@ def update_wallet_pass_status(db: Session, key_id: str, is_active: bool = True):
                 
                 # Update the event status
                 event.status = "success"
-                event.details += f" | Push notification sent to {push_result} devices"
+                # JSON columns do not track in-place changes, so assign a new dict
+                event.details = {**event.details, "push_devices": push_result}
                 db.commit()
                 
             elif key.pass_type == KeyType.GOOGLE:
@@ -86,14 +91,14 @@ def update_wallet_pass_status(db: Session, key_id: str, is_active: bool = True):
                 
                 # Update the event status
                 event.status = "success"
-                event.details += " | Google Wallet pass updated"
+                event.details = {**event.details, "google_pass_updated": True}
                 db.commit()
         
         except Exception as update_error:
             logger.error(f"Error during pass update: {str(update_error)}")
             # Mark the event as failed
             event.status = "error"
-            event.details += f" | Error: {str(update_error)}"
+            event.details = {**event.details, "error": str(update_error)}
             db.commit()
             # Re-raise to be caught by outer try/except
             raise
@@ -107,7 +112,7 @@ def update_wallet_pass_status(db: Session, key_id: str, is_active: bool = True):
                 event_type="wallet_pass_update_failed",
                 device_info="System",
                 status="error",
-                details=f"Failed to update wallet pass: {str(e)}",
+                details={"error": str(e)},
                 timestamp=datetime.now(timezone.utc)
             )
             db.add(event)
@@ -0,0 +1,252 @@
+# backend/app/services/revocation_service.py
+import logging
+import struct
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.session import get_db_context
+from app.models.digital_key import DigitalKey
+from app.models.key_revocation import KeyRevocation, RevocationFeed
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.utils.date_formatting import to_naive_utc
+from app.utils.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+# Binary feed layout (big-endian):
+#   format 1 byte | kind 1 byte (0 snapshot, 1 delta) | version uint64 |
+#   added count uint32 | removed count uint32 |
+#   added key UUIDs, 16 bytes each, sorted | removed key UUIDs, sorted
+FEED_FORMAT = 1
+KIND_SNAPSHOT = 0
+KIND_DELTA = 1
+_HEADER = struct.Struct(">BBQII")
+
+# Key statuses that revoke a key regardless of is_active
+REVOKED_STATUSES = {"revoked", "expired"}
+
+
+@dataclass
+class RevocationFeedState:
+    """Snapshot or delta of a hotel's revocation feed"""
+    hotel_id: str
+    version: int
+    full: bool
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def is_revoked(key: DigitalKey, now: Optional[datetime] = None) -> bool:
+    """
+    Whether a key must be on its hotel's deny list
+
+    Only keys whose credential is still inside its validity window need
+    listing; expired credentials are rejected by locks on their own.
+    """
+    status = str(getattr(key.status, "value", key.status) or "").lower()
+    inactive = not key.is_active or status in REVOKED_STATUSES
+    return inactive and to_naive_utc(key.valid_until) > (now or _now())
+
+
+def _create_feed(db: Session, hotel_id: str) -> None:
+    """Create a hotel's feed row unless it exists, also when another transaction creates it concurrently"""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        now = datetime.now(timezone.utc)
+        # Waits for a concurrent insert of the same hotel to commit, then does nothing
+        db.execute(insert(RevocationFeed).values(
+            id=str(uuid.uuid4()),
+            hotel_id=hotel_id,
+            version=0,
+            compacted_version=0,
+            created_at=now,
+            updated_at=now,
+        ).on_conflict_do_nothing(index_elements=["hotel_id"]))
+        return
+
+    if db.query(RevocationFeed.id).filter(RevocationFeed.hotel_id == hotel_id).first() is None:
+        db.add(RevocationFeed(hotel_id=hotel_id, version=0, compacted_version=0))
+        db.flush()
+
+
+def _get_feed(db: Session, hotel_id: str) -> RevocationFeed:
+    # Row lock so concurrent revokes get distinct versions
+    query = db.query(RevocationFeed).filter(RevocationFeed.hotel_id == hotel_id).with_for_update()
+    feed = query.first()
+    if feed is None:
+        # A hotel's first revoke; FOR UPDATE had no row to lock
+        _create_feed(db, hotel_id)
+        feed = query.one()
+    return feed
+
+
+def _next_version(db: Session, hotel_id: str) -> int:
+    feed = _get_feed(db, hotel_id)
+    feed.version += 1
+    db.add(feed)
+    return feed.version
+
+
+def sync_key_revocation(db: Session, key: DigitalKey) -> bool:
+    """
+    Bring a key's entry in the revocation feed in line with the key
+
+    Call after changing is_active, status or valid_until and before the
+    commit, so the feed changes in the same transaction as the key.
+
+    Returns:
+        Whether the feed changed
+    """
+    revoked = is_revoked(key)
+    entry = db.query(KeyRevocation).filter(KeyRevocation.key_uuid == key.key_uuid).first()
+    if entry is None and not revoked:
+        return False
+    valid_until = to_naive_utc(key.valid_until)
+    if entry is not None and entry.revoked == revoked and entry.valid_until == valid_until:
+        return False
+
+    if entry is None:
+        hotel_id = db.query(Room.hotel_id).join(
+            Reservation, Reservation.room_id == Room.id
+        ).filter(Reservation.id == key.reservation_id).scalar()
+        if hotel_id is None:
+            logger.warning(f"No hotel for key {key.key_uuid}, not added to the revocation feed")
+            return False
+        entry = KeyRevocation(hotel_id=hotel_id, key_uuid=key.key_uuid)
+
+    entry.revoked = revoked
+    entry.valid_until = valid_until
+    entry.version = _next_version(db, entry.hotel_id)
+    db.add(entry)
+    db.flush()
+    # Caches of key state in other workers are dropped when this commits
+    invalidation_bus.publish_after_commit(db, "digital_key", key.key_uuid)
+    logger.info(f"Revocation feed {entry.hotel_id} v{entry.version}: {key.key_uuid} revoked={revoked}")
+    return True
+
+
+def get_revocation_feed(db: Session, hotel_id: str, since: Optional[int] = None) -> RevocationFeedState:
+    """
+    Read a hotel's revocation feed
+
+    Args:
+        db: Database session
+        hotel_id: Hotel ID
+        since: Version the client already holds; None for a full snapshot
+
+    Returns:
+        Changes after since, or a full snapshot if since is missing or older
+        than the compacted history
+    """
+    feed = db.query(RevocationFeed).filter(RevocationFeed.hotel_id == hotel_id).first()
+    version = feed.version if feed else 0
+    compacted = feed.compacted_version if feed else 0
+
+    if since is not None and compacted <= since <= version:
+        changes = db.query(KeyRevocation.key_uuid, KeyRevocation.revoked).filter(
+            KeyRevocation.hotel_id == hotel_id,
+            KeyRevocation.version > since,
+        ).order_by(KeyRevocation.key_uuid).all()
+        return RevocationFeedState(
+            hotel_id=hotel_id,
+            version=version,
+            full=False,
+            added=[row.key_uuid for row in changes if row.revoked],
+            removed=[row.key_uuid for row in changes if not row.revoked],
+        )
+
+    revoked = db.query(KeyRevocation.key_uuid).filter(
+        KeyRevocation.hotel_id == hotel_id,
+        KeyRevocation.revoked.is_(True),
+    ).order_by(KeyRevocation.key_uuid).all()
+    return RevocationFeedState(hotel_id=hotel_id, version=version, full=True, added=[row.key_uuid for row in revoked])
+
+
+def _uuid_bytes(key_uuids: List[str]) -> bytes:
+    # Sorted by binary value, so locks can binary-search the array in place
+    return b"".join(sorted(uuid.UUID(key_uuid).bytes for key_uuid in key_uuids))
+
+
+def encode_feed(state: RevocationFeedState) -> bytes:
+    """Encode a feed snapshot or delta in the compact binary layout"""
+    return _HEADER.pack(
+        FEED_FORMAT,
+        KIND_SNAPSHOT if state.full else KIND_DELTA,
+        state.version,
+        len(state.added),
+        len(state.removed),
+    ) + _uuid_bytes(state.added) + _uuid_bytes(state.removed)
+
+
+def prune_revocations(db: Session, now: Optional[datetime] = None, retention_seconds: Optional[int] = None) -> Dict[str, int]:
+    """
+    Drop keys whose validity has ended from the feeds
+
+    Expired entries are first published as removals so delta clients shrink
+    their deny-sets; removals older than the retention are then deleted and
+    clients further behind get a full snapshot.
+
+    Returns:
+        Counts of expired and deleted entries
+    """
+    now = now or _now()
+    retention = settings.REVOCATION_DELTA_RETENTION_SECONDS if retention_seconds is None else retention_seconds
+    result = {"expired": 0, "deleted": 0}
+
+    expired = db.query(KeyRevocation).filter(
+        KeyRevocation.revoked.is_(True),
+        KeyRevocation.valid_until <= now,
+    ).order_by(KeyRevocation.hotel_id).all()
+    versions: Dict[str, int] = {}
+    for entry in expired:
+        # One version per hotel for the whole sweep
+        if entry.hotel_id not in versions:
+            versions[entry.hotel_id] = _next_version(db, entry.hotel_id)
+        entry.revoked = False
+        entry.version = versions[entry.hotel_id]
+        # Retention counts from here
+        entry.updated_at = now
+        db.add(entry)
+    result["expired"] = len(expired)
+    db.commit()
+
+    cutoff = now - timedelta(seconds=retention)
+    stale = db.query(KeyRevocation.hotel_id, func.max(KeyRevocation.version)).filter(
+        KeyRevocation.revoked.is_(False),
+        KeyRevocation.updated_at < cutoff,
+    ).group_by(KeyRevocation.hotel_id).all()
+    for hotel_id, max_version in stale:
+        feed = _get_feed(db, hotel_id)
+        feed.compacted_version = max(feed.compacted_version, max_version)
+        db.add(feed)
+        result["deleted"] += db.query(KeyRevocation).filter(
+            KeyRevocation.hotel_id == hotel_id,
+            KeyRevocation.revoked.is_(False),
+            KeyRevocation.version <= max_version,
+        ).delete(synchronize_session=False)
+    db.commit()
+
+    if result["expired"] or result["deleted"]:
+        logger.info(f"Revocation feeds pruned: {result}")
+    return result
+
+
+def run_revocation_maintenance() -> Dict[str, int]:
+    """Prune revocation feeds using a short-lived session (periodic job entry point)"""
+    with get_db_context() as db:
+        return prune_revocations(db)
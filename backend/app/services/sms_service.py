@@ -1,7 +1,5 @@
 import re
-import requests
 from typing import List, Optional, Dict, Any, Tuple
-from twilio.rest import Client
 import logging
 
 from app.config import settings
@@ -33,10 +31,12 @@ def send_sms(to_number: str, message: str) -> Tuple[bool, str]:
     """
     try:
         if not settings.TWILIO_ACCOUNT_SID or not settings.TWILIO_AUTH_TOKEN:
-            print(f"Missing Twilio credentials: SID={settings.TWILIO_ACCOUNT_SID}, Token={'present' if settings.TWILIO_AUTH_TOKEN else 'missing'}")
+            logger.error(f"Missing Twilio credentials: SID={'present' if settings.TWILIO_ACCOUNT_SID else 'missing'}, Token={'present' if settings.TWILIO_AUTH_TOKEN else 'missing'}")
             return False, "Twilio credentials not configured"
         try:
-            print(f"Attempting to send SMS to {to_number} using Twilio number {settings.TWILIO_PHONE_NUMBER}")            
+            logger.info(f"Attempting to send SMS to {to_number} using Twilio number {settings.TWILIO_PHONE_NUMBER}")
+            # Imported on first send: the Twilio SDK is heavy and only needed here
+            from twilio.rest import Client
             client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
             
             message = client.messages.create(
@@ -51,6 +51,7 @@ def send_sms(to_number: str, message: str) -> Tuple[bool, str]:
             # If Twilio isn't installed, try a generic HTTP API approach
             try:
                 # This is a placeholder - replace with your actual SMS provider's API
+                import requests
                 response = requests.post(
                     settings.SMS_API_URL,
                     json={
@@ -69,7 +70,7 @@ def send_sms(to_number: str, message: str) -> Tuple[bool, str]:
             except Exception as e:
                 return False, f"SMS sending failed: {str(e)}"
     except Exception as e:
-        print(f"SMS sending failed with exception: {str(e)}")
+        logger.error(f"SMS sending failed with exception: {str(e)}")
         return False, f"SMS sending failed: {str(e)}"
 
 
@@ -0,0 +1,131 @@
+# backend/app/services/template_service.py
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from app.config import settings
+from app.services.hotel_service import DEFAULT_TIMEZONE, get_hotel_metadata, add_invalidation_listener
+from app.utils.cache import LRUCache
+
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
+
+logger = logging.getLogger(__name__)
+
+templates_dir = Path(__file__).parent.parent.parent / "templates"
+
+
+class TemplateRegistry:
+    """
+    Registry of precompiled email templates
+
+    All templates are compiled once (optionally through a Jinja bytecode cache)
+    and kept in memory, and the static branding context of each hotel is bound
+    once, so rendering an email is a single render call with no filesystem or
+    database access. Jinja itself is only imported when the first template
+    is needed.
+    """
+
+    def __init__(self, directory: Path, bytecode_cache_dir: Optional[str] = None, auto_reload: bool = False):
+        self.directory = directory
+        self.bytecode_cache_dir = bytecode_cache_dir
+        self.auto_reload = auto_reload
+        self._env: Optional["Environment"] = None
+        self._templates: Dict[str, "Template"] = {}
+        # One entry per hotel, bounded like the hotel metadata cache it is built from
+        self._hotel_contexts = LRUCache(max_entries=settings.HOTEL_CACHE_MAX_ENTRIES)
+        self._lock = threading.Lock()
+        self.warmed = False
+
+    @property
+    def env(self) -> "Environment":
+        if self._env is None:
+            from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+            bytecode_cache = None
+            if self.bytecode_cache_dir:
+                Path(self.bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(self.bytecode_cache_dir)
+            env = Environment(
+                loader=FileSystemLoader(self.directory),
+                auto_reload=self.auto_reload,
+                bytecode_cache=bytecode_cache,
+            )
+            with self._lock:
+                if self._env is None:
+                    self._env = env
+        return self._env
+
+    def warm(self) -> int:
+        """Compile every template in the templates directory"""
+        compiled = {}
+        for name in self.env.list_templates(extensions=["html", "txt"]):
+            compiled[name] = self.env.get_template(name)
+        with self._lock:
+            self._templates.update(compiled)
+            self.warmed = True
+        logger.info(f"Precompiled {len(compiled)} email templates from {self.directory}")
+        return len(compiled)
+
+    def get(self, name: str) -> "Template":
+        """Return a compiled template, compiling it on first use if needed"""
+        template = self._templates.get(name)
+        if template is None:
+            template = self.env.get_template(name)
+            with self._lock:
+                self._templates[name] = template
+        return template
+
+    def render(self, name: str, **context) -> str:
+        """Render a template with the given context"""
+        return self.get(name).render(**context)
+
+    def render_for_hotel(self, name: str, hotel_id: Optional[str] = None, **context) -> str:
+        """Render a template with the hotel's pre-bound branding context"""
+        values = dict(self.hotel_context(hotel_id))
+        values["current_year"] = datetime.now().year
+        values.update(context)
+        return self.get(name).render(values)
+
+    def hotel_context(self, hotel_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return the static branding context for a hotel, loading it once"""
+        context = self._hotel_contexts.get(hotel_id)
+        if context is None:
+            context = self._load_hotel_context(hotel_id)
+            self._hotel_contexts.set(hotel_id, context)
+        return context
+
+    def invalidate_hotel(self, hotel_id: Optional[str] = None) -> None:
+        """Forget the bound context of one hotel, or all hotels if hotel_id is None"""
+        if hotel_id is None:
+            self._hotel_contexts.clear()
+        else:
+            self._hotel_contexts.invalidate(hotel_id)
+
+    def _load_hotel_context(self, hotel_id: Optional[str]) -> Dict[str, Any]:
+        metadata = get_hotel_metadata(None, hotel_id)
+        if metadata is None:
+            return {
+                "hotel_name": settings.HOTEL_NAME,
+                "hotel_logo_url": settings.HOTEL_LOGO_URL or "",
+                "hotel_website": settings.FRONTEND_URL,
+                "hotel_timezone": DEFAULT_TIMEZONE,
+            }
+        return {
+            "hotel_name": metadata.name,
+            "hotel_logo_url": metadata.logo_url or settings.HOTEL_LOGO_URL or "",
+            "hotel_website": metadata.website or settings.FRONTEND_URL,
+            "hotel_timezone": metadata.timezone,
+        }
+
+
+template_registry = TemplateRegistry(
+    templates_dir,
+    bytecode_cache_dir=settings.TEMPLATE_BYTECODE_CACHE_DIR or None,
+    auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+)
+
+# Re-bind a hotel's branding whenever its metadata is invalidated
+add_invalidation_listener(template_registry.invalidate_hotel)
@@ -1,19 +1,30 @@
 # backend/app/services/verification_service.py
 import logging
 from datetime import datetime, timezone
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, Iterable, List, Tuple, Optional
 
 from sqlalchemy.orm import Session
 
 from app.models.digital_key import DigitalKey
-from app.models.key_event import KeyEvent
+from app.models.key_event import KeyEvent, EventType
 from app.models.reservation import Reservation
 from app.models.room import Room
 from app.models.user import User
+from app.utils.date_formatting import to_naive_utc
 
 logger = logging.getLogger(__name__)
 
 
+def is_within_validity(key: DigitalKey, now: datetime) -> bool:
+    """
+    Whether now falls inside the key's validity window, bounds included
+
+    Every verification path uses this. Stored times and now are compared
+    as naive UTC; naive values are taken to be UTC already.
+    """
+    return to_naive_utc(key.valid_from) <= to_naive_utc(now) <= to_naive_utc(key.valid_until)
+
+
 def verify_key_access(
     db: Session,
     key_uuid: str,
@@ -51,8 +62,8 @@ def verify_key_access(
             device_info=device_info,
             timestamp=now,
             location=location,
+            lock_id=lock_id,
             status="pending",
-            details=f"Lock ID: {lock_id}"
         )
         db.add(event)
         db.commit()
@@ -62,7 +73,7 @@ def verify_key_access(
         logger.warning(f"Access attempt with non-existent key UUID: {key_uuid}")
         if event:
             event.status = "failure"
-            event.details = "Key not found"
+            event.details = {"reason": "key_not_found"}
             db.add(event)
             db.commit()
         
@@ -72,17 +83,17 @@ def verify_key_access(
     if not key.is_active:
         logger.warning(f"Access attempt with inactive key: {key_uuid}")
         event.status = "failure"
-        event.details = "Key is inactive"
+        event.details = {"reason": "key_inactive"}
         db.add(event)
         db.commit()
         
         return False, "Key is inactive", {}
     
     # Check key validity period
-    if now < key.valid_from or now > key.valid_until:
+    if not is_within_validity(key, now):
         logger.warning(f"Access attempt with key outside validity period: {key_uuid}")
         event.status = "failure"
-        event.details = "Key outside validity period"
+        event.details = {"reason": "outside_validity_period"}
         db.add(event)
         db.commit()
         
@@ -96,7 +107,10 @@ def verify_key_access(
     if not reservation or reservation.status not in ["confirmed", "checked_in"]:
         logger.warning(f"Access attempt with invalid reservation: {key.reservation_id}")
         event.status = "failure"
-        event.details = f"Invalid reservation status: {reservation.status if reservation else 'None'}"
+        event.details = {
+            "reason": "invalid_reservation",
+            "reservation_status": reservation.status.value if reservation else None,
+        }
         db.add(event)
         db.commit()
         
@@ -109,7 +123,7 @@ def verify_key_access(
     if room.nfc_lock_id != lock_id:
         logger.warning(f"Access attempt with key {key_uuid} on wrong lock {lock_id}, expected {room.nfc_lock_id}")
         event.status = "failure"
-        event.details = f"Lock ID mismatch: Expected {room.nfc_lock_id}, got {lock_id}"
+        event.details = {"reason": "lock_mismatch", "expected_lock_id": room.nfc_lock_id}
         db.add(event)
         db.commit()
         
@@ -125,7 +139,8 @@ def verify_key_access(
     
     # Update event status
     event.status = "success"
-    event.details = f"Access granted to room {room.room_number}"
+    # Key, lock and therefore room and guest are already on the row
+    event.details = None
     db.add(event)
     
     db.commit()
@@ -149,7 +164,7 @@ def log_key_usage(
     device_info: Optional[str] = None,
     location: Optional[str] = None,
     status: str = "success",
-    details: Optional[str] = None
+    details: Optional[Dict[str, Any]] = None
 ) -> Optional[KeyEvent]:
     """
     Log key usage event
@@ -161,7 +176,7 @@ def log_key_usage(
         device_info: Information about the device
         location: Location information
         status: Event status (success, failure)
-        details: Additional details
+        details: Structured event details
     
     Returns:
         Created KeyEvent object or None if error
@@ -193,3 +208,148 @@ def log_key_usage(
     except Exception as e:
         logger.error(f"Error logging key event: {str(e)}")
         return None
+
+
+def record_offline_access_logs(db: Session, entries: Iterable[Any]) -> Dict[str, int]:
+    """
+    Store access decisions that locks made locally from offline credentials
+
+    Locks upload these in batches some time after the taps, so the whole
+    batch is written in one transaction and each key's usage counters are
+    updated once.
+
+    Args:
+        db: Database session
+        entries: Items with key_uuid, lock_id, timestamp, granted, reason,
+            device_info and location attributes
+
+    Returns:
+        Number of entries accepted and how many referenced unknown keys
+    """
+    entries = list(entries)
+    key_uuids = {entry.key_uuid for entry in entries if entry.key_uuid}
+    keys = {
+        key.key_uuid: key
+        for key in db.query(DigitalKey).filter(DigitalKey.key_uuid.in_(key_uuids))
+    } if key_uuids else {}
+
+    unknown = 0
+    usage: Dict[str, List[datetime]] = {}
+    events = []
+    for entry in entries:
+        # Locks report their own clock; store naive UTC like other events
+        timestamp = entry.timestamp
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+        key = keys.get(entry.key_uuid)
+        if key is None:
+            unknown += 1
+        elif entry.granted:
+            usage.setdefault(key.key_uuid, []).append(timestamp)
+
+        details = {"offline": True}
+        if entry.reason:
+            details["reason"] = entry.reason
+        events.append(KeyEvent(
+            key_id=key.id if key else None,
+            event_type=EventType.PHYSICAL_ACCESS_GRANTED if entry.granted else EventType.PHYSICAL_ACCESS_DENIED,
+            device_info=entry.device_info,
+            timestamp=timestamp,
+            location=entry.location,
+            lock_id=entry.lock_id,
+            status="success" if entry.granted else "failure",
+            details=details,
+        ))
+    db.add_all(events)
+
+    for key_uuid, timestamps in usage.items():
+        key = keys[key_uuid]
+        key.access_count = (key.access_count or 0) + len(timestamps)
+        latest = max(timestamps)
+        if key.last_used is None or latest > key.last_used.replace(tzinfo=None):
+            key.last_used = latest
+
+    db.commit()
+    logger.info(f"Recorded {len(events)} offline access events ({unknown} for unknown keys)")
+    return {"accepted": len(events), "unknown_keys": unknown}
+
+
+
+def verify_key_batch(db: Session, taps: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Verify taps collected by a gateway in one round trip
+
+    Applies the same checks as /verify/key, but loads every key with its
+    reservation, room and guest in a single query and writes all access
+    events and usage counters in one transaction.
+
+    Args:
+        db: Database session
+        taps: Items with key_uuid, lock_id, device_info and location attributes
+
+    Returns:
+        One result per tap, in order, with is_valid, message, reason and, when
+        granted, room_number and guest_name
+    """
+    taps = list(taps)
+    key_uuids = {tap.key_uuid for tap in taps}
+    rows = db.query(DigitalKey, Reservation, Room, User).outerjoin(
+        Reservation, Reservation.id == DigitalKey.reservation_id
+    ).outerjoin(
+        Room, Room.id == Reservation.room_id
+    ).outerjoin(
+        User, User.id == Reservation.user_id
+    ).filter(DigitalKey.key_uuid.in_(key_uuids)).all() if key_uuids else []
+    found = {row[0].key_uuid: row for row in rows}
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    results = []
+    events = []
+    for tap in taps:
+        key, reservation, room, user = found.get(tap.key_uuid, (None, None, None, None))
+        details = None
+        if key is None:
+            reason, message = "key_not_found", "Key not found"
+        elif not key.is_active:
+            reason, message = "key_inactive", "Key is inactive"
+        elif not is_within_validity(key, now):
+            reason, message = "outside_validity_period", "Key outside validity period"
+        elif reservation is None or reservation.status not in ["confirmed", "checked_in"]:
+            reason, message = "invalid_reservation", "Reservation not valid"
+            details = {"reservation_status": reservation.status.value if reservation else None}
+        elif room is None or room.nfc_lock_id != tap.lock_id:
+            reason, message = "lock_mismatch", "Invalid lock for this key"
+            details = {"expected_lock_id": room.nfc_lock_id if room else None}
+        else:
+            reason, message = None, "Access granted"
+
+        granted = reason is None
+        if granted:
+            key.last_used = now
+            key.access_count = (key.access_count or 0) + 1
+            results.append({
+                "is_valid": True,
+                "message": message,
+                "reason": None,
+                "room_number": room.room_number,
+                "guest_name": f"{user.first_name} {user.last_name}" if user else None,
+            })
+        else:
+            results.append({"is_valid": False, "message": message, "reason": reason})
+
+        events.append(KeyEvent(
+            key_id=key.id if key else None,
+            event_type=EventType.PHYSICAL_ACCESS_GRANTED if granted else EventType.PHYSICAL_ACCESS_DENIED,
+            device_info=tap.device_info,
+            timestamp=now,
+            location=tap.location,
+            lock_id=tap.lock_id,
+            status="success" if granted else "failure",
+            details=None if granted else {"reason": reason, **(details or {})},
+        ))
+
+    db.add_all(events)
+    db.commit()
+    logger.info(f"Verified {len(taps)} batched taps ({sum(result['is_valid'] for result in results)} granted)")
+    return results
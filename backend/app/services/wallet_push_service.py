@@ -3,13 +3,11 @@ import json
 import logging
 from pathlib import Path
 from sqlalchemy.orm import Session
-import jwt
 from app.db.session import SessionLocal
 import time
 from datetime import datetime, timezone
 import http.client
 import uuid
-import httpx
 import email.utils
 
 from app.config import settings
@@ -17,15 +15,22 @@ from app.db.session import get_db
 from app.models.device import DeviceRegistration
 from app.models.digital_key import DigitalKey
 from app.models.key_event import KeyEvent
+from app.utils.metrics import histogram
 
 logger = logging.getLogger(__name__)
 
+apns_push_duration = histogram(
+    "apns_push_duration_seconds",
+    "Time spent sending one push notification to APNs, by outcome",
+    ("outcome",),
+)
+
 device_registrations = {}
 
-# TODO: try to load env for production=True from .env
-SERVER = "api.push.apple.com" if settings.PRODUCTION else "api.development.push.apple.com"
-logger.info(f"Using APNs server: {SERVER}")
-# CONN = http.client.HTTPSConnection(SERVER)
+
+def apns_server() -> str:
+    """APNs host for the current environment (read when sending, not at import)"""
+    return "api.push.apple.com" if settings.PRODUCTION else "api.development.push.apple.com"
 
 
 def send_push_notifications(pass_type_id, serial_number):
@@ -116,6 +121,7 @@ def create_apns_token(team_id, key_id, private_key_path):
         }
         
         # Sign and encode the JWT
+        import jwt
         token = jwt.encode(
             token_payload,
             private_key,
@@ -165,7 +171,6 @@ def send_push_notifications_production(pass_type_id, serial_number, db=None):
     # Get DB session if not provided
     close_db = False
     if db is None:
-        from app.db.session import SessionLocal
         db = SessionLocal()
         close_db = True
     
@@ -191,14 +196,15 @@ def send_push_notifications_production(pass_type_id, serial_number, db=None):
             
             # Setup APNs connection
             # to try found in official docs: "api.sandbox.push.apple.com" "api.development.push.apple.com"
-            # server = "api.push.apple.com" if settings.PRODUCTION else "api.development.push.apple.com"
-            print("server:", SERVER)
-            base_url = f"https://{SERVER}/3/device/"
+            server = apns_server()
+            logger.info(f"Using APNs server: {server}")
+            base_url = f"https://{server}/3/device/"
             
             # Track successful push notifications
             success_count = 0
             
-            # Use httpx with HTTP/2
+            # Use httpx with HTTP/2 (imported here: only push senders need it)
+            import httpx
             with httpx.Client(http2=True) as client:
                 for registration in registrations:
                     try:
@@ -217,7 +223,16 @@ def send_push_notifications_production(pass_type_id, serial_number, db=None):
                         
                         # Send the request
                         url = base_url + device_token
-                        response = client.post(url, json=payload, headers=headers)
+                        push_start = time.perf_counter()
+                        try:
+                            response = client.post(url, json=payload, headers=headers)
+                        except httpx.HTTPError:
+                            apns_push_duration.observe(time.perf_counter() - push_start, outcome="error")
+                            raise
+                        apns_push_duration.observe(
+                            time.perf_counter() - push_start,
+                            outcome="success" if response.status_code == 200 else "rejected",
+                        )
                         
                         # Log response
                         if response.status_code == 200:
@@ -230,7 +245,6 @@ def send_push_notifications_production(pass_type_id, serial_number, db=None):
                                 event_type="push_notification_sent",
                                 device_info=f"Device: {registration.device_library_id}",
                                 status="success",
-                                details="Push notification sent successfully",
                                 timestamp=datetime.now(timezone.utc)
                             )
                             db.add(key_event)
@@ -244,7 +258,7 @@ def send_push_notifications_production(pass_type_id, serial_number, db=None):
                                 event_type="push_notification_failed",
                                 device_info=f"Device: {registration.device_library_id}",
                                 status="error",
-                                details=f"Status: {response.status_code}, Response: {response.text}"
+                                details={"status_code": response.status_code, "response": response.text}
                             )
                             db.add(key_event)
                             db.commit()
@@ -265,7 +279,7 @@ def send_push_notifications_production(pass_type_id, serial_number, db=None):
                                 event_type="push_notification_error",
                                 device_info=f"Device: {registration.device_library_id}",
                                 status="error",
-                                details=f"Error: {str(e)}"
+                                details={"error": str(e)}
                             )
                             db.add(key_event)
                             db.commit()
@@ -315,23 +329,12 @@ def save_auth_token_to_db(serial_number, auth_token, db):
 #     return digital_key is not None
 def verify_auth_token(serial_number, auth_token, db):
     """Verify if authentication token is valid for a digital key"""
-    print(f"Checking auth token for serial: {serial_number}, token: {auth_token}")
-    
-    # First check if key exists at all
-    any_key = db.query(DigitalKey).filter(
-        DigitalKey.key_uuid == serial_number
-    ).first()
-    
-    print(f"Found digital key with this serial: {any_key is not None}")
-    if any_key:
-        print(f"Key details: id={any_key.id}, auth_token={any_key.auth_token}")
-    
-    # Original query
     digital_key = db.query(DigitalKey).filter(
         DigitalKey.key_uuid == serial_number,
         DigitalKey.auth_token == auth_token
     ).first()
     
-    print(f"Match with auth token: {digital_key is not None}")
+    if digital_key is None:
+        logger.debug(f"Auth token mismatch for serial: {serial_number}")
     
     return digital_key is not None
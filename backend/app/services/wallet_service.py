@@ -8,24 +8,37 @@ import shutil
 import subprocess
 from datetime import datetime
 import time
-import jwt
 from pathlib import Path
 import base64
 import hmac
 import hashlib
-import requests
 
 from app.config import settings
 from app.utils.date_formatting import format_datetime_with_timezone
 from app.models.digital_key import KeyType, DigitalKey
 from app.services.wallet_push_service import save_auth_token_to_db
+from app.services.credential_service import credential_for_pass
 from app.db.session import SessionLocal
-from app.models.reservation import Reservation
-from app.models.room import Room
+from app.utils.metrics import histogram
+from app.services.hotel_service import (
+    get_hotel_metadata,
+    get_hotel_id_for_key,
+    DEFAULT_BACKGROUND_COLOR,
+    DEFAULT_FOREGROUND_COLOR,
+    DEFAULT_LABEL_COLOR,
+    DEFAULT_LATITUDE,
+    DEFAULT_LONGITUDE,
+    DEFAULT_TIMEZONE,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+wallet_signing_duration = histogram(
+    "wallet_pass_signing_duration_seconds",
+    "Time spent signing Apple Wallet pass manifests with OpenSSL",
+)
+
 
 def update_auth_tokens_for_existing_keys(db):
     """Update auth_token for all existing digital keys that have null tokens"""
@@ -82,22 +95,14 @@ def create_apple_wallet_pass(pass_data, db=None):
             # Save auth token to digital key
             save_auth_token_to_db(pass_data["key_uuid"], auth_token, db)
             
-            # Get hotel name from database
-            hotel_name = settings.HOTEL_NAME  # Default fallback
+            # Get hotel branding from the shared metadata cache
+            hotel = None
             try:
-                # Get the digital key by UUID
-                digital_key = db.query(DigitalKey).filter(DigitalKey.key_uuid == pass_data["key_uuid"]).first()
-                if digital_key:
-                    # Get the reservation
-                    reservation = db.query(Reservation).filter(Reservation.id == digital_key.reservation_id).first()
-                    if reservation:
-                        # Get the room
-                        room = db.query(Room).filter(Room.id == reservation.room_id).first()
-                        if room and room.hotel:
-                            hotel_name = room.hotel.name
-                            logger.info(f"Found hotel name from database: {hotel_name}")
+                hotel_id = pass_data.get("hotel_id") or get_hotel_id_for_key(db, key_uuid=pass_data["key_uuid"])
+                hotel = get_hotel_metadata(db, hotel_id)
             except Exception as hotel_err:
-                logger.warning(f"Error getting hotel name from database: {str(hotel_err)}")
+                logger.warning(f"Error getting hotel metadata: {str(hotel_err)}")
+            hotel_name = hotel.name if hotel else settings.HOTEL_NAME  # Default fallback
             
             # Create a temporary directory to build the pass
             with tempfile.TemporaryDirectory() as temp_dir:
@@ -109,6 +114,11 @@ def create_apple_wallet_pass(pass_data, db=None):
                 # Similarly for check_out
                 check_out_dt = datetime.fromisoformat(pass_data['check_out']).replace(microsecond=0)
                 formatted_check_out = check_out_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+                # Fields the guest reads show the hotel's local time
+                hotel_timezone = hotel.timezone if hotel else DEFAULT_TIMEZONE
+                local_check_in = format_datetime_with_timezone(pass_data['check_in'], hotel_timezone)
+                local_check_out = format_datetime_with_timezone(pass_data['check_out'], hotel_timezone)
                 
                 pkpass_filename = f"hotelkey_{pass_data['key_uuid']}.pkpass"
                 
@@ -122,17 +132,17 @@ def create_apple_wallet_pass(pass_data, db=None):
                     "description": f"Room Key for {hotel_name}",  # Use the hotel name from DB
                     
                     # Fixed color formatting
-                    "foregroundColor": "rgb(255, 255, 255)",
-                    "backgroundColor": "rgb(44, 62, 80)",
+                    "foregroundColor": hotel.foreground_color if hotel else DEFAULT_FOREGROUND_COLOR,
+                    "backgroundColor": hotel.background_color if hotel else DEFAULT_BACKGROUND_COLOR,
                     
-                    "labelColor": "rgb(255, 255, 255)",
+                    "labelColor": hotel.label_color if hotel else DEFAULT_LABEL_COLOR,
                     "logoText": hotel_name,  # Use the hotel name from DB
                     
                     # Locations configuration
                     "locations": [
                         {
-                            "longitude": 43.5483,
-                            "latitude": 7.1216,
+                            "longitude": hotel.longitude if hotel else DEFAULT_LONGITUDE,
+                            "latitude": hotel.latitude if hotel else DEFAULT_LATITUDE,
                             "relevantText": f"Welcome to {hotel_name}! Your digital key is ready to use."  # Use the hotel name from DB
                         }
                     ],
@@ -169,12 +179,12 @@ def create_apple_wallet_pass(pass_data, db=None):
                             {
                                 "key": "checkIn",
                                 "label": "CHECK-IN",
-                                "value": formatted_check_in,
+                                "value": local_check_in,
                             },
                             {
                                 "key": "checkOut",
                                 "label": "CHECK-OUT",
-                                "value": formatted_check_out,
+                                "value": local_check_out,
                             }
                         ],
                         # Optional back fields for additional information
@@ -182,12 +192,12 @@ def create_apple_wallet_pass(pass_data, db=None):
                             {
                                 "key": "checkInDate",
                                 "label": "Check-In Date",
-                                "value": formatted_check_in
+                                "value": local_check_in
                             },
                             {
                                 "key": "checkOutDate",
                                 "label": "Check-Out Date", 
-                                "value": formatted_check_out
+                                "value": local_check_out
                             },
                             {
                                 "key": "instructions",
@@ -233,6 +243,13 @@ def create_apple_wallet_pass(pass_data, db=None):
                     "authenticationToken": auth_token
                 }
 
+                # Signed offline credential for locks that verify taps locally.
+                # Apple caps the NFC message at 64 bytes, too small for an
+                # Ed25519 signature, so it travels in userInfo.
+                credential = credential_for_pass(pass_data)
+                if credential:
+                    pass_json["userInfo"] = {"keyCredential": credential}
+
                 # In production, the pass would be stored in cloud storage and a URL returned
                 # Write pass.json to temporary directory
                 with open(temp_path / "pass.json", "w") as f:
@@ -282,7 +299,8 @@ def create_apple_wallet_pass(pass_data, db=None):
                     "-outform", "DER"
                 ]
                 
-                subprocess.run(openssl_cmd, check=True)
+                with wallet_signing_duration.time():
+                    subprocess.run(openssl_cmd, check=True)
                 
                 # Create .pkpass file (zip archive)
                 output_dir = Path("app/static/passes")
@@ -319,6 +337,17 @@ def create_apple_wallet_pass(pass_data, db=None):
         raise
 
 
+def rgb_to_hex(color):
+    """Convert an Apple-style "rgb(r, g, b)" color to the "#rrggbb" form Google Wallet expects"""
+    if color.startswith("#"):
+        return color
+    try:
+        r, g, b = (int(part) for part in color[color.index("(") + 1:color.index(")")].split(","))
+        return f"#{r:02x}{g:02x}{b:02x}"
+    except ValueError:
+        return "#2c3e50"
+
+
 def create_google_wallet_pass(pass_data):
     """
     Create a Google Wallet pass for hotel room key
@@ -328,15 +357,24 @@ def create_google_wallet_pass(pass_data):
     try:
         logger.info(f"Creating Google Wallet pass for key: {pass_data['key_uuid']}")
         
+        hotel = get_hotel_metadata(None, pass_data.get("hotel_id"))
+        hotel_name = hotel.name if hotel else settings.HOTEL_NAME
+        logo_url = (hotel.logo_url if hotel else None) or settings.HOTEL_LOGO_URL
+        background_color = hotel.background_color if hotel else DEFAULT_BACKGROUND_COLOR
+        # Check-in/check-out in the hotel's local time, with its UTC offset
+        hotel_timezone = hotel.timezone if hotel else DEFAULT_TIMEZONE
+        check_in = format_datetime_with_timezone(pass_data["check_in"], hotel_timezone)
+        check_out = format_datetime_with_timezone(pass_data["check_out"], hotel_timezone)
+        
         # Create Google Wallet pass JSON
         pass_json = {
             "id": f"{settings.GOOGLE_PAY_ISSUER_ID}.{pass_data['key_uuid']}",
             "classId": f"{settings.GOOGLE_PAY_ISSUER_ID}.hotel_key_class",
             "genericType": "GENERIC_TYPE_HOTEL_KEY",
-            "hexBackgroundColor": "#2c3e50",
+            "hexBackgroundColor": rgb_to_hex(background_color),
             "logo": {
                 "sourceUri": {
-                    "uri": settings.HOTEL_LOGO_URL
+                    "uri": logo_url
                 }
             },
             "cardTitle": {
@@ -348,7 +386,7 @@ def create_google_wallet_pass(pass_data):
             "header": {
                 "defaultValue": {
                     "language": "en-US",
-                    "value": settings.HOTEL_NAME
+                    "value": hotel_name
                 }
             },
             "textModulesData": [
@@ -365,12 +403,12 @@ def create_google_wallet_pass(pass_data):
                 {
                     "id": "check_in",
                     "header": "Check-in",
-                    "body": pass_data["check_in"]
+                    "body": check_in
                 },
                 {
                     "id": "check_out",
                     "header": "Check-out",
-                    "body": pass_data["check_out"]
+                    "body": check_out
                 }
             ],
             "barcode": {
@@ -379,14 +417,16 @@ def create_google_wallet_pass(pass_data):
             },
             "nfcInfo": {
                 "enabled": True,
-                "message": pass_data["key_uuid"]
+                # Signed offline credential; locks without a verifier fall back
+                # to the key UUID it contains
+                "message": credential_for_pass(pass_data) or pass_data["key_uuid"]
             },
             "validTimeInterval": {
                 "start": {
-                    "date": pass_data["check_in"]
+                    "date": check_in
                 },
                 "end": {
-                    "date": pass_data["check_out"]
+                    "date": check_out
                 }
             },
             "state": "ACTIVE"
@@ -3,9 +3,11 @@ from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
 
-def format_datetime(dt_value):
+def format_datetime(dt_value, timezone_name=None):
     """Format a datetime value to a readable string format.
     Accepts either a datetime object or an ISO format string.
+    With timezone_name, the value (naive means UTC) is shown in that
+    timezone, e.g. the hotel's local time for guests.
     """
     if isinstance(dt_value, str):
         # If it's a string, parse it first
@@ -13,6 +15,11 @@ def format_datetime(dt_value):
     else:
         # If it's already a datetime object, use it directly
         dt = dt_value
+
+    if timezone_name:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        dt = dt.astimezone(ZoneInfo(timezone_name))
         
     # Format the datetime object
     return dt.strftime("%Y-%m-%d %H:%M")  # Use whatever format you prefer
@@ -41,3 +48,14 @@ def format_datetime_with_timezone(dt_str, timezone_name='Europe/Paris'):
     
     # Return ISO format with timezone info
     return local_dt.isoformat()
+
+
+def to_naive_utc(dt_value):
+    """
+    Convert a datetime to the naive UTC form stored in DateTime columns
+
+    Naive values are assumed to already be UTC.
+    """
+    if dt_value.tzinfo is not None:
+        dt_value = dt_value.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt_value
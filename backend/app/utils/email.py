@@ -5,10 +5,10 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.image import MIMEImage
 from typing import List, Dict, Any, Optional, Union
-from pathlib import Path
 import smtplib
 
 from app.config import settings
+from app.services.template_service import template_registry
 
 logger = logging.getLogger(__name__)
 
@@ -17,29 +17,19 @@ def render_template(template_name: str, **context) -> str:
     """
     Render a template with the given context
     
-    This is a simplified function. In a real application, 
-    you'd use a template engine like Jinja2.
+    Templates are precompiled once by the template registry, so this does not
+    touch the filesystem on each call.
     """
     try:
-        template_dir = Path(__file__).parent.parent.parent / "templates"
-        template_path = template_dir / template_name
-        
-        if not template_path.exists():
-            logger.error(f"Template not found: {template_name}")
-            return ""
-        
-        with open(template_path, "r") as f:
-            template_content = f.read()
-        
-        # Very basic template substitution
-        for key, value in context.items():
-            placeholder = f"{{{{ {key} }}}}"
-            template_content = template_content.replace(placeholder, str(value))
-        
-        return template_content
+        return template_registry.render(template_name, **context)
     
     except Exception as e:
-        logger.error(f"Error rendering template {template_name}: {str(e)}")
+        # Jinja is loaded by the registry by the time anything can fail here
+        from jinja2 import TemplateNotFound
+        if isinstance(e, TemplateNotFound):
+            logger.error(f"Template not found: {template_name}")
+        else:
+            logger.error(f"Error rendering template {template_name}: {str(e)}")
         return ""
 
 
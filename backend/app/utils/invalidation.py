@@ -0,0 +1,236 @@
+# backend/app/utils/invalidation.py
+import json
+import logging
+import os
+import select
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.db.session import engine
+from app.utils.cache import LRUCache
+from app.utils.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+invalidations_published = counter(
+    "cache_invalidations_published_total",
+    "Cache invalidations published to other workers, by channel",
+    ("channel",),
+)
+invalidations_received = counter(
+    "cache_invalidations_received_total",
+    "Cache invalidations received from other workers, by channel",
+    ("channel",),
+)
+
+# Handlers get the invalidated key, or None for "everything on this channel"
+Handler = Callable[[Optional[str]], None]
+
+# Longest wait for a notification before checking for shutdown
+LISTEN_POLL_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+# Session.info key of invalidations waiting for the session's commit
+PENDING_INVALIDATIONS = "pending_invalidations"
+
+
+class InvalidationBus:
+    """
+    In-process invalidation bus
+
+    Caches subscribe to a channel and callers publish the key that changed
+    (or None for everything). This base class only reaches the current
+    process, which is all a single worker or the tests need.
+    """
+
+    backend = "local"
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Handler]] = {}
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def subscribe_cache(self, channel: str, cache: LRUCache) -> None:
+        """Keep an LRUCache keyed like the channel coherent: drop a key, or clear on None"""
+        self.subscribe(channel, lambda key: cache.clear() if key is None else cache.invalidate(key))
+
+    def publish(self, channel: str, key: Optional[str] = None) -> None:
+        """Invalidate key on channel in every worker (here: this process only)"""
+        self.dispatch(channel, key)
+
+    def publish_after_commit(self, db: Session, channel: str, key: Optional[str] = None) -> None:
+        """Like publish(), once db's transaction commits; nothing is published if it rolls back"""
+        db.info.setdefault(PENDING_INVALIDATIONS, []).append((self, channel, key))
+
+    def dispatch(self, channel: str, key: Optional[str]) -> None:
+        """Run this process's handlers for an invalidation"""
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"Error in invalidation handler for {channel}: {str(e)}")
+
+    def dispatch_all(self) -> None:
+        """Clear everything every handler holds"""
+        for channel in list(self._handlers):
+            self.dispatch(channel, None)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def check(self) -> Tuple[bool, Dict[str, Any]]:
+        return True, {"backend": self.backend}
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """
+    Invalidation bus over PostgreSQL LISTEN/NOTIFY
+
+    publish() applies the invalidation locally right away, then sends a
+    NOTIFY that every other worker (in any process or container on the same
+    database) receives on a dedicated listening connection and applies to
+    its own caches. publish_after_commit() sends the NOTIFY inside the
+    caller's transaction instead. Notifications sent while a worker's
+    listener was disconnected are lost, so after reconnecting it clears
+    every subscribed cache instead.
+
+    Args:
+        engine: Engine used to send notifications
+        channel: PostgreSQL notification channel shared by all workers
+    """
+
+    backend = "postgres"
+
+    def __init__(self, engine: Engine, channel: str):
+        super().__init__()
+        self.engine = engine
+        self.channel = channel
+        # Set in start(), i.e. after the worker process has forked
+        self.origin: Optional[str] = None
+        self.connected = False
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _payload(self, channel: str, key: Optional[str]) -> Dict[str, str]:
+        message = json.dumps({"origin": self.origin, "channel": channel, "key": key})
+        return {"channel": self.channel, "payload": message}
+
+    def publish(self, channel: str, key: Optional[str] = None) -> None:
+        self.dispatch(channel, key)
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(text("SELECT pg_notify(:channel, :payload)"), self._payload(channel, key))
+            invalidations_published.inc(channel=channel)
+        except Exception as e:
+            # Other workers still drop the entry when its TTL runs out
+            logger.error(f"Could not publish invalidation of {channel}:{key}: {str(e)}")
+
+    def publish_after_commit(self, db: Session, channel: str, key: Optional[str] = None) -> None:
+        super().publish_after_commit(db, channel, key)
+        # NOTIFY is transactional: PostgreSQL delivers it when db commits and drops it on rollback
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), self._payload(channel, key))
+        invalidations_published.inc(channel=channel)
+
+    def handle_notification(self, payload: str) -> None:
+        message = json.loads(payload)
+        if message.get("origin") == self.origin:
+            # Already applied when it was published
+            return
+        invalidations_received.inc(channel=message["channel"])
+        self.dispatch(message["channel"], message.get("key"))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="invalidation-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=LISTEN_POLL_SECONDS * 2)
+            self._thread = None
+
+    def check(self) -> Tuple[bool, Dict[str, Any]]:
+        return self.connected, {"backend": self.backend}
+
+    def _listen(self) -> None:
+        # Its own unpooled engine, so the listening connection never takes a pool slot
+        listen_engine = create_engine(self.engine.url, poolclass=NullPool)
+        delay = 1.0
+        first = True
+        while not self._stopping.is_set():
+            try:
+                connection = listen_engine.raw_connection()
+                try:
+                    dbapi_connection = connection.driver_connection
+                    dbapi_connection.autocommit = True
+                    with dbapi_connection.cursor() as cursor:
+                        cursor.execute(f'LISTEN "{self.channel}"')
+                    self.connected = True
+                    delay = 1.0
+                    if not first:
+                        logger.warning("Invalidation listener reconnected, clearing caches")
+                        self.dispatch_all()
+                    first = False
+                    self._drain(dbapi_connection)
+                finally:
+                    self.connected = False
+                    connection.close()
+            except Exception as e:
+                logger.error(f"Invalidation listener failed, retrying in {delay:.0f}s: {str(e)}")
+                first = False
+                self._stopping.wait(delay)
+                delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+        listen_engine.dispose()
+
+    def _drain(self, dbapi_connection) -> None:
+        while not self._stopping.is_set():
+            readable, _, _ = select.select([dbapi_connection], [], [], LISTEN_POLL_SECONDS)
+            if not readable:
+                continue
+            dbapi_connection.poll()
+            while dbapi_connection.notifies:
+                notification = dbapi_connection.notifies.pop(0)
+                try:
+                    self.handle_notification(notification.payload)
+                except Exception as e:
+                    logger.error(f"Bad invalidation message {notification.payload!r}: {str(e)}")
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_pending(session: Session) -> None:
+    for bus, channel, key in session.info.pop(PENDING_INVALIDATIONS, []):
+        bus.dispatch(channel, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+def create_invalidation_bus(backend: str, engine: Engine) -> InvalidationBus:
+    """Bus for INVALIDATION_BUS: "postgres", "local", or "auto" (postgres when the database is)"""
+    if backend == "auto":
+        backend = "postgres" if engine.dialect.name == "postgresql" else "local"
+    if backend == "postgres":
+        return PostgresInvalidationBus(engine, settings.INVALIDATION_CHANNEL)
+    if backend == "local":
+        return InvalidationBus()
+    raise ValueError(f"Unknown invalidation bus: {backend}")
+
+
+invalidation_bus = create_invalidation_bus(settings.INVALIDATION_BUS, engine)
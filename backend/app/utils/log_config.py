@@ -0,0 +1,180 @@
+# backend/app/utils/log_config.py
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.utils.metrics import counter
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_FILE_MAX_BYTES = 10485760  # 10 MB
+LOG_FILE_BACKUP_COUNT = 5
+
+# Loggers whose records go through the queue; everything else keeps propagating to root
+QUEUED_LOGGERS = ("app", "uvicorn", "uvicorn.access")
+
+log_records_dropped = counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full",
+)
+log_records_sampled_out = counter(
+    "log_records_sampled_out_total",
+    "Log records skipped by per-logger sampling, by logger",
+    ("logger",),
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the time, level, logger and message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "app.api.passes=0.1,uvicorn.access=0.01" into logger name -> rate"""
+    rates = {}
+    for part in (spec or "").split(","):
+        name, _, rate = part.partition("=")
+        if name.strip():
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a share of the records below WARNING from high-volume loggers
+
+    Rates apply to a logger and its children; the most specific configured
+    name wins. Sampling is deterministic (one record in every 1/rate), so a
+    steady stream keeps an even spread. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._seen: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> Optional[str]:
+        while name:
+            if name in self.rates:
+                return name
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        configured = self._rate_for(record.name)
+        if configured is None:
+            return True
+        rate = self.rates[configured]
+        with self._lock:
+            seen = self._seen.get(configured, 0)
+            self._seen[configured] = seen + 1
+        keep = rate > 0 and int((seen + 1) * rate) > int(seen * rate)
+        if not keep:
+            log_records_sampled_out.inc(logger=configured)
+        return keep
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records when the queue is full instead of blocking or raising"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now, but leave formatting to the listener's handlers
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
+def stop_listener(listener: logging.handlers.QueueListener) -> None:
+    """Write out queued records and stop the listener thread; safe to call twice"""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def configure_logging(
+    log_dir: str,
+    level: str = "INFO",
+    fmt: str = "text",
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: int = 10000,
+) -> logging.handlers.QueueListener:
+    """
+    Route app and uvicorn logging through a queue drained by a background thread
+
+    Request threads only format the message and enqueue it; the console and
+    rotating file handlers run on the listener thread, so a slow disk or
+    terminal never holds up a request. The listener is stopped (and the queue
+    flushed) at exit.
+
+    Args:
+        log_dir: Directory for app.log
+        level: Level for the queued loggers
+        fmt: "text" or "json"
+        sample_rates: Logger name -> share of sub-WARNING records to keep
+        queue_size: Records buffered before new ones are dropped (0 is unbounded)
+
+    Returns:
+        The running QueueListener
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    formatter = JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT)
+
+    handlers: List[logging.Handler] = [
+        logging.StreamHandler(),
+        logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, "app.log"),
+            maxBytes=LOG_FILE_MAX_BYTES,
+            backupCount=LOG_FILE_BACKUP_COUNT,
+        ),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    for name in QUEUED_LOGGERS:
+        logger = logging.getLogger(name)
+        for existing in list(logger.handlers):
+            logger.removeHandler(existing)
+        logger.addHandler(queue_handler)
+        logger.setLevel(level)
+        logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
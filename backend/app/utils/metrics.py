@@ -0,0 +1,322 @@
+# backend/app/utils/metrics.py
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple, List, Optional
+
+# Seconds; spans fast cached lookups up to slow pass signing and pushes
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Render a label set in Prometheus text format"""
+    if not labels:
+        return ""
+    rendered = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels)
+    return "{" + rendered + "}"
+
+
+def _labels_key(labels: List[List[str]]) -> Tuple[Tuple[str, str], ...]:
+    """Label set read back from a snapshot (JSON turns the tuples into lists)"""
+    return tuple((name, value) for name, value in labels)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[Tuple[str, str], ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple((name, str(labels.get(name, ""))) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def snapshot(self) -> List[Any]:
+        """This process's values, in a form other workers can read back"""
+        with self._lock:
+            return [[labels, value] for labels, value in self._values.items()]
+
+    def collect(self, others: Optional[Dict[str, List[Any]]] = None) -> List[str]:
+        """Render, adding in other workers' snapshots (by worker) when given"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            values = dict(self._values)
+        for snapshot in (others or {}).values():
+            for labels, value in snapshot:
+                key = _labels_key(labels)
+                values[key] = values.get(key, 0) + value
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down, with optional labels
+    """
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def collect(self, others: Optional[Dict[str, List[Any]]] = None) -> List[str]:
+        """
+        Render; with other workers' snapshots, every worker's value is a
+        separate series labelled worker=<pid> (levels such as readiness
+        don't add up across workers)
+        """
+        if others is None:
+            lines = super().collect()
+            lines[1] = f"# TYPE {self.name} gauge"
+            return lines
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ]
+        snapshots = dict(others)
+        snapshots[str(os.getpid())] = self.snapshot()
+        series = []
+        for worker, snapshot in snapshots.items():
+            for labels, value in snapshot:
+                series.append((_labels_key(labels) + (("worker", worker),), value))
+        for labels, value in sorted(series):
+            lines.append(f"{self.name}{_format_labels(labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets, with optional labels
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+        # Per label set: count per bucket (the last one is +Inf) and the sum
+        self._values: Dict[Tuple[Tuple[str, str], ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple((name, str(labels.get(name, ""))) for name in self.labelnames)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            state[0][index] += 1
+            state[1][0] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def sum(self, **labels) -> float:
+        state = self._values.get(self._key(labels))
+        return state[1][0] if state else 0.0
+
+    def snapshot(self) -> List[Any]:
+        """This process's buckets and sums, in a form other workers can read back"""
+        with self._lock:
+            return [[labels, list(counts), total[0]] for labels, (counts, total) in self._values.items()]
+
+    def collect(self, others: Optional[Dict[str, List[Any]]] = None) -> List[str]:
+        """Render, adding in other workers' snapshots (by worker) when given"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        merged: Dict[Tuple[Tuple[str, str], ...], Tuple[List[int], float]] = {}
+        for snapshot in [self.snapshot()] + list((others or {}).values()):
+            for labels, counts, total in snapshot:
+                key = _labels_key(labels)
+                state = merged.get(key)
+                if state is None:
+                    merged[key] = (list(counts), total)
+                else:
+                    merged[key] = ([a + b for a, b in zip(state[0], counts)], state[1] + total)
+        items = sorted((labels, counts, total) for labels, (counts, total) in merged.items())
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self._bounds, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registry of metrics exposed at /metrics
+
+    Metrics live in the process that records them. Under gunicorn, share()
+    a directory between the workers: each one then flush()es a snapshot of
+    its metrics there, and render() adds up the counters and histograms of
+    every worker, including ones that have been recycled, so /metrics shows
+    the same totals whichever worker answers the scrape.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._directory: Optional[str] = None
+        self._worker: Optional[str] = None
+        self._snapshot_path: Optional[str] = None
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def get(self, name: str) -> Optional[object]:
+        return self._metrics.get(name)
+
+    def share(self, directory: str) -> None:
+        """Exchange snapshots with the other workers through directory"""
+        if self._directory == directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        # Unique per process start, so a reused pid never overwrites a recycled worker's totals
+        self._worker = f"{os.getpid()}-{uuid.uuid4().hex}"
+        self._snapshot_path = os.path.join(directory, f"metrics-{self._worker}.json")
+
+    def flush(self) -> None:
+        """Write this worker's snapshot for the other workers' render()"""
+        if self._snapshot_path is None:
+            return
+        with self._lock:
+            metrics = list(self._metrics.values())
+        snapshot = {
+            "pid": os.getpid(),
+            "worker": self._worker,
+            "metrics": {metric.name: metric.snapshot() for metric in metrics},
+        }
+        temporary_path = f"{self._snapshot_path}.tmp"
+        with open(temporary_path, "w") as snapshot_file:
+            json.dump(snapshot, snapshot_file)
+        os.replace(temporary_path, self._snapshot_path)
+
+    def _other_snapshots(self) -> List[Dict[str, Any]]:
+        snapshots = []
+        for path in glob.glob(os.path.join(self._directory, "metrics-*.json")):
+            if path == self._snapshot_path:
+                continue
+            try:
+                with open(path) as snapshot_file:
+                    snapshots.append(json.load(snapshot_file))
+            except (OSError, ValueError):
+                # Removed while listing the directory
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        """Render all registered metrics in Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        others: Optional[Dict[str, Dict[str, List[Any]]]] = None
+        if self._directory is not None:
+            others = {metric.name: {} for metric in metrics}
+            for snapshot in self._other_snapshots():
+                alive = _process_alive(snapshot["pid"])
+                for name, values in snapshot["metrics"].items():
+                    metric = self._metrics.get(name)
+                    if metric is None:
+                        continue
+                    if isinstance(metric, Gauge):
+                        # A recycled worker's levels no longer mean anything
+                        if alive:
+                            others[name][str(snapshot["pid"])] = values
+                    else:
+                        # ...but its counts still add up
+                        others[name][snapshot["worker"]] = values
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.collect(None if others is None else others[metric.name]))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def counter(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    """Get or create a counter in the default registry"""
+    return registry.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    """Get or create a gauge in the default registry"""
+    return registry.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: Tuple[str, ...] = (),
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Get or create a histogram in the default registry"""
+    return registry.register(Histogram(name, documentation, labelnames, buckets))
@@ -0,0 +1,101 @@
+# backend/app/utils/pagination.py
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.orm import Query
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the given sort columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(value) if isinstance(column.type, DateTime) and value is not None else value
+            for column, value in zip(columns, values)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _after(columns: Sequence[Any], values: Sequence[Any], descending: bool):
+    """Build the keyset condition "row comes after values" in sort order"""
+    # A row-value comparison lets the database seek straight into a
+    # composite index on the sort columns
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
+
+
+def paginate(
+    query: Query,
+    columns: Sequence[Any],
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    descending: bool = False,
+    response: Optional[Response] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Keyset-paginate a query on the given sort columns
+
+    The last column must be unique (normally the primary key) so the sort
+    order is total. Fetching a page costs the same however deep it is.
+
+    Args:
+        query: Query to paginate, without ORDER BY/LIMIT
+        columns: Sort key columns, e.g. (Reservation.check_in, Reservation.id)
+        limit: Page size (capped at MAX_PAGE_SIZE)
+        cursor: Cursor returned with the previous page, if any
+        skip: Legacy offset, only honoured when no cursor is given
+        descending: Sort newest/largest first
+        response: If given, the next cursor is set in the X-Next-Cursor header
+
+    Returns:
+        (rows, next_cursor) where next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in columns))
+
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether there is a next page
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in columns])
+
+    if response is not None and next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return rows, next_cursor
@@ -0,0 +1,41 @@
+# backend/app/utils/periodic.py
+import asyncio
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(
+    name: str,
+    interval: float,
+    job: Callable[[], Any],
+    initial_delay: float = 0,
+    log_results: bool = True,
+) -> None:
+    """
+    Run a blocking job every interval seconds until cancelled
+
+    The job runs in a worker thread so it never blocks the event loop, and
+    failures are logged without stopping the loop. log_results=False skips
+    the line logged after every successful run, for frequent jobs.
+    """
+    if initial_delay:
+        await asyncio.sleep(initial_delay)
+    while True:
+        try:
+            result = await asyncio.to_thread(job)
+            if log_results:
+                logger.info(f"Periodic job {name} finished: {result}")
+        except Exception as e:
+            logger.error(f"Periodic job {name} failed: {str(e)}")
+        await asyncio.sleep(interval)
+
+
+async def run_in_background(name: str, job: Callable[[], Any]) -> None:
+    """Run a blocking job once in a worker thread, logging its result or failure"""
+    try:
+        result = await asyncio.to_thread(job)
+        logger.info(f"Background job {name} finished: {result}")
+    except Exception as e:
+        logger.error(f"Background job {name} failed: {str(e)}")
@@ -0,0 +1,131 @@
+# backend/app/utils/qr_cache.py
+import hashlib
+import logging
+import os
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+from app.config import settings
+from app.utils.cache import LRUCache
+from app.utils.metrics import counter
+
+logger = logging.getLogger(__name__)
+
+# Names in qrcode.constants, resolved when rendering
+ERROR_CORRECTION_LEVELS = {
+    "L": "ERROR_CORRECT_L",
+    "M": "ERROR_CORRECT_M",
+    "Q": "ERROR_CORRECT_Q",
+    "H": "ERROR_CORRECT_H",
+}
+
+qr_cache_requests = counter(
+    "qr_cache_requests_total",
+    "QR code cache lookups by tier and result",
+    ("tier", "result"),
+)
+qr_renders = counter("qr_renders_total", "QR code PNG images rendered")
+
+
+def render_qr_png(url: str, box_size: int = 10, border: int = 4, error_correction: str = "L") -> bytes:
+    """Render a QR code for the given URL as PNG bytes"""
+    # qrcode pulls in Pillow; most cache lookups never render, so load it on the first miss
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=getattr(qrcode.constants, ERROR_CORRECTION_LEVELS[error_correction]),
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buffered = BytesIO()
+    img.save(buffered, format="PNG")
+    qr_renders.inc()
+    return buffered.getvalue()
+
+
+class QRCodeCache:
+    """
+    Two-tier cache of rendered QR code PNGs
+
+    The memory tier is a size- and byte-bounded LRU. The optional disk tier
+    stores one PNG per cache key so images survive restarts.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, disk_dir: Optional[str] = None):
+        self.memory = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+    @staticmethod
+    def cache_key(url: str, box_size: int, border: int, error_correction: str) -> str:
+        raw = f"{url}|{box_size}|{border}|{error_correction}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_png(self, url: str, box_size: int = 10, border: int = 4, error_correction: str = "L") -> bytes:
+        """Return the PNG for the given URL and rendering parameters, rendering only on a miss"""
+        key = self.cache_key(url, box_size, border, error_correction)
+
+        png = self.memory.get(key)
+        if png is not None:
+            qr_cache_requests.inc(tier="memory", result="hit")
+            return png
+        qr_cache_requests.inc(tier="memory", result="miss")
+
+        png = self._read_disk(key)
+        if png is not None:
+            qr_cache_requests.inc(tier="disk", result="hit")
+            self.memory.set(key, png)
+            return png
+        if self.disk_dir is not None:
+            qr_cache_requests.inc(tier="disk", result="miss")
+
+        png = render_qr_png(url, box_size, border, error_correction)
+        self.memory.set(key, png)
+        self._write_disk(key, png)
+        return png
+
+    def clear(self) -> None:
+        """Drop the memory tier (the disk tier is left in place)"""
+        self.memory.clear()
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.png"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if self.disk_dir is None:
+            return None
+        try:
+            return self._disk_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Error reading QR code cache file for {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, png: bytes) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial PNG
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Error writing QR code cache file for {key}: {str(e)}")
+
+
+qr_code_cache = QRCodeCache(
+    max_entries=settings.QR_CACHE_MAX_ENTRIES,
+    max_bytes=settings.QR_CACHE_MAX_BYTES,
+    disk_dir=settings.QR_CACHE_DIR or None,
+)
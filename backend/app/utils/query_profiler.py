@@ -0,0 +1,128 @@
+# backend/app/utils/query_profiler.py
+import heapq
+import logging
+import re
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.utils.metrics import counter, histogram
+from app.utils.request_metrics import route_template
+
+logger = logging.getLogger("app.sql")
+
+# Longest statement text kept for logs
+STATEMENT_MAX_LENGTH = 500
+
+http_request_db_queries = histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request, by route",
+    ("route",),
+    buckets=(1, 2, 5, 10, 15, 20, 30, 50, 100, 200),
+)
+http_request_db_duration = histogram(
+    "http_request_db_duration_seconds",
+    "Total SQL execution time per request, by route",
+    ("route",),
+)
+db_slow_queries = counter(
+    "db_slow_queries_total",
+    "SQL statements slower than SLOW_QUERY_THRESHOLD_MS, by route",
+    ("route",),
+)
+
+_current_profile: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+
+
+def _compact(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()[:STATEMENT_MAX_LENGTH]
+
+
+class QueryProfile:
+    """SQL statements executed while handling one request"""
+
+    def __init__(self, scope: Scope, top_n: int):
+        self.scope = scope
+        self.top_n = top_n
+        self.count = 0
+        self.total = 0.0
+        # Min-heap of (seconds, statement), so the fastest of the kept ones is dropped first
+        self._slowest: List[Tuple[float, str]] = []
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        if len(self._slowest) < self.top_n:
+            heapq.heappush(self._slowest, (duration, statement))
+        elif self._slowest and duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (duration, statement))
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        return sorted(self._slowest, reverse=True)
+
+
+def record_query(statement: str, duration: float) -> None:
+    """Add a statement to the current request's profile and log it if slow (called from the engine events)"""
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    profile.record(statement, duration)
+    if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        route = profile.route
+        db_slow_queries.inc(route=route)
+        logger.warning(f"Slow query {duration * 1000:.1f}ms on {profile.scope['method']} {route}: {_compact(statement)}")
+
+
+def finish_profile(profile: QueryProfile) -> None:
+    """Record a finished request's totals and log it if its DB time was over the threshold"""
+    route = profile.route
+    http_request_db_queries.observe(profile.count, route=route)
+    http_request_db_duration.observe(profile.total, route=route)
+    if profile.total * 1000 >= settings.SLOW_REQUEST_DB_THRESHOLD_MS:
+        slowest = "; ".join(f"{seconds * 1000:.1f}ms {_compact(statement)}" for seconds, statement in profile.slowest())
+        logger.warning(
+            f"{profile.scope['method']} {route} spent {profile.total * 1000:.1f}ms in {profile.count} queries, slowest: {slowest}"
+        )
+
+
+class QueryProfilerMiddleware:
+    """
+    Profile the SQL statements run for each request (opt-in with SQL_PROFILER_ENABLED)
+
+    Statements are collected through the engine events in app.db.session into
+    a per-request profile held in a context variable, which the threadpool
+    running sync endpoints and dependencies inherits. Counts and DB time go
+    to /metrics by route template; SQL_PROFILER_HEADERS adds X-DB-Query-Count
+    and X-DB-Time-Ms to responses for debugging.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.SQL_PROFILER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(scope, settings.SQL_PROFILER_TOP_N)
+        token = _current_profile.set(profile)
+
+        async def send_with_profile(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.SQL_PROFILER_HEADERS:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Query-Count", str(profile.count))
+                headers.append("X-DB-Time-Ms", f"{profile.total * 1000:.2f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            _current_profile.reset(token)
+            finish_profile(profile)
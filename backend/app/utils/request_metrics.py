@@ -0,0 +1,72 @@
+# backend/app/utils/request_metrics.py
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import counter, gauge, histogram
+
+# Label for requests that matched no route, so unknown paths can't add series
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_request_duration = histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response, by route",
+    ("method", "route"),
+)
+http_requests_total = counter(
+    "http_requests_total",
+    "Completed requests, by route and status code",
+    ("method", "route", "status"),
+)
+http_requests_in_progress = gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled, by method",
+    ("method",),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled a request, e.g. /api/v1/keys/{key_id}"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Record request latency, status codes and in-flight requests
+
+    Pure ASGI, so streaming responses pass through untouched and the duration
+    covers the whole body. Requests are labelled with the route template set
+    by the router, not the raw path. X-Process-Time carries the time to the
+    response headers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Process-Time", f"{time.perf_counter() - start:.6f}")
+            await send(message)
+
+        http_requests_in_progress.inc(method=method)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = route_template(scope)
+            http_requests_in_progress.dec(method=method)
+            http_request_duration.observe(time.perf_counter() - start, method=method, route=route)
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
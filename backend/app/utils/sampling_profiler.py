@@ -0,0 +1,375 @@
+# backend/app/utils/sampling_profiler.py
+import glob
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Set
+
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Distinct stacks kept per session; further new stacks are counted together
+MAX_STACKS = 20000
+TRUNCATED_STACK = "[other stacks]"
+
+# Invalidation bus channel that starts and stops sessions in every worker
+PROFILER_CHANNEL = "profiler"
+# How often a session writes its stacks to the shared directory
+DUMP_INTERVAL_SECONDS = 1.0
+
+
+class ProfilerBusyError(Exception):
+    """Raised when starting a session while another one is running"""
+
+
+def _route_code_objects(route) -> Set:
+    """Code objects of a route's endpoint and all of its dependencies"""
+    codes = set()
+    dependants = [route.dependant]
+    while dependants:
+        dependant = dependants.pop()
+        call = dependant.call
+        if call is not None:
+            code = getattr(inspect.unwrap(call), "__code__", None)
+            if code is not None:
+                codes.add(code)
+        dependants.extend(dependant.dependencies)
+    return codes
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def find_route(routes: Sequence, path: str, method: str) -> Optional[APIRoute]:
+    """The API route with this path template that serves method"""
+    return next((
+        route for route in routes
+        if isinstance(route, APIRoute) and route.path == path and method in route.methods
+    ), None)
+
+
+class ProfileSession:
+    """
+    Statistical profile of one route
+
+    A sampler thread wakes every interval and, while a selected request is in
+    flight, records the stack of every thread currently inside the route's
+    endpoint or one of its dependencies. Stacks are trimmed to start at the
+    outermost handler frame and counted in collapsed form. With a dump_path,
+    the counts are also written there every DUMP_INTERVAL_SECONDS and when
+    the session ends, for the worker that serves the results.
+    """
+
+    def __init__(
+        self,
+        route,
+        method: str,
+        sample_every: int,
+        duration: float,
+        interval: float,
+        session_id: Optional[str] = None,
+        dump_path: Optional[str] = None,
+    ):
+        self.id = session_id or uuid.uuid4().hex
+        self.dump_path = dump_path
+        self.route = route
+        self.method = method
+        self.label = f"{method} {route.path}"
+        self.sample_every = sample_every
+        self.interval = interval
+        self.started_at = datetime.now(timezone.utc)
+        self.ends_at = self.started_at + timedelta(seconds=duration)
+        self._deadline = time.monotonic() + duration
+        self._codes = _route_code_objects(route)
+
+        self.requests_seen = 0
+        self.requests_profiled = 0
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    @property
+    def active(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def select(self, scope: Scope) -> bool:
+        """Whether this request should be profiled (every sample_every-th matching request)"""
+        if self._stopped.is_set() or scope.get("method") != self.method:
+            return False
+        if self.route.matches(scope)[0] != Match.FULL:
+            return False
+        with self._lock:
+            self.requests_seen += 1
+            selected = (self.requests_seen - 1) % self.sample_every == 0
+            if selected:
+                self.requests_profiled += 1
+                self._in_flight += 1
+        return selected
+
+    def finish(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _collapse(self, frame) -> Optional[str]:
+        labels = []
+        outermost = -1
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            if frame.f_code in self._codes:
+                outermost = len(labels) - 1
+            frame = frame.f_back
+        if outermost < 0:
+            return None
+        return ";".join([self.label] + labels[outermost::-1])
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        next_dump = time.monotonic() + DUMP_INTERVAL_SECONDS
+        while not self._stopped.wait(self.interval):
+            if time.monotonic() >= self._deadline:
+                break
+            if self.dump_path and time.monotonic() >= next_dump:
+                self.dump(active=True)
+                next_dump = time.monotonic() + DUMP_INTERVAL_SECONDS
+            if not self._in_flight:
+                continue
+            frames = sys._current_frames()
+            stacks = [self._collapse(frame) for thread_id, frame in frames.items() if thread_id != own_id]
+            del frames
+            with self._lock:
+                for stack in stacks:
+                    if stack is None:
+                        continue
+                    if stack not in self.stacks and len(self.stacks) >= MAX_STACKS:
+                        stack = TRUNCATED_STACK
+                    self.stacks[stack] += 1
+                    self.samples += 1
+        self._stopped.set()
+        if self.dump_path:
+            self.dump(active=False)
+
+    def dump(self, active: bool) -> None:
+        """Write the counts to dump_path for other workers to merge"""
+        with self._lock:
+            data = {
+                "id": self.id,
+                "active": active,
+                "requests_seen": self.requests_seen,
+                "requests_profiled": self.requests_profiled,
+                "samples": self.samples,
+                "stacks": dict(self.stacks),
+            }
+        try:
+            temporary_path = f"{self.dump_path}.tmp"
+            with open(temporary_path, "w") as dump_file:
+                json.dump(data, dump_file)
+            os.replace(temporary_path, self.dump_path)
+        except OSError as e:
+            logger.error(f"Could not write profile to {self.dump_path}: {str(e)}")
+
+    def stack_counts(self) -> Counter:
+        with self._lock:
+            return Counter(self.stacks)
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed format ("frame;frame;frame count" per line), for flamegraph.pl or speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stack_counts().items()))
+
+    def status(self) -> Dict:
+        return {
+            "route": self.route.path,
+            "method": self.method,
+            "sample_every": self.sample_every,
+            "interval_ms": self.interval * 1000,
+            "started_at": self.started_at,
+            "ends_at": self.ends_at,
+            "active": self.active,
+            "requests_seen": self.requests_seen,
+            "requests_profiled": self.requests_profiled,
+            "samples": self.samples,
+            "distinct_stacks": len(self.stacks),
+        }
+
+
+class SamplingProfiler:
+    """
+    Holds the current (or last) profile session; one runs at a time
+
+    Each worker process samples only its own requests. Once share()d,
+    start() and stop() are broadcast on the invalidation bus so every worker
+    runs the same session, and with a directory every worker dumps its
+    counts there, which status() and collapsed() merge. Workers started
+    after a session began (e.g. recycled ones) sit it out.
+    """
+
+    def __init__(self):
+        self.session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+        self._bus = None
+        self._routes: Sequence = ()
+        self._directory: Optional[str] = None
+        self._dump_path: Optional[str] = None
+
+    def share(self, bus, routes: Sequence, directory: Optional[str] = None) -> None:
+        """Run sessions in every worker reached by bus, merging their counts through directory"""
+        if self._bus is None:
+            bus.subscribe(PROFILER_CHANNEL, self._handle)
+        self._bus = bus
+        self._routes = routes
+        if directory and directory != self._directory:
+            os.makedirs(directory, exist_ok=True)
+            self._directory = directory
+            self._dump_path = os.path.join(directory, f"profile-{os.getpid()}-{uuid.uuid4().hex}.json")
+
+    def start(self, route, method: str, sample_every: int, duration: float, interval: float) -> ProfileSession:
+        with self._lock:
+            if self.session is not None and self.session.active:
+                raise ProfilerBusyError(f"Already profiling {self.session.label}")
+            session = self._start(route, method, sample_every, duration, interval)
+        self._publish({
+            "action": "start",
+            "id": session.id,
+            "route": route.path,
+            "method": method,
+            "sample_every": sample_every,
+            "duration": duration,
+            "interval": interval,
+        })
+        return session
+
+    def stop(self) -> Optional[ProfileSession]:
+        session = self.session
+        if session is not None:
+            session.stop()
+            self._publish({"action": "stop", "id": session.id})
+        return session
+
+    def _start(
+        self,
+        route,
+        method: str,
+        sample_every: int,
+        duration: float,
+        interval: float,
+        session_id: Optional[str] = None,
+    ) -> ProfileSession:
+        self.session = ProfileSession(
+            route, method, sample_every, duration, interval, session_id=session_id, dump_path=self._dump_path
+        )
+        self.session.start()
+        return self.session
+
+    def _publish(self, message: Dict) -> None:
+        if self._bus is not None:
+            self._bus.publish(PROFILER_CHANNEL, json.dumps(message))
+
+    def _handle(self, key: Optional[str]) -> None:
+        """Apply a start or stop broadcast by another worker"""
+        if key is None:
+            # "Clear everything", sent after the bus reconnects: no session to touch
+            return
+        message = json.loads(key)
+        with self._lock:
+            session = self.session
+            if message["action"] == "stop":
+                if session is not None and session.id == message["id"]:
+                    session.stop()
+                return
+            if session is not None and session.id == message["id"]:
+                # Started here
+                return
+            route = find_route(self._routes, message["route"], message["method"])
+            if route is None:
+                return
+            if session is not None:
+                session.stop()
+            self._start(
+                route,
+                message["method"],
+                message["sample_every"],
+                message["duration"],
+                message["interval"],
+                session_id=message["id"],
+            )
+
+    def _worker_dumps(self, session: ProfileSession) -> List[Dict]:
+        """The other workers' counts for session"""
+        if self._directory is None:
+            return []
+        dumps = []
+        for path in glob.glob(os.path.join(self._directory, "profile-*.json")):
+            if path == self._dump_path:
+                continue
+            try:
+                with open(path) as dump_file:
+                    data = json.load(dump_file)
+            except (OSError, ValueError):
+                continue
+            if data.get("id") == session.id:
+                dumps.append(data)
+        return dumps
+
+    def _merged_stacks(self, session: ProfileSession, dumps: List[Dict]) -> Counter:
+        stacks = session.stack_counts()
+        for dump in dumps:
+            stacks.update(dump["stacks"])
+        return stacks
+
+    def status(self, session: ProfileSession) -> Dict:
+        """session.status() with every worker's counts added in"""
+        status = session.status()
+        dumps = self._worker_dumps(session)
+        for dump in dumps:
+            status["active"] = status["active"] or dump["active"]
+            for field in ("requests_seen", "requests_profiled", "samples"):
+                status[field] += dump[field]
+        if dumps:
+            status["distinct_stacks"] = len(self._merged_stacks(session, dumps))
+        return status
+
+    def collapsed(self, session: ProfileSession) -> str:
+        """session.collapsed() over every worker's stacks"""
+        stacks = self._merged_stacks(session, self._worker_dumps(session))
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+profiler = SamplingProfiler()
+
+
+class ProfilerMiddleware:
+    """Mark requests selected by the running profile session, so the sampler only runs while they are in flight"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        session = profiler.session
+        if scope["type"] != "http" or session is None or not session.select(scope):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            session.finish()
@@ -0,0 +1,120 @@
+# backend/app/utils/serialization.py
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.orm import Query, Session
+
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response for content that is already plain data
+
+    Rendered with orjson when it is installed, which serializes datetimes
+    and enums natively; the standard library is used otherwise. Nothing is
+    validated, so only return content built to match the response schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class Projection:
+    """
+    Columns of an ORM model selected for a response schema
+
+    List endpoints select exactly the columns their response schema shows,
+    with nested schemas (e.g. a key's reservation) pulled in through outer
+    joins on the relationship of the same name, and read each row straight
+    into the dict the schema would have produced. That skips loading ORM
+    objects and validating them through nested Pydantic models.
+
+    Every schema field must be a column of the model or a nested projection,
+    and each model may appear once in the tree (joins are not aliased).
+
+    Args:
+        schema: Response schema; field names and order are taken from it
+        model: ORM model holding the columns
+        nested: Relationship name -> projection of the related model
+    """
+
+    def __init__(self, schema: Type[BaseModel], model: Any, nested: Optional[Dict[str, "Projection"]] = None):
+        self.schema = schema
+        self.model = model
+        self.nested = nested or {}
+        self.fields = list(schema.model_fields)
+        missing = [name for name in self.fields if name not in self.nested and not hasattr(model, name)]
+        if missing:
+            raise ValueError(f"{model.__name__} has no columns for {schema.__name__} fields {missing}")
+
+    def columns(self, prefix: str = "") -> List[Any]:
+        """Labelled columns in row order; the root's are labelled with their field names"""
+        columns = []
+        for name in self.fields:
+            if name in self.nested:
+                columns.extend(self.nested[name].columns(f"{prefix}{name}__"))
+            else:
+                columns.append(getattr(self.model, name).label(f"{prefix}{name}"))
+        return columns
+
+    def query(self, db: Session) -> Query:
+        """Query over the root model with every nested model outer-joined"""
+        query = db.query(*self.columns()).select_from(self.model)
+        return self._join(query)
+
+    def _join(self, query: Query) -> Query:
+        for name, nested in self.nested.items():
+            query = nested._join(query.outerjoin(getattr(self.model, name)))
+        return query
+
+    def read(self, rows: Sequence[Any]) -> List[Dict[str, Any]]:
+        """Map result rows (in columns() order) to response dicts"""
+        reader = self._reader(0)[0]
+        return [reader(row) for row in rows]
+
+    def _reader(self, start: int):
+        # Resolve every field to a row index once, so reading a row is plain tuple indexing
+        plan = []
+        position = start
+        for name in self.fields:
+            if name in self.nested:
+                reader, position = self.nested[name]._reader(position)
+                plan.append((name, None, reader))
+            else:
+                plan.append((name, position, None))
+                position += 1
+        # An outer join that found nothing leaves the primary key NULL
+        id_index = next((index for name, index, _ in plan if name == "id"), None)
+
+        def read(row) -> Optional[Dict[str, Any]]:
+            if id_index is not None and row[id_index] is None:
+                return None
+            return {name: row[index] if reader is None else reader(row) for name, index, reader in plan}
+
+        return read, position
+
+
+def list_response(content: List[Dict[str, Any]], next_cursor: Optional[str] = None) -> FastJSONResponse:
+    """FastJSONResponse for a page of a list endpoint, with its X-Next-Cursor header"""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return FastJSONResponse(content, headers=headers)
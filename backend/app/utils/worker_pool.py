@@ -0,0 +1,90 @@
+# backend/app/utils/worker_pool.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.utils.metrics import counter, gauge
+
+worker_pool_queue_depth = gauge(
+    "worker_pool_queue_depth",
+    "Jobs waiting for a free worker, by pool",
+    ("pool",),
+)
+worker_pool_in_progress = gauge(
+    "worker_pool_in_progress",
+    "Jobs currently running, by pool",
+    ("pool",),
+)
+worker_pool_rejected = counter(
+    "worker_pool_rejected_total",
+    "Jobs rejected because the pool queue was full, by pool",
+    ("pool",),
+)
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a bounded worker pool has no room for another job"""
+
+
+class BoundedWorkerPool:
+    """
+    Dedicated thread pool for CPU-heavy work with a bounded backlog
+
+    Keeps slow jobs (e.g. bcrypt) off the event loop and off the shared
+    request threadpool, so they can't starve latency-sensitive endpoints.
+    Jobs beyond max_queue waiting jobs are rejected instead of queued.
+
+    Args:
+        name: Pool name, used in metric labels and thread names
+        max_workers: Number of worker threads
+        max_queue: Maximum number of jobs waiting for a worker
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return self._pending
+
+    def _run(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+            worker_pool_queue_depth.set(self._pending, pool=self.name)
+            worker_pool_in_progress.set(self._running, pool=self.name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                worker_pool_in_progress.set(self._running, pool=self.name)
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs):
+        """Submit a job, raising PoolSaturatedError if the backlog is full"""
+        with self._lock:
+            # Only jobs that can't start right away count against the queue
+            if self._pending + self._running >= self.max_workers + self.max_queue:
+                worker_pool_rejected.inc(pool=self.name)
+                raise PoolSaturatedError(f"{self.name} pool is saturated")
+            self._pending += 1
+            worker_pool_queue_depth.set(self._pending, pool=self.name)
+        return self._executor.submit(self._run, fn, args, kwargs)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a job on the pool and await its result"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def run_sync(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a job on the pool from synchronous code and wait for its result"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,150 @@
+# backend/benchmarks/fixtures.py
+"""
+Fixtures for the hot path benchmarks, in the spirit of tests/conftest.py
+
+Everything runs against the application's own engine, so import this module
+only after SQLALCHEMY_DATABASE_URI points at the benchmark database
+(hot_paths.py does that for you).
+"""
+import os
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.config import settings
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.models.base import Base
+from app.models.digital_key import DigitalKey, KeyStatus
+from app.models.hotel import Hotel
+from app.models.reservation import Reservation, ReservationStatus
+from app.models.room import Room
+from app.services import wallet_service
+from benchmarks.generate_data import EMAIL_DOMAIN, STAFF_PASSWORD, GeneratorConfig, generate
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+STAFF_EMAIL = f"staff0@{EMAIL_DOMAIN}"
+
+
+@dataclass
+class SeededHotel:
+    hotel_id: str
+    # (key_uuid, lock_id) of keys valid right now
+    active_keys: List[Tuple[str, str]] = field(default_factory=list)
+    active_key_ids: List[str] = field(default_factory=list)
+    # Keys whose stay is over, used to stage expirations
+    past_key_ids: List[str] = field(default_factory=list)
+    upcoming_reservation_ids: List[str] = field(default_factory=list)
+
+
+def create_schema() -> None:
+    Base.metadata.create_all(bind=engine)
+
+
+def drop_schema() -> None:
+    Base.metadata.drop_all(bind=engine)
+
+
+def seed_hotel(config: GeneratorConfig) -> SeededHotel:
+    """Load a synthetic dataset with benchmarks.generate_data and collect the IDs the cases use"""
+    with engine.connect() as connection:
+        generate(connection, config)
+
+    db = SessionLocal()
+    try:
+        seeded = SeededHotel(hotel_id=db.query(Hotel.id).filter(Hotel.email == f"hotel0@{EMAIL_DOMAIN}").scalar())
+        keys = db.query(
+            DigitalKey.id, DigitalKey.key_uuid, DigitalKey.status, DigitalKey.valid_until, Room.nfc_lock_id
+        ).join(Reservation, Reservation.id == DigitalKey.reservation_id).join(Room, Room.id == Reservation.room_id).filter(
+            Room.hotel_id == seeded.hotel_id
+        ).order_by(DigitalKey.id)
+        # Stored times and the anchor are UTC; an hour of margin keeps keys valid for the whole run
+        still_valid = config.anchor + timedelta(hours=1)
+        for key_id, key_uuid, status, valid_until, lock_id in keys:
+            if status == KeyStatus.ACTIVE and valid_until > still_valid:
+                seeded.active_keys.append((key_uuid, lock_id))
+                seeded.active_key_ids.append(key_id)
+            elif status == KeyStatus.EXPIRED:
+                seeded.past_key_ids.append(key_id)
+        upcoming = db.query(Reservation.id).join(Room, Room.id == Reservation.room_id).filter(
+            Room.hotel_id == seeded.hotel_id, Reservation.status == ReservationStatus.CONFIRMED
+        ).order_by(Reservation.id)
+        seeded.upcoming_reservation_ids = [reservation_id for reservation_id, in upcoming]
+        return seeded
+    finally:
+        db.close()
+
+
+def staff_client() -> TestClient:
+    """Client authenticated as the first hotel's staff account; the lifespan is not run"""
+    client = TestClient(app)
+    response = client.post(f"{settings.API_V1_STR}/auth/login", data={"username": STAFF_EMAIL, "password": STAFF_PASSWORD})
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+    return client
+
+
+@contextmanager
+def scratch_workdir() -> Iterator[Path]:
+    """Run from a temporary directory so generated passes don't land in the tree"""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        static_dir = Path(workdir) / "app" / "static"
+        static_dir.mkdir(parents=True)
+        (static_dir / "pass_images").symlink_to(BACKEND_DIR / "app" / "static" / "pass_images")
+        os.chdir(workdir)
+        try:
+            yield Path(workdir)
+        finally:
+            os.chdir(previous)
+
+
+@contextmanager
+def stub_signer(workdir: Path) -> Iterator[None]:
+    """
+    Replace the OpenSSL pass signing step with a fixed signature
+
+    Everything else in Apple pass creation (pass.json, manifest, zip) still
+    runs. Dummy certificate files satisfy the existence check.
+    """
+    paths = {}
+    for name in ("APPLE_CERT_PATH", "APPLE_KEY_PATH", "APPLE_WWDR_PATH"):
+        path = workdir / f"{name.lower()}.pem"
+        path.write_text("benchmark stub\n")
+        paths[name] = getattr(settings, name)
+        setattr(settings, name, str(path))
+
+    def fake_run(cmd, check=False, **kwargs):
+        Path(cmd[cmd.index("-out") + 1]).write_bytes(b"\x30\x80benchmark-signature")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    real_run = wallet_service.subprocess.run
+    wallet_service.subprocess.run = fake_run
+    try:
+        yield
+    finally:
+        wallet_service.subprocess.run = real_run
+        for name, value in paths.items():
+            setattr(settings, name, value)
+
+
+class QueryCounter:
+    """Count SQL statements executed on the application engine"""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(engine, "after_cursor_execute", self._count)
+
+    def _count(self, *args) -> None:
+        self.count += 1
+
+    def close(self) -> None:
+        event.remove(engine, "after_cursor_execute", self._count)
+
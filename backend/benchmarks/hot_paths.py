@@ -0,0 +1,256 @@
+# backend/benchmarks/hot_paths.py
+"""
+Hot path benchmarks
+
+Loads a synthetic hotel (benchmarks.generate_data: rooms, guests, past,
+current and upcoming reservations, keys and their events) into a scratch
+database, then times the backend's hot paths in-process, with no network in
+the way:
+
+    verify_key              POST /verify/key for a key valid right now
+    read_available_rooms    GET /rooms/available across the whole hotel
+    create_digital_key      POST /keys (Apple pass, OpenSSL signing stubbed)
+    get_changed_passes      GET /passes/v1/passes/{pass_type_id}
+    expire_outdated_keys    the scheduler job, with fresh expired keys staged
+                            (untimed) before every run
+    read_key_events         GET /keys/{key_id}/events for a key with history
+
+Each case reports latency percentiles, throughput and SQL statements per
+operation as JSON, so CI can keep a baseline and fail on regressions.
+
+Usage (from backend/):
+    python -m benchmarks.hot_paths --output results.json
+    python -m benchmarks.hot_paths --baseline baseline.json --max-regression 0.25
+    python -m benchmarks.hot_paths --database-url postgresql://... --rooms 2000
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.login_load import percentile, summarize
+
+CASES = (
+    "verify_key",
+    "read_available_rooms",
+    "create_digital_key",
+    "get_changed_passes",
+    "expire_outdated_keys",
+    "read_key_events",
+)
+# Keys staged for each expire_outdated_keys run
+EXPIRE_BATCH = 20
+
+
+class Case:
+    """One benchmark: an operation to time and an optional untimed setup run before each call"""
+
+    def __init__(self, name: str, run: Callable[[int], None], setup: Optional[Callable[[int], None]] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+
+
+def check(response, expected: int = 200):
+    if response.status_code != expected:
+        raise RuntimeError(f"{response.request.method} {response.request.url} returned {response.status_code}: {response.text[:200]}")
+    return response
+
+
+def build_cases(seeded, client) -> List[Case]:
+    from app.config import settings
+    from app.db.session import SessionLocal
+    from app.models.digital_key import DigitalKey, KeyStatus
+    from app.services.key_service import expire_outdated_keys
+
+    api = settings.API_V1_STR
+    today = datetime.now(timezone.utc).date()
+    stay = {"hotel_id": seeded.hotel_id, "check_in": str(today), "check_out": str(today + timedelta(days=3))}
+    since = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    active_keys = seeded.active_keys
+    active_key_ids = seeded.active_key_ids
+    reservations = seeded.upcoming_reservation_ids
+    past_key_ids = seeded.past_key_ids
+
+    def verify_key(index: int) -> None:
+        key_uuid, lock_id = active_keys[index % len(active_keys)]
+        body = check(client.post(f"{api}/verify/key", json={"key_uuid": key_uuid, "lock_id": lock_id})).json()
+        if not body["is_valid"]:
+            raise RuntimeError(f"Seeded key {key_uuid} was refused: {body['message']}")
+
+    def read_available_rooms(index: int) -> None:
+        check(client.get(f"{api}/rooms/available", params=stay))
+
+    def create_digital_key(index: int) -> None:
+        reservation_id = reservations[index % len(reservations)]
+        check(client.post(f"{api}/keys", json={"reservation_id": reservation_id, "pass_type": "apple"}), 201)
+
+    def get_changed_passes(index: int) -> None:
+        check(client.get(f"{api}/passes/v1/passes/{settings.APPLE_PASS_TYPE_ID}", params={"passesUpdatedSince": since}))
+
+    def stage_expired_keys(index: int) -> None:
+        start = index * EXPIRE_BATCH % max(len(past_key_ids) - EXPIRE_BATCH, 1)
+        db = SessionLocal()
+        try:
+            db.query(DigitalKey).filter(DigitalKey.id.in_(past_key_ids[start:start + EXPIRE_BATCH])).update(
+                {DigitalKey.is_active: True, DigitalKey.status: KeyStatus.ACTIVE}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def run_expire_outdated_keys(index: int) -> None:
+        db = SessionLocal()
+        try:
+            expire_outdated_keys(db)
+        finally:
+            db.close()
+
+    def read_key_events(index: int) -> None:
+        check(client.get(f"{api}/keys/{active_key_ids[index % len(active_key_ids)]}/events"))
+
+    return [
+        Case("verify_key", verify_key),
+        Case("read_available_rooms", read_available_rooms),
+        Case("create_digital_key", create_digital_key),
+        Case("get_changed_passes", get_changed_passes),
+        Case("expire_outdated_keys", run_expire_outdated_keys, setup=stage_expired_keys),
+        Case("read_key_events", read_key_events),
+    ]
+
+
+def measure(case: Case, counter, iterations: int, warmup: int) -> Dict[str, float]:
+    for index in range(warmup):
+        if case.setup:
+            case.setup(index)
+        case.run(index)
+
+    samples = []
+    queries = 0
+    for index in range(warmup, warmup + iterations):
+        if case.setup:
+            case.setup(index)
+        counter.count = 0
+        start = time.perf_counter()
+        case.run(index)
+        samples.append((time.perf_counter() - start) * 1000)
+        queries += counter.count
+
+    result = summarize(samples)
+    result.update({
+        "p95_ms": percentile(samples, 95),
+        "min_ms": min(samples),
+        "ops_per_sec": len(samples) / (sum(samples) / 1000) if sum(samples) else 0.0,
+        "queries_per_op": queries / len(samples),
+    })
+    return {name: round(value, 3) for name, value in result.items()}
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], max_regression: float) -> List[str]:
+    """Cases whose p50 latency or query count grew by more than max_regression over the baseline"""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for metric in ("p50_ms", "queries_per_op"):
+            old, new = before.get(metric), result[metric]
+            if old and new > old * (1 + max_regression):
+                regressions.append(f"{name}: {metric} {old} -> {new} (+{100 * (new / old - 1):.0f}%)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file; must be an empty database")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--guests", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=60, help="Days of history")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--case", action="append", choices=CASES, help="Run only these cases (repeatable)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="JSON report to compare against; exit 1 on regression")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed growth over the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # The app builds its engine at import time, so point it at the scratch database first
+    scratch = None
+    if not args.database_url:
+        scratch = tempfile.TemporaryDirectory(prefix="hot-paths-")
+        args.database_url = f"sqlite:///{os.path.join(scratch.name, 'hot_paths.db')}"
+    os.environ["SQLALCHEMY_DATABASE_URI"] = args.database_url
+
+    from benchmarks import fixtures
+
+    # Per-call logs (including the expected "no registered devices" warnings) would flood the console
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    # Anchored at the real current time, since the endpoints compare against it
+    config = fixtures.GeneratorConfig(
+        hotels=1, rooms_per_hotel=args.rooms, guests=args.guests, days=args.days, future_days=30, seed=args.seed,
+        anchor=datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    fixtures.create_schema()
+    seed_start = time.perf_counter()
+    seeded = fixtures.seed_hotel(config)
+    seed_seconds = time.perf_counter() - seed_start
+    print(f"Seeded {args.rooms} rooms in {seed_seconds:.1f}s", file=sys.stderr)
+
+    results = {}
+    counter = fixtures.QueryCounter()
+    try:
+        with fixtures.scratch_workdir() as workdir, fixtures.stub_signer(workdir):
+            client = fixtures.staff_client()
+            for case in build_cases(seeded, client):
+                if args.case and case.name not in args.case:
+                    continue
+                results[case.name] = measure(case, counter, args.iterations, args.warmup)
+                print(f"  {case.name:<22} p50 {results[case.name]['p50_ms']:8.2f}ms "
+                      f"{results[case.name]['queries_per_op']:6.1f} queries/op", file=sys.stderr)
+    finally:
+        counter.close()
+        if scratch is not None:
+            fixtures.engine.dispose()
+            scratch.cleanup()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": fixtures.engine.dialect.name,
+            "seed": {**asdict(config), "anchor": config.anchor.isoformat()},
+            "seed_seconds": round(seed_seconds, 3),
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+        },
+        "results": results,
+    }
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(rendered + "\n")
+    else:
+        print(rendered)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# backend/benchmarks/keyevent_storage.py
+"""
+Key event storage benchmark
+
+Seeds the same synthetic events into a table using the old free-text layout
+(VARCHAR event_type/status/details) and one using the compact layout
+(SMALLINT codes, JSON/JSONB details), then reports table and index size per
+row for each.
+
+Usage (from backend/):
+    python -m benchmarks.keyevent_storage --rows 100000
+    python -m benchmarks.keyevent_storage --database-url postgresql://... --rows 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, create_engine, text
+
+from app.db.types import CodedString, StructuredDetails
+from app.models.key_event import EVENT_STATUS_CODES, EVENT_TYPE_CODES, UNKNOWN_EVENT_TYPE
+
+BATCH_SIZE = 5000
+
+# Rough mix of a hotel's event stream: mostly door taps
+EVENT_MIX = [
+    ("physical_access_attempt", 0.05),
+    ("physical_access_granted", 0.6),
+    ("physical_access_denied", 0.1),
+    ("key_created", 0.05),
+    ("key_email_sent", 0.05),
+    ("key_sms_sent", 0.05),
+    ("push_notification_sent", 0.05),
+    ("wallet_pass_updated", 0.05),
+]
+
+
+def build_tables(metadata: MetaData) -> Tuple[Table, Table]:
+    def columns(event_type, status, details):
+        return [
+            Column("id", String, primary_key=True),
+            Column("created_at", DateTime, nullable=False),
+            Column("updated_at", DateTime, nullable=False),
+            Column("key_id", String),
+            Column("event_type", event_type, nullable=False),
+            Column("device_info", String),
+            Column("timestamp", DateTime, nullable=False),
+            Column("location", String),
+            Column("lock_id", String),
+            Column("status", status),
+            Column("details", details),
+        ]
+
+    legacy = Table("bench_keyevent_legacy", metadata, *columns(String, String, String))
+    compact = Table(
+        "bench_keyevent_compact", metadata,
+        *columns(CodedString(EVENT_TYPE_CODES, UNKNOWN_EVENT_TYPE), CodedString(EVENT_STATUS_CODES), StructuredDetails),
+    )
+    for table in (legacy, compact):
+        # Same secondary indexes as keyevent
+        Index(f"ix_{table.name}_key_id_timestamp", table.c.key_id, table.c.timestamp.desc())
+        Index(f"ix_{table.name}_event_type_timestamp", table.c.event_type, table.c.timestamp)
+        Index(f"ix_{table.name}_created_at_id", table.c.created_at, table.c.id)
+    return legacy, compact
+
+
+def generate_events(rows: int, seed: int) -> Iterator[Tuple[Dict, Dict]]:
+    """Yield the same event as (legacy row, compact row)"""
+    rng = random.Random(seed)
+    names, weights = zip(*EVENT_MIX)
+    keys = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(max(1, rows // 20))]
+    start = datetime(2025, 1, 1)
+
+    for index in range(rows):
+        event_type = rng.choices(names, weights)[0]
+        timestamp = start + timedelta(seconds=index * 7)
+        room_number = str(100 + rng.randrange(400))
+        lock_id = f"LOCK-{room_number}"
+        if event_type == "physical_access_granted":
+            status = "success"
+            legacy_details = f"Access granted to room {room_number} for Jane Doe"
+            details = None
+        elif event_type == "physical_access_denied":
+            status = "failure"
+            legacy_details = "Key outside validity period"
+            details = {"reason": "outside_validity_period"}
+        elif event_type == "physical_access_attempt":
+            status = "pending"
+            legacy_details = f"Lock ID: {lock_id}"
+            details = None
+        else:
+            status = "success"
+            legacy_details = f"Email sent to guest{index}@example.com for apple pass"
+            details = {"email": f"guest{index}@example.com", "pass_type": "apple"}
+
+        common = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "created_at": timestamp,
+            "updated_at": timestamp,
+            "key_id": rng.choice(keys),
+            "device_info": "NFC reader",
+            "timestamp": timestamp,
+            "location": None,
+            "lock_id": lock_id,
+        }
+        yield (
+            {**common, "event_type": event_type, "status": status, "details": legacy_details},
+            {**common, "event_type": event_type, "status": status, "details": details},
+        )
+
+
+def seed(engine, legacy: Table, compact: Table, rows: int, seed_value: int) -> None:
+    legacy_batch: List[Dict] = []
+    compact_batch: List[Dict] = []
+    with engine.begin() as connection:
+        for legacy_row, compact_row in generate_events(rows, seed_value):
+            legacy_batch.append(legacy_row)
+            compact_batch.append(compact_row)
+            if len(legacy_batch) >= BATCH_SIZE:
+                connection.execute(legacy.insert(), legacy_batch)
+                connection.execute(compact.insert(), compact_batch)
+                legacy_batch, compact_batch = [], []
+        if legacy_batch:
+            connection.execute(legacy.insert(), legacy_batch)
+            connection.execute(compact.insert(), compact_batch)
+
+
+def measure(engine, table: Table) -> Dict[str, int]:
+    """Heap and index bytes for a table"""
+    index_names = [index.name for index in table.indexes]
+    # VACUUM can't run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execute(text(f"VACUUM ANALYZE {table.name}"))
+            heap = connection.execute(text("SELECT pg_relation_size(:name)"), {"name": table.name}).scalar()
+            indexes = {
+                name: connection.execute(text("SELECT pg_relation_size(:name)"), {"name": name}).scalar()
+                for name in index_names
+            }
+            row_width = connection.execute(text(f"SELECT avg(pg_column_size(t.*)) FROM {table.name} t")).scalar()
+        elif engine.dialect.name == "sqlite":
+            sizes = dict(connection.execute(text("SELECT name, sum(pgsize) FROM dbstat GROUP BY name")).all())
+            heap = sizes.get(table.name, 0)
+            indexes = {name: sizes.get(name, 0) for name in index_names}
+            row_width = None
+        else:
+            raise SystemExit(f"Unsupported database: {engine.dialect.name}")
+
+    return {"heap": heap, "row_width": row_width, **indexes}
+
+
+def report(label: str, table: Table, sizes: Dict[str, int], rows: int) -> None:
+    print(f"{label}:")
+    print(f"  {'heap':<22} {sizes['heap'] / rows:8.1f} bytes/row")
+    if sizes["row_width"] is not None:
+        print(f"  {'avg tuple':<22} {float(sizes['row_width']):8.1f} bytes/row")
+    for name, size in sizes.items():
+        if name.startswith("ix_"):
+            print(f"  {name[len(f'ix_{table.name}_'):]:<22} {size / rows:8.1f} bytes/row")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'keyevent_storage.db')}"
+    engine = create_engine(url)
+    metadata = MetaData()
+    legacy, compact = build_tables(metadata)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    try:
+        seed(engine, legacy, compact, args.rows, args.seed)
+        legacy_sizes = measure(engine, legacy)
+        compact_sizes = measure(engine, compact)
+    finally:
+        metadata.drop_all(engine)
+
+    print(f"{args.rows} events on {engine.dialect.name}")
+    report("legacy (varchar)", legacy, legacy_sizes, args.rows)
+    report("compact (codes + json)", compact, compact_sizes, args.rows)
+    total_legacy = sum(value for name, value in legacy_sizes.items() if name != "row_width")
+    total_compact = sum(value for name, value in compact_sizes.items() if name != "row_width")
+    print(f"total: {total_legacy / args.rows:.1f} -> {total_compact / args.rows:.1f} bytes/row "
+          f"({100 * (1 - total_compact / total_legacy):.0f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
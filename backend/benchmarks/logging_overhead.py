@@ -0,0 +1,139 @@
+# backend/benchmarks/logging_overhead.py
+"""
+Logging overhead benchmark
+
+Serves a small endpoint that logs like the device log handler (several INFO
+lines per request) and measures request latency with the previous setup
+(console and rotating file handlers called in the request thread) and with
+the queued setup from app.utils.log_config. --disk-latency-ms adds a delay to
+every file write to stand in for a slow or contended disk.
+
+Usage (from backend/):
+    python -m benchmarks.logging_overhead --requests 2000 --lines 5
+    python -m benchmarks.logging_overhead --disk-latency-ms 2 --format json
+"""
+import argparse
+import asyncio
+import logging
+import logging.handlers
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from app.utils.log_config import QUEUED_LOGGERS, TEXT_FORMAT, configure_logging, stop_listener
+from benchmarks.login_load import summarize
+
+logger = logging.getLogger("app.bench")
+
+
+def build_app(lines: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/log")
+    def log_lines() -> Dict[str, int]:
+        for index in range(lines):
+            logger.info(f"Processing device log line {index} for pass.com.example serial number: ABC-{index}")
+        return {"lines": lines}
+
+    return app
+
+
+def slow_down_file_writes(delay: float) -> None:
+    """Make every RotatingFileHandler write take at least delay seconds"""
+    emit = logging.handlers.RotatingFileHandler.emit
+
+    def slow_emit(self, record):
+        time.sleep(delay)
+        emit(self, record)
+
+    logging.handlers.RotatingFileHandler.emit = slow_emit
+
+
+def configure_sync(log_dir: str, devnull) -> List[logging.Handler]:
+    """The previous setup: both handlers run in the thread that logs"""
+    formatter = logging.Formatter(TEXT_FORMAT)
+    handlers = [
+        logging.StreamHandler(devnull),
+        logging.handlers.RotatingFileHandler(os.path.join(log_dir, "app.log"), maxBytes=10485760, backupCount=5),
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    for name in QUEUED_LOGGERS:
+        target = logging.getLogger(name)
+        for existing in list(target.handlers):
+            target.removeHandler(existing)
+        for handler in handlers:
+            target.addHandler(handler)
+        target.setLevel(logging.INFO)
+        target.propagate = False
+    return handlers
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> Dict[str, float]:
+    samples: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/log")
+                samples.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    result = summarize(samples)
+    result["requests_per_s"] = requests / elapsed
+    return result
+
+
+def main(args) -> None:
+    if args.disk_latency_ms:
+        slow_down_file_writes(args.disk_latency_ms / 1000)
+    app = build_app(args.lines)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        handlers = configure_sync(log_dir, devnull)
+        results["synchronous handlers"] = asyncio.run(measure(app, args.requests, args.concurrency))
+        for handler in handlers:
+            handler.close()
+
+        listener = configure_logging(log_dir, fmt=args.format, queue_size=args.queue_size)
+        for handler in listener.handlers:
+            if type(handler) is logging.StreamHandler:
+                handler.setStream(devnull)
+        results["queue + listener"] = asyncio.run(measure(app, args.requests, args.concurrency))
+        drain_start = time.perf_counter()
+        stop_listener(listener)
+        drain_ms = (time.perf_counter() - drain_start) * 1000
+        for handler in listener.handlers:
+            handler.close()
+
+    print(f"{args.requests} requests, {args.lines} log lines each, concurrency {args.concurrency}, "
+          f"disk latency {args.disk_latency_ms:g}ms")
+    for label, result in results.items():
+        print(
+            f"{label:>22}: mean={result['mean_ms']:.2f}ms p50={result['p50_ms']:.2f}ms "
+            f"p99={result['p99_ms']:.2f}ms max={result['max_ms']:.2f}ms {result['requests_per_s']:.0f} req/s"
+        )
+    print(f"{'queue drained in':>22}: {drain_ms:.0f}ms after the last response")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=5, help="INFO lines logged per request")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--disk-latency-ms", type=float, default=0.0, help="Extra delay per file write")
+    parser.add_argument("--format", choices=["text", "json"], default="text", help="Queued output format")
+    parser.add_argument("--queue-size", type=int, default=0, help="Log queue size for the queued run (0 is unbounded)")
+    main(parser.parse_args())
@@ -0,0 +1,114 @@
+# backend/benchmarks/login_load.py
+"""
+Login burst load test
+
+Measures /verify/key latency on its own, then again while a burst of
+concurrent logins runs, to check that bcrypt work no longer delays lock
+verification.
+
+Usage:
+    python benchmarks/login_load.py --base-url http://localhost:8000/api/v1 \\
+        --email staff@example.com --password secret \\
+        --key-uuid <active key uuid> --lock-id <lock id>
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) if samples else 0.0,
+        "p50_ms": percentile(samples, 50),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": max(samples) if samples else 0.0,
+    }
+
+
+async def verify_loop(client: httpx.AsyncClient, args, stop: asyncio.Event, samples: List[float]) -> None:
+    """Issue verification requests back to back until stopped"""
+    payload = {"key_uuid": args.key_uuid, "lock_id": args.lock_id, "device_info": "login_load benchmark"}
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.post("/verify/key", json=payload)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+        await asyncio.sleep(args.verify_interval)
+
+
+async def login_burst(client: httpx.AsyncClient, args) -> Dict[str, int]:
+    """Fire args.logins logins with at most args.concurrency in flight"""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    statuses: Dict[str, int] = {}
+
+    async def login():
+        async with semaphore:
+            response = await client.post(
+                "/auth/login", data={"username": args.email, "password": args.password}
+            )
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    await asyncio.gather(*(login() for _ in range(args.logins)))
+    return statuses
+
+
+async def measure(client: httpx.AsyncClient, args, with_logins: bool) -> Dict[str, object]:
+    samples: List[float] = []
+    stop = asyncio.Event()
+    verifier = asyncio.create_task(verify_loop(client, args, stop, samples))
+
+    statuses = None
+    if with_logins:
+        statuses = await login_burst(client, args)
+    else:
+        await asyncio.sleep(args.baseline_seconds)
+
+    stop.set()
+    await verifier
+    result = {"verify": summarize(samples)}
+    if statuses is not None:
+        result["login_statuses"] = statuses
+    return result
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        baseline = await measure(client, args, with_logins=False)
+        under_load = await measure(client, args, with_logins=True)
+
+    for label, result in (("baseline", baseline), ("during login burst", under_load)):
+        verify = result["verify"]
+        print(
+            f"{label:>20}: n={verify['count']} mean={verify['mean_ms']:.1f}ms "
+            f"p50={verify['p50_ms']:.1f}ms p99={verify['p99_ms']:.1f}ms max={verify['max_ms']:.1f}ms"
+        )
+    print(f"{'login statuses':>20}: {under_load['login_statuses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--key-uuid", required=True)
+    parser.add_argument("--lock-id", required=True)
+    parser.add_argument("--logins", type=int, default=200, help="Number of logins in the burst")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent logins in flight")
+    parser.add_argument("--verify-interval", type=float, default=0.01, help="Pause between verifications (s)")
+    parser.add_argument("--baseline-seconds", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
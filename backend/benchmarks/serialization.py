@@ -0,0 +1,187 @@
+# backend/benchmarks/serialization.py
+"""
+List response serialization benchmark
+
+Loads a synthetic hotel into a scratch database and builds pages of the
+key and reservation lists two ways:
+
+    orm         ORM query with joinedload, validated through the nested
+                response schema and rendered with JSONResponse (what
+                FastAPI does for a response_model)
+    projection  column-projected query read straight into response dicts
+                and rendered with FastJSONResponse (what the endpoints do)
+
+Each is timed as fetch (query and row loading) and serialize (validation
+and JSON rendering), and reported as rows/sec, as JSON.
+
+Usage (from backend/):
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --page-size 100 --iterations 50 --output serialization.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+
+def build_paths(page_size: int) -> Dict[str, Tuple[Callable, Callable]]:
+    """(fetch, serialize) pairs per list and path"""
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from sqlalchemy.orm import joinedload
+
+    from app.models.digital_key import DigitalKey
+    from app.models.reservation import Reservation
+    from app.models.room import Room
+    from app.schemas.digital_key import DigitalKey as DigitalKeySchema
+    from app.schemas.reservation import Reservation as ReservationSchema
+    from app.services.listing_service import key_projection, reservation_projection
+    from app.utils.serialization import FastJSONResponse
+
+    key_adapter = TypeAdapter(List[DigitalKeySchema])
+    reservation_adapter = TypeAdapter(List[ReservationSchema])
+
+    def orm_serializer(adapter):
+        def serialize(rows) -> bytes:
+            validated = adapter.validate_python(rows, from_attributes=True)
+            return JSONResponse(adapter.dump_python(validated, mode="json")).body
+        return serialize
+
+    def projection_serializer(projection):
+        def serialize(rows) -> bytes:
+            return FastJSONResponse(projection.read(rows)).body
+        return serialize
+
+    def page(query, *order_by):
+        return query.order_by(*(column.desc() for column in order_by)).limit(page_size).all()
+
+    return {
+        "keys/orm": (
+            lambda db: page(db.query(DigitalKey).options(
+                joinedload(DigitalKey.reservation).joinedload(Reservation.user)
+            ), DigitalKey.created_at, DigitalKey.id),
+            orm_serializer(key_adapter),
+        ),
+        "keys/projection": (
+            lambda db: page(key_projection.query(db), DigitalKey.created_at, DigitalKey.id),
+            projection_serializer(key_projection),
+        ),
+        "reservations/orm": (
+            lambda db: page(db.query(Reservation).options(
+                joinedload(Reservation.room).joinedload(Room.hotel), joinedload(Reservation.user)
+            ), Reservation.check_in, Reservation.id),
+            orm_serializer(reservation_adapter),
+        ),
+        "reservations/projection": (
+            lambda db: page(reservation_projection.query(db), Reservation.check_in, Reservation.id),
+            projection_serializer(reservation_projection),
+        ),
+    }
+
+
+def measure(fetch: Callable, serialize: Callable, iterations: int, warmup: int) -> Dict[str, float]:
+    from app.db.session import SessionLocal
+
+    fetch_ms, serialize_ms = [], []
+    rows = 0
+    for index in range(warmup + iterations):
+        # A fresh session each time, so ORM rows are really loaded (and lazy loads really run)
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            page = fetch(db)
+            fetched = time.perf_counter()
+            body = serialize(page)
+            done = time.perf_counter()
+        finally:
+            db.close()
+        if not body.startswith(b"["):
+            raise RuntimeError(f"Unexpected body {body[:80]!r}")
+        if index >= warmup:
+            fetch_ms.append((fetched - start) * 1000)
+            serialize_ms.append((done - fetched) * 1000)
+            rows = len(page)
+
+    fetch_p50, serialize_p50 = statistics.median(fetch_ms), statistics.median(serialize_ms)
+    result = {
+        "rows": rows,
+        "fetch_p50_ms": fetch_p50,
+        "serialize_p50_ms": serialize_p50,
+        "rows_per_sec": rows / ((fetch_p50 + serialize_p50) / 1000),
+        "serialize_rows_per_sec": rows / (serialize_p50 / 1000),
+    }
+    return {name: round(value, 3) for name, value in result.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file; must be an empty database")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--guests", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=60, help="Days of history")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--page-size", type=int, default=500, help="Rows per page (the API caps pages at 500)")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    # The app builds its engine at import time, so point it at the scratch database first
+    scratch = None
+    if not args.database_url:
+        scratch = tempfile.TemporaryDirectory(prefix="serialization-")
+        args.database_url = f"sqlite:///{os.path.join(scratch.name, 'serialization.db')}"
+    os.environ["SQLALCHEMY_DATABASE_URI"] = args.database_url
+
+    from benchmarks import fixtures
+    from app.utils import serialization
+
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    config = fixtures.GeneratorConfig(
+        hotels=1, rooms_per_hotel=args.rooms, guests=args.guests, days=args.days, future_days=30, seed=args.seed,
+        anchor=datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+    fixtures.create_schema()
+    fixtures.seed_hotel(config)
+
+    results = {}
+    try:
+        for name, (fetch, serialize) in build_paths(args.page_size).items():
+            results[name] = measure(fetch, serialize, args.iterations, args.warmup)
+            print(f"  {name:<24} {results[name]['rows_per_sec']:10.0f} rows/s "
+                  f"(serialize {results[name]['serialize_rows_per_sec']:.0f} rows/s)", file=sys.stderr)
+    finally:
+        if scratch is not None:
+            fixtures.engine.dispose()
+            scratch.cleanup()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": fixtures.engine.dialect.name,
+            "orjson": serialization.orjson is not None,
+            "page_size": args.page_size,
+            "iterations": args.iterations,
+        },
+        "results": results,
+    }
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(rendered + "\n")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# backend/benchmarks/startup_time.py
+"""
+Application startup benchmark
+
+Starts the application in fresh interpreters and times each phase
+separately:
+
+    interpreter        python itself, up to the first line of the benchmark
+    import             import app.main (settings, models, routers, middleware)
+    lifespan_startup   the lifespan up to the point the app accepts requests
+    first_request      GET /health straight through the ASGI app
+    lifespan_shutdown  the lifespan after the last request
+
+Each phase is reported as the median and minimum over --runs, as JSON.
+--top-imports lists the modules with the most import time of their own
+(python -X importtime), which is where to look when the import phase grows.
+
+The app runs against a scratch SQLite database unless --database-url is
+given; background startup jobs are cancelled at shutdown.
+
+Usage (from backend/):
+    python -m benchmarks.startup_time --runs 10
+    python -m benchmarks.startup_time --top-imports 15 --output startup.json
+    python -m benchmarks.startup_time --auto-create-tables
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+PHASES = ("interpreter", "import", "lifespan_startup", "first_request", "lifespan_shutdown")
+
+
+async def _get(app, path: str) -> int:
+    """Send one GET request through the ASGI app and return the status code"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+    }
+    status = {}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status["code"] = message["status"]
+
+    await app(scope, receive, send)
+    return status["code"]
+
+
+def child(result_path: str, process_start: float) -> None:
+    """Runs in the measured interpreter: import the app, run its lifespan, write the timings"""
+    timings = {"interpreter": (time.perf_counter() - process_start) * 1000}
+
+    start = time.perf_counter()
+    from app.main import app
+    timings["import"] = (time.perf_counter() - start) * 1000
+
+    async def run() -> None:
+        lifespan = app.router.lifespan_context(app)
+        start = time.perf_counter()
+        await lifespan.__aenter__()
+        timings["lifespan_startup"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        status = await _get(app, "/health")
+        timings["first_request"] = (time.perf_counter() - start) * 1000
+        if status != 200:
+            raise RuntimeError(f"GET /health returned {status}")
+
+        start = time.perf_counter()
+        await lifespan.__aexit__(None, None, None)
+        timings["lifespan_shutdown"] = (time.perf_counter() - start) * 1000
+
+    asyncio.run(run())
+    with open(result_path, "w") as result_file:
+        json.dump(timings, result_file)
+
+
+def run_once(env: Dict[str, str]) -> Dict[str, float]:
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as result_file:
+        result_path = result_file.name
+    try:
+        # time.perf_counter() is system-wide on Linux and macOS, so the child can subtract our start
+        process_start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup_time", "--child", result_path, str(process_start)],
+            env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        wall = (time.perf_counter() - process_start) * 1000
+        with open(result_path) as result:
+            timings = json.load(result)
+    finally:
+        os.unlink(result_path)
+    timings["total_wall"] = wall
+    return timings
+
+
+def top_imports(env: Dict[str, str], count: int) -> List[Tuple[str, float, float]]:
+    """Modules with the most self import time in one `import app.main`, as (module, self ms, cumulative ms)"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, check=True, capture_output=True, text=True,
+    ).stderr
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(own) / 1000, int(cumulative) / 1000))
+    return sorted(modules, key=lambda module: module[1], reverse=True)[:count]
+
+
+def main() -> None:
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], float(sys.argv[3]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--auto-create-tables", action="store_true", help="Include create_all in the lifespan")
+    parser.add_argument("--top-imports", type=int, default=0, help="Also list the N slowest modules to import")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory(prefix="startup-") as scratch:
+        env["SQLALCHEMY_DATABASE_URI"] = args.database_url or f"sqlite:///{os.path.join(scratch, 'startup.db')}"
+        env["AUTO_CREATE_TABLES"] = str(args.auto_create_tables)
+
+        runs = []
+        for index in range(args.runs):
+            runs.append(run_once(env))
+            print(f"  run {index + 1}/{args.runs}: " + ", ".join(
+                f"{phase} {runs[-1][phase]:.0f}ms" for phase in PHASES + ("total_wall",)
+            ), file=sys.stderr)
+        imports = top_imports(env, args.top_imports) if args.top_imports else []
+
+    results = {
+        phase: {
+            "median_ms": round(statistics.median(run[phase] for run in runs), 3),
+            "min_ms": round(min(run[phase] for run in runs), 3),
+        }
+        for phase in PHASES + ("total_wall",)
+    }
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+            "auto_create_tables": args.auto_create_tables,
+        },
+        "results": results,
+    }
+    if imports:
+        report["top_imports"] = [
+            {"module": name, "self_ms": round(own, 3), "cumulative_ms": round(cumulative, 3)}
+            for name, own, cumulative in imports
+        ]
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(rendered + "\n")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    main()
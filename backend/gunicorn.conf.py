@@ -0,0 +1,91 @@
+# backend/gunicorn.conf.py
+"""
+Production serving: gunicorn supervising uvicorn workers
+
+Usage (from backend/):
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Each worker imports the app itself (no preload), so engines, pools and
+background threads are never shared across a fork. In-process caches stay
+coherent through the invalidation bus (INVALIDATION_BUS, PostgreSQL
+LISTEN/NOTIFY by default on PostgreSQL).
+
+Offline key credentials must be signed with the same key in every worker.
+Without a key at KEY_CREDENTIAL_SIGNING_KEY_PATH the master generates one
+ephemeral key before forking and points all workers at it.
+
+/metrics and profiler sessions cover every worker, through snapshots each
+worker writes to WORKER_STATE_DIR; the master creates a temporary one when
+it is unset.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2, 8)))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Long pass and export requests finish before a worker is replaced
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Recycle workers now and then, staggered so they don't restart together
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "*")
+accesslog = "-"
+
+
+def on_starting(server):
+    """Share one credential signing key and one state directory between all workers"""
+    from app.config import settings
+
+    _share_worker_state_dir(server, settings)
+    _share_signing_key(server, settings)
+
+
+def _share_worker_state_dir(server, settings):
+    if settings.WORKER_STATE_DIR:
+        return
+    path = tempfile.mkdtemp(prefix="gunicorn-workers-")
+    settings.WORKER_STATE_DIR = path
+    os.environ["WORKER_STATE_DIR"] = path
+    server.ephemeral_worker_state_dir = path
+
+
+def _share_signing_key(server, settings):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    configured_path = settings.KEY_CREDENTIAL_SIGNING_KEY_PATH
+    if os.path.exists(configured_path):
+        return
+    pem = Ed25519PrivateKey.generate().private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    # mkstemp creates the file readable by this user only
+    fd, path = tempfile.mkstemp(prefix="credential-signing-", suffix=".pem")
+    with os.fdopen(fd, "wb") as key_file:
+        key_file.write(pem)
+    # Workers are forked from this process with app.config already imported;
+    # the environment covers anything that reads it again
+    settings.KEY_CREDENTIAL_SIGNING_KEY_PATH = path
+    os.environ["KEY_CREDENTIAL_SIGNING_KEY_PATH"] = path
+    server.ephemeral_signing_key_path = path
+    server.log.warning(
+        f"Credential signing key {configured_path} not found, "
+        f"workers share an ephemeral key until restart (ephemeral_key_path={path})"
+    )
+
+
+def on_exit(server):
+    path = getattr(server, "ephemeral_signing_key_path", None)
+    if path and os.path.exists(path):
+        os.remove(path)
+    state_dir = getattr(server, "ephemeral_worker_state_dir", None)
+    if state_dir:
+        shutil.rmtree(state_dir, ignore_errors=True)
@@ -1,5 +1,9 @@
 # backend/tests/conftest.py
+import importlib.util
 import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -8,6 +12,10 @@ from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db.session import get_db, Base
+from app.models.digital_key import DigitalKey, KeyType
+from app.models.hotel import Hotel
+from app.models.reservation import Reservation, ReservationStatus
+from app.models.room import Room
 from app.models.user import User
 from app.security import get_password_hash
 
@@ -38,6 +46,13 @@ def override_get_db():
 # Override the app's database dependency
 app.dependency_overrides[get_db] = override_get_db
 
+# Keys created by the hotel_keys fixture unless a test names its own
+KEY_UUIDS = [
+    "9f1c3a11-4f0a-4a53-9d0e-2f6b8f1c3a11",
+    "0b7d5c1e-4f0a-4a53-9d0e-2f6b8f1c3a12",
+    "5a2e8d4c-4f0a-4a53-9d0e-2f6b8f1c3a13",
+]
+
 
 @pytest.fixture
 def test_db():
@@ -158,3 +173,55 @@ def admin_token_headers(client, db_admin, test_admin):
     tokens = response.json()
     headers = {"Authorization": f"Bearer {tokens['access_token']}"}
     return headers
+
+
+@pytest.fixture
+def hotel_keys(test_db):
+    """
+    Factory for a hotel room (lock LOCK-<room_number>) with a confirmed stay
+    around now and a key per UUID
+
+    Keys listed in inactive are created deactivated. Returns the hotel ID
+    and the key IDs, in key_uuids order.
+    """
+    def create(key_uuids=KEY_UUIDS, inactive=(), room_number="401"):
+        db = TestingSessionLocal()
+        guest = User(email="guest@example.com", first_name="Guest", last_name="User", hashed_password="x")
+        hotel = Hotel(name="Test Hotel", address="1 Road", city="Nice", state="PACA", country="France", phone_number="1")
+        db.add_all([guest, hotel])
+        db.flush()
+        room = Room(hotel_id=hotel.id, room_number=room_number, nfc_lock_id=f"LOCK-{room_number}")
+        db.add(room)
+        db.flush()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        reservation = Reservation(
+            user_id=guest.id, room_id=room.id, confirmation_code=f"STAY{room_number}",
+            check_in=now - timedelta(days=1), check_out=now + timedelta(days=1), status=ReservationStatus.CONFIRMED,
+        )
+        db.add(reservation)
+        db.flush()
+        keys = [
+            DigitalKey(
+                reservation_id=reservation.id, key_uuid=key_uuid, pass_type=KeyType.GOOGLE,
+                valid_from=reservation.check_in, valid_until=reservation.check_out,
+                is_active=key_uuid not in inactive,
+            )
+            for key_uuid in key_uuids
+        ]
+        db.add_all(keys)
+        db.commit()
+        ids = hotel.id, [key.id for key in keys]
+        db.close()
+        return ids
+
+    return create
+
+
+@pytest.fixture
+def offline_verifier():
+    """The lock-side verifier module shipped with the NFC simulator"""
+    path = Path(__file__).resolve().parents[2] / "nfc_simulator" / "offline_verifier.py"
+    spec = importlib.util.spec_from_file_location("offline_verifier", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,100 @@
+# backend/tests/test_analytics.py
+from datetime import datetime, timedelta, timezone
+
+from app.models.access_rollup import AccessRollup
+from app.models.hotel import Hotel
+from app.models.key_event import KeyEvent
+from app.models.room import Room
+from app.services.access_rollup_service import fold_new_events, hour_bucket
+from tests.conftest import KEY_UUIDS, TestingSessionLocal
+
+BASE_TIME = datetime(2025, 1, 1, 8, 0, 0)
+
+
+def create_access_events(db, events):
+    """Create a hotel with one room and the given (minutes, event_type) events on its lock"""
+    hotel = Hotel(name="Rollup Hotel", address="1 Road", city="Nice", state="PACA", country="France", phone_number="1")
+    db.add(hotel)
+    db.flush()
+    room = Room(hotel_id=hotel.id, room_number="201", nfc_lock_id="LOCK-201")
+    db.add(room)
+    for minutes, event_type in events:
+        timestamp = BASE_TIME + timedelta(minutes=minutes)
+        db.add(KeyEvent(event_type=event_type, lock_id="LOCK-201", timestamp=timestamp, created_at=timestamp))
+    db.commit()
+    return hotel.id, room.id
+
+
+def test_fold_events_into_hourly_rollups(test_db):
+    """Test that events are counted once per (room, lock, hour, outcome)"""
+    db = TestingSessionLocal()
+    hotel_id, room_id = create_access_events(db, [
+        (5, "physical_access_granted"),
+        (20, "physical_access_granted"),
+        (30, "physical_access_denied"),
+        (70, "physical_access_granted"),
+        (75, "key_email_sent"),
+    ])
+
+    assert fold_new_events(db, lag_seconds=0) == 4
+    # Nothing new to fold on the next run
+    assert fold_new_events(db, lag_seconds=0) == 0
+
+    # A late event is picked up incrementally
+    db.add(KeyEvent(event_type="physical_access_denied", lock_id="LOCK-201", timestamp=BASE_TIME + timedelta(minutes=10)))
+    db.commit()
+    assert fold_new_events(db, lag_seconds=0) == 1
+    db.close()
+
+
+def test_access_analytics_endpoint(client, admin_token_headers):
+    """Test serving rollups per hour and per day, and rebuilding them"""
+    db = TestingSessionLocal()
+    hotel_id, room_id = create_access_events(db, [
+        (5, "physical_access_granted"),
+        (20, "physical_access_granted"),
+        (30, "physical_access_denied"),
+        (70, "physical_access_granted"),
+    ])
+    fold_new_events(db, lag_seconds=0)
+    db.close()
+
+    params = f"hotel_id={hotel_id}&start=2025-01-01T00:00:00&end=2025-01-02T00:00:00"
+    response = client.get(f"/api/v1/analytics/access?{params}", headers=admin_token_headers)
+    assert response.status_code == 200
+    buckets = {(b["bucket_start"], b["outcome"]): b["count"] for b in response.json()}
+    assert buckets == {
+        ("2025-01-01T08:00:00", "granted"): 2,
+        ("2025-01-01T08:00:00", "denied"): 1,
+        ("2025-01-01T09:00:00", "granted"): 1,
+    }
+    assert response.json()[0]["room_id"] == room_id
+    assert response.json()[0]["lock_id"] == "LOCK-201"
+
+    response = client.get(
+        f"/api/v1/analytics/access?{params}&granularity=day&outcome=granted", headers=admin_token_headers
+    )
+    assert [(b["bucket_start"], b["count"]) for b in response.json()] == [("2025-01-01T00:00:00", 3)]
+
+    response = client.post("/api/v1/analytics/access/rebuild", headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.json()["events_folded"] == 4
+    response = client.get(f"/api/v1/analytics/access?{params}", headers=admin_token_headers)
+    assert sum(b["count"] for b in response.json()) == 4
+
+
+def test_verified_taps_roll_up_by_utc_hour(client, hotel_keys):
+    """Test that a tap verified by /verify/key is stored and bucketed in UTC"""
+    hotel_keys()
+    before = datetime.now(timezone.utc).replace(tzinfo=None)
+    response = client.post("/api/v1/verify/key", json={"key_uuid": KEY_UUIDS[0], "lock_id": "LOCK-401"})
+    after = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert response.json()["is_valid"] is True
+
+    db = TestingSessionLocal()
+    event = db.query(KeyEvent).filter(KeyEvent.lock_id == "LOCK-401").one()
+    assert before <= event.timestamp <= after
+    assert fold_new_events(db, lag_seconds=0) == 1
+    rollup = db.query(AccessRollup).one()
+    assert rollup.bucket_start in {hour_bucket(before), hour_bucket(after)}
+    db.close()
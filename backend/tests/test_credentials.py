@@ -0,0 +1,180 @@
+# backend/tests/test_credentials.py
+import base64
+import importlib.util
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from app.config import settings
+from app.models.digital_key import DigitalKey
+from app.models.key_event import KeyEvent
+from app.security import ACCESS_LOG_SIGNATURE_HEADER, sign_access_log_batch
+from app.services.credential_service import CredentialError, credential_for_pass, decode_credential, issue_credential
+from tests.conftest import TestingSessionLocal
+
+KEY_UUID = "0b7d5c1e-4f0a-4a53-9d0e-2f6b8f1c3a11"
+VALID_FROM = datetime(2025, 1, 1, 15, 0, 0)
+VALID_UNTIL = datetime(2025, 1, 3, 11, 0, 0)
+
+
+def test_credential_round_trip():
+    """Test that an issued credential decodes to the signed claims"""
+    token = issue_credential(KEY_UUID, "LOCK-101", VALID_FROM, VALID_UNTIL)
+    credential = decode_credential(token)
+
+    assert credential.key_uuid == KEY_UUID
+    assert credential.lock_id == "LOCK-101"
+    assert credential.valid_from == VALID_FROM.replace(tzinfo=timezone.utc)
+    assert credential.valid_until == VALID_UNTIL.replace(tzinfo=timezone.utc)
+    # Compact enough for an NFC message
+    assert len(token) < 140
+
+
+def test_pass_credential_signs_the_key_window():
+    """Test that pass credentials carry the key's validity window, not the reservation dates"""
+    extended_until = VALID_UNTIL + timedelta(days=2)
+    token = credential_for_pass({
+        "key_uuid": KEY_UUID,
+        "nfc_lock_id": "LOCK-101",
+        "check_in": VALID_FROM.isoformat(),
+        "check_out": VALID_UNTIL.isoformat(),
+        "valid_from": VALID_FROM.isoformat(),
+        "valid_until": extended_until.isoformat(),
+    })
+    credential = decode_credential(token)
+
+    assert credential.valid_from == VALID_FROM.replace(tzinfo=timezone.utc)
+    assert credential.valid_until == extended_until.replace(tzinfo=timezone.utc)
+
+
+def test_credential_rejects_tampering():
+    """Test that changing any signed byte invalidates the credential"""
+    token = issue_credential(KEY_UUID, "LOCK-101", VALID_FROM, VALID_UNTIL)
+    data = bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    # Push valid_until (bytes 25-28) about six months later
+    data[25] += 1
+    tampered = base64.urlsafe_b64encode(bytes(data)).rstrip(b"=").decode()
+
+    with pytest.raises(CredentialError, match="signature"):
+        decode_credential(tampered)
+    with pytest.raises(CredentialError):
+        decode_credential("not a credential")
+
+
+def test_offline_verifier_checks_lock_window_and_revocations(client, offline_verifier):
+    """Test the lock-side verifier against credentials issued by the backend"""
+    key_set = client.get("/api/v1/verify/credential-keys").json()
+    verifier = offline_verifier.OfflineVerifier.from_key_set("LOCK-101", key_set)
+    token = issue_credential(KEY_UUID, "LOCK-101", VALID_FROM, VALID_UNTIL)
+    during_stay = datetime(2025, 1, 2, tzinfo=timezone.utc).timestamp()
+
+    assert verifier.verify(token, now=during_stay) == offline_verifier.Verdict(True, "granted", KEY_UUID)
+    assert verifier.verify(token, now=during_stay + 7 * 86400).reason == "outside_validity_period"
+    assert offline_verifier.OfflineVerifier.from_key_set("LOCK-999", key_set).verify(
+        token, now=during_stay
+    ).reason == "wrong_lock"
+
+    assert verifier.update_revocations(2, [KEY_UUID])
+    assert not verifier.update_revocations(1, [])
+    assert verifier.verify(token, now=during_stay).reason == "revoked"
+
+
+def post_access_logs(client, entries, secret="lock-secret"):
+    body = json.dumps({"entries": entries}).encode()
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        headers[ACCESS_LOG_SIGNATURE_HEADER] = sign_access_log_batch(body, secret)
+    return client.post("/api/v1/verify/access-logs", content=body, headers=headers)
+
+
+def test_upload_access_logs(client, monkeypatch, hotel_keys):
+    """Test that batched offline decisions are stored as key events"""
+    monkeypatch.setattr("app.security.settings.ACCESS_LOG_SECRET", "lock-secret")
+    _, key_ids = hotel_keys(["active-key", "revoked-key"], inactive={"revoked-key"}, room_number="301")
+    tapped_at = datetime(2025, 1, 2, 8, 30, tzinfo=timezone.utc)
+    entries = [
+        {"key_uuid": "active-key", "lock_id": "LOCK-301", "timestamp": tapped_at.isoformat(), "granted": True},
+        {"key_uuid": "active-key", "lock_id": "LOCK-301", "timestamp": (tapped_at + timedelta(minutes=5)).isoformat(), "granted": True},
+        {"key_uuid": "missing-key", "lock_id": "LOCK-301", "timestamp": tapped_at.isoformat(), "granted": False, "reason": "bad_signature"},
+    ]
+
+    response = post_access_logs(client, entries)
+    assert response.status_code == 200
+    assert response.json() == {"accepted": 3, "unknown_keys": 1}
+
+    db = TestingSessionLocal()
+    events = db.query(KeyEvent).order_by(KeyEvent.timestamp, KeyEvent.event_type).all()
+    assert [event.event_type for event in events] == [
+        "physical_access_granted", "physical_access_denied", "physical_access_granted",
+    ]
+    assert events[1].details == {"offline": True, "reason": "bad_signature"}
+    key = db.get(DigitalKey, key_ids[0])
+    assert key.access_count == 2
+    assert key.last_used == datetime(2025, 1, 2, 8, 35)
+    db.close()
+
+
+def test_upload_access_logs_requires_signature(client, monkeypatch):
+    """Test that unsigned, mis-signed or unconfigured access log uploads are rejected"""
+    entries = [{"key_uuid": "any-key", "lock_id": "LOCK-301", "timestamp": "2025-01-02T08:30:00+00:00", "granted": True}]
+
+    monkeypatch.setattr("app.security.settings.ACCESS_LOG_SECRET", "")
+    assert post_access_logs(client, entries).status_code == 401
+
+    monkeypatch.setattr("app.security.settings.ACCESS_LOG_SECRET", "lock-secret")
+    assert client.post("/api/v1/verify/access-logs", json={"entries": entries}).status_code == 401
+    assert post_access_logs(client, entries, secret=None).status_code == 401
+    assert post_access_logs(client, entries, secret="wrong-secret").status_code == 401
+
+    db = TestingSessionLocal()
+    assert db.query(KeyEvent).count() == 0
+    db.close()
+    assert post_access_logs(client, entries).status_code == 200
+
+
+def test_gunicorn_workers_share_one_signing_key(tmp_path, monkeypatch, caplog):
+    """Test that the gunicorn master generates one signing key for every worker when none is configured"""
+    path = Path(__file__).resolve().parents[1] / "gunicorn.conf.py"
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", path)
+    gunicorn_conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gunicorn_conf)
+
+    class Server:
+        log = logging.getLogger("gunicorn.error")
+
+    server = Server()
+    monkeypatch.setenv("KEY_CREDENTIAL_SIGNING_KEY_PATH", "unused")
+    monkeypatch.setenv("WORKER_STATE_DIR", "")
+    monkeypatch.setattr("app.config.settings.WORKER_STATE_DIR", "")
+    monkeypatch.setattr("app.config.settings.KEY_CREDENTIAL_SIGNING_KEY_PATH", str(tmp_path / "missing.pem"))
+    with caplog.at_level(logging.WARNING, logger="gunicorn.error"):
+        gunicorn_conf.on_starting(server)
+
+    shared_path = os.environ["KEY_CREDENTIAL_SIGNING_KEY_PATH"]
+    assert shared_path == server.ephemeral_signing_key_path == settings.KEY_CREDENTIAL_SIGNING_KEY_PATH
+    # The warning names the missing configured key, not the temporary file
+    assert f"Credential signing key {tmp_path / 'missing.pem'} not found" in caplog.text
+    assert f"ephemeral_key_path={shared_path}" in caplog.text
+    key = serialization.load_pem_private_key(Path(shared_path).read_bytes(), password=None)
+    assert isinstance(key, Ed25519PrivateKey)
+    # Workers also share one directory for /metrics and profiler snapshots
+    state_dir = os.environ["WORKER_STATE_DIR"]
+    assert state_dir == server.ephemeral_worker_state_dir == settings.WORKER_STATE_DIR
+    assert os.path.isdir(state_dir)
+    gunicorn_conf.on_exit(server)
+    assert not os.path.exists(shared_path)
+    assert not os.path.exists(state_dir)
+
+    # A configured key is left alone
+    server = Server()
+    configured = tmp_path / "configured.pem"
+    configured.write_bytes(b"")
+    monkeypatch.setattr("app.config.settings.KEY_CREDENTIAL_SIGNING_KEY_PATH", str(configured))
+    gunicorn_conf.on_starting(server)
+    assert not hasattr(server, "ephemeral_signing_key_path")
@@ -0,0 +1,32 @@
+# backend/tests/test_event_retention.py
+from datetime import datetime
+
+from app.models.key_event import KeyEvent
+from app.services.event_retention_service import add_months, apply_retention, partition_name
+from tests.conftest import TestingSessionLocal
+
+
+def test_month_arithmetic():
+    """Test month shifting across year boundaries and partition naming"""
+    assert add_months(datetime(2025, 11, 1), 3) == datetime(2026, 2, 1)
+    assert add_months(datetime(2025, 1, 1), -1) == datetime(2024, 12, 1)
+    assert partition_name(datetime(2025, 3, 1)) == "keyevent_y2025m03"
+
+
+def test_retention_deletes_old_events_without_partitions(test_db):
+    """Test that retention deletes whole months of events older than the window"""
+    db = TestingSessionLocal()
+    for timestamp in (datetime(2024, 12, 31, 23, 59), datetime(2025, 1, 1), datetime(2025, 3, 15)):
+        db.add(KeyEvent(event_type="physical_access_granted", timestamp=timestamp))
+    db.commit()
+
+    result = apply_retention(db, retention_months=2, mode="drop", now=datetime(2025, 3, 20))
+
+    assert result["deleted_rows"] == 1
+    remaining = sorted(event.timestamp for event in db.query(KeyEvent).all())
+    assert remaining == [datetime(2025, 1, 1), datetime(2025, 3, 15)]
+
+    # Archiving needs partitions, so nothing is touched
+    assert apply_retention(db, retention_months=1, mode="archive", now=datetime(2025, 3, 20))["deleted_rows"] == 0
+    assert db.query(KeyEvent).count() == 2
+    db.close()
@@ -0,0 +1,127 @@
+# backend/tests/test_events.py
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.models.digital_key import DigitalKey, KeyType
+from app.models.hotel import Hotel
+from app.models.key_event import EVENT_STATUS_CODES, EVENT_TYPE_CODES, KeyEvent
+from app.models.reservation import Reservation
+from app.models.room import Room
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+
+def create_key_events(count=5):
+    """Create a guest, hotel, room, reservation and key with `count` access events"""
+    db = TestingSessionLocal()
+    guest = User(email="guest@example.com", first_name="Guest", last_name="User", hashed_password="x")
+    db.add(guest)
+    hotel = Hotel(name="Audit Hotel", address="1 Road", city="Nice", state="PACA", country="France", phone_number="1")
+    db.add(hotel)
+    db.flush()
+    room = Room(hotel_id=hotel.id, room_number="101", nfc_lock_id="LOCK-101")
+    db.add(room)
+    db.flush()
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    reservation = Reservation(
+        user_id=guest.id, room_id=room.id, confirmation_code="AUDIT1",
+        check_in=now, check_out=now + timedelta(days=2),
+    )
+    db.add(reservation)
+    db.flush()
+    key = DigitalKey(
+        reservation_id=reservation.id, key_uuid="audit-key", pass_type=KeyType.APPLE,
+        valid_from=now, valid_until=now + timedelta(days=2),
+    )
+    db.add(key)
+    db.flush()
+    for i in range(count):
+        db.add(KeyEvent(
+            key_id=key.id,
+            event_type="physical_access_granted" if i % 2 == 0 else "physical_access_denied",
+            timestamp=now + timedelta(minutes=i),
+            status="success",
+            details={"reason": "key_inactive"} if i % 2 else None,
+        ))
+    db.commit()
+    ids = {"hotel_id": hotel.id, "room_id": room.id}
+    db.close()
+    return ids
+
+
+def test_export_events_ndjson(client, admin_token_headers):
+    """Test streaming events as NDJSON with hotel and event type filters"""
+    ids = create_key_events()
+
+    response = client.get(
+        f"/api/v1/events/export?hotel_id={ids['hotel_id']}&event_type=physical_access_granted",
+        headers=admin_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 3
+    assert all(row["event_type"] == "physical_access_granted" for row in rows)
+    assert rows[0]["room_number"] == "101"
+    assert rows[0]["key_uuid"] == "audit-key"
+    assert rows == sorted(rows, key=lambda row: row["timestamp"])
+
+
+def test_export_events_csv_time_range(client, admin_token_headers):
+    """Test streaming events as CSV restricted to a time range"""
+    create_key_events()
+
+    response = client.get(
+        "/api/v1/events/export?format=csv&start=2025-01-01T12:01:00&end=2025-01-01T12:03:00",
+        headers=admin_token_headers,
+    )
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["timestamp"] for row in rows] == ["2025-01-01T12:01:00", "2025-01-01T12:02:00"]
+
+
+def test_export_events_requires_staff(client, user_token_headers):
+    """Test that guests cannot export events"""
+    response = client.get("/api/v1/events/export", headers=user_token_headers)
+    assert response.status_code == 403
+
+
+def test_event_type_and_status_stored_as_codes(test_db):
+    """Test that event_type/status round-trip through their small int codes"""
+    create_key_events(count=2)
+    db = TestingSessionLocal()
+
+    stored = db.execute(text("SELECT event_type, status, details FROM keyevent ORDER BY timestamp")).all()
+    assert [(row[0], row[1]) for row in stored] == [
+        (EVENT_TYPE_CODES["physical_access_granted"], EVENT_STATUS_CODES["success"]),
+        (EVENT_TYPE_CODES["physical_access_denied"], EVENT_STATUS_CODES["success"]),
+    ]
+
+    events = db.query(KeyEvent).order_by(KeyEvent.timestamp).all()
+    assert [event.event_type for event in events] == ["physical_access_granted", "physical_access_denied"]
+    assert events[1].details == {"reason": "key_inactive"}
+
+    db.add(KeyEvent(event_type="not_registered", timestamp=datetime(2025, 1, 1)))
+    with pytest.raises(Exception, match="Unregistered value: not_registered"):
+        db.flush()
+    db.rollback()
+    db.close()
+
+
+def test_export_events_csv_details_and_unknown_type(client, admin_token_headers):
+    """Test that details are exported as JSON and unknown event types are rejected"""
+    create_key_events(count=2)
+
+    response = client.get("/api/v1/events/export?format=csv", headers=admin_token_headers)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows[0]["details"] == ""
+    assert json.loads(rows[1]["details"]) == {"reason": "key_inactive"}
+
+    response = client.get("/api/v1/events/export?event_type=access_granted", headers=admin_token_headers)
+    assert response.status_code == 400
@@ -0,0 +1,59 @@
+# backend/tests/test_health.py
+import time
+
+from app.security import password_pool
+from app.services.health_service import Readiness, readiness
+
+
+def wait_until_ready(client, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get("/readyz")
+        if response.status_code == 200 or time.monotonic() > deadline:
+            return response
+        time.sleep(0.05)
+
+
+def test_liveness_and_readiness(client, monkeypatch):
+    """Test that /readyz turns ready once warm-ups finish and reports its checks"""
+    assert client.get("/livez").json() == {"status": "alive"}
+
+    monkeypatch.setattr(readiness, "cache_seconds", 0)
+    response = wait_until_ready(client)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["checks"]["warm_up"] == {"ok": True, "pending": [], "failed": []}
+    assert body["checks"]["database"]["ok"]
+    assert body["checks"]["worker_pools"][password_pool.name]["queue_depth"] == 0
+
+    # A backed-up worker queue takes the worker out of rotation
+    monkeypatch.setattr(password_pool, "_pending", password_pool.max_queue)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["status"] == "not_ready"
+    assert not response.json()["checks"]["worker_pools"]["ok"]
+
+
+def test_readiness_waits_for_warm_ups_and_caches_checks():
+    """Test that pending warm-ups block readiness, failures don't, and checks are cached"""
+    calls = []
+    probe = Readiness(cache_seconds=60)
+    probe.add_check("warm_up", probe.check_warm_up)
+    probe.add_check("counted", lambda: (calls.append(1) is None, {}))
+
+    warm = probe.warm_up("templates", lambda: 3)
+    broken = probe.warm_up("signing_key", lambda: 1 / 0)
+    assert not probe.status()["ready"]
+    assert probe.status()["checks"]["warm_up"]["pending"] == ["signing_key", "templates"]
+    assert len(calls) == 1
+
+    assert warm() == 3
+    try:
+        broken()
+    except ZeroDivisionError:
+        pass
+    status = probe.status()
+    assert status["ready"]
+    assert status["checks"]["warm_up"]["failed"] == ["signing_key"]
+    assert len(calls) == 2
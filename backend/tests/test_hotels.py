@@ -0,0 +1,82 @@
+# backend/tests/test_hotels.py
+from app.services import hotel_service
+from app.services.template_service import template_registry
+from app.utils.date_formatting import format_datetime
+from tests.conftest import TestingSessionLocal
+
+
+HOTEL_DATA = {
+    "name": "Seaside Inn",
+    "address": "1 Beach Road",
+    "city": "Nice",
+    "state": "PACA",
+    "country": "France",
+    "phone_number": "0102030405",
+    "background_color": "rgb(10, 20, 30)",
+}
+
+
+def test_hotel_metadata_is_cached(client, admin_token_headers, monkeypatch):
+    """Test that hotel metadata is loaded from the database only once"""
+    response = client.post("/api/v1/hotels", headers=admin_token_headers, json=HOTEL_DATA)
+    assert response.status_code == 201
+    hotel_id = response.json()["id"]
+    hotel_service.invalidate_hotel()
+
+    db = TestingSessionLocal()
+    try:
+        metadata = hotel_service.get_hotel_metadata(db, hotel_id)
+        assert metadata.name == "Seaside Inn"
+        assert metadata.background_color == "rgb(10, 20, 30)"
+        assert metadata.label_color == hotel_service.DEFAULT_LABEL_COLOR
+
+        # A second lookup must not touch the database
+        monkeypatch.setattr(db, "query", None)
+        assert hotel_service.get_hotel_name(db, hotel_id) == "Seaside Inn"
+    finally:
+        db.close()
+
+
+def test_hotel_update_invalidates_cache(client, admin_token_headers):
+    """Test that renaming a hotel through the API is visible immediately"""
+    response = client.post("/api/v1/hotels", headers=admin_token_headers, json=HOTEL_DATA)
+    hotel_id = response.json()["id"]
+
+    db = TestingSessionLocal()
+    try:
+        assert hotel_service.get_hotel_name(db, hotel_id) == "Seaside Inn"
+
+        notified = []
+        hotel_service.add_invalidation_listener(notified.append)
+        try:
+            response = client.put(
+                f"/api/v1/hotels/{hotel_id}", headers=admin_token_headers, json={"name": "Harbour Hotel"}
+            )
+            assert response.status_code == 200
+        finally:
+            hotel_service._invalidation_listeners.remove(notified.append)
+
+        assert notified == [hotel_id]
+        assert hotel_service.get_hotel_name(db, hotel_id) == "Harbour Hotel"
+    finally:
+        db.close()
+
+
+def test_guest_facing_times_use_hotel_timezone(client, admin_token_headers):
+    """Test that stored UTC check-in times are shown in the hotel's timezone"""
+    response = client.post(
+        "/api/v1/hotels", headers=admin_token_headers, json={**HOTEL_DATA, "timezone": "America/New_York"}
+    )
+    hotel_id = response.json()["id"]
+
+    db = TestingSessionLocal()
+    try:
+        assert hotel_service.get_hotel_timezone(db, hotel_id) == "America/New_York"
+        assert hotel_service.get_hotel_timezone(db, "missing") == hotel_service.DEFAULT_TIMEZONE
+    finally:
+        db.close()
+    assert template_registry.hotel_context(hotel_id)["hotel_timezone"] == "America/New_York"
+
+    assert format_datetime("2025-01-02T15:00:00", "America/New_York") == "2025-01-02 10:00"
+    assert format_datetime("2025-07-02T15:00:00", "Europe/Paris") == "2025-07-02 17:00"
+    assert format_datetime("2025-01-02T15:00:00") == "2025-01-02 15:00"
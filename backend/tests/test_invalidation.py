@@ -0,0 +1,75 @@
+# backend/tests/test_invalidation.py
+from sqlalchemy import text
+
+from app.utils.cache import LRUCache
+from app.utils.invalidation import InvalidationBus, PostgresInvalidationBus, create_invalidation_bus
+from tests.conftest import TestingSessionLocal, engine as test_engine
+
+
+def test_local_bus_keeps_caches_coherent():
+    """Test that published keys drop cache entries and None clears the channel"""
+    bus = InvalidationBus()
+    cache = LRUCache()
+    seen = []
+    bus.subscribe_cache("hotel", cache)
+    bus.subscribe("hotel", seen.append)
+
+    cache.set("h1", "Hotel One")
+    cache.set("h2", "Hotel Two")
+    bus.publish("hotel", "h1")
+    assert cache.get("h1") is None
+    assert cache.get("h2") == "Hotel Two"
+
+    bus.publish("user_principal", "h2")
+    assert cache.get("h2") == "Hotel Two"
+    bus.publish("hotel")
+    assert len(cache) == 0
+    assert seen == ["h1", None]
+
+
+def test_publish_after_commit_waits_for_the_transaction(test_db):
+    """Test that invalidations tied to a session only fire if it commits"""
+    bus = InvalidationBus()
+    seen = []
+    bus.subscribe("digital_key", seen.append)
+
+    db = TestingSessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        bus.publish_after_commit(db, "digital_key", "rolled-back")
+        db.rollback()
+        assert seen == []
+
+        db.execute(text("SELECT 1"))
+        bus.publish_after_commit(db, "digital_key", "k1")
+        assert seen == []
+        db.commit()
+        assert seen == ["k1"]
+    finally:
+        db.close()
+
+
+def test_postgres_bus_applies_other_workers_messages():
+    """Test that a worker applies notifications from others and skips its own"""
+    worker_a = PostgresInvalidationBus(test_engine, "cache_invalidation")
+    worker_b = PostgresInvalidationBus(test_engine, "cache_invalidation")
+    worker_a.origin, worker_b.origin = "a", "b"
+    seen_a, seen_b = [], []
+    worker_a.subscribe("hotel", seen_a.append)
+    worker_b.subscribe("hotel", seen_b.append)
+
+    notification = worker_a._payload("hotel", "h1")
+    assert notification["channel"] == "cache_invalidation"
+    worker_a.handle_notification(notification["payload"])
+    worker_b.handle_notification(notification["payload"])
+    worker_b.handle_notification(worker_a._payload("hotel", None)["payload"])
+
+    assert seen_a == []
+    assert seen_b == ["h1", None]
+    assert worker_b.check() == (False, {"backend": "postgres"})
+
+
+def test_auto_bus_follows_the_database():
+    """Test that auto only picks LISTEN/NOTIFY on PostgreSQL"""
+    assert create_invalidation_bus("auto", test_engine).backend == "local"
+    assert create_invalidation_bus("postgres", test_engine).backend == "postgres"
@@ -0,0 +1,59 @@
+# backend/tests/test_log_config.py
+import json
+import logging
+import queue
+import sys
+
+from app.utils.log_config import (
+    DroppingQueueHandler,
+    JsonFormatter,
+    SamplingFilter,
+    log_records_dropped,
+    parse_sample_rates,
+)
+
+
+def make_record(name: str, level: int = logging.INFO, msg: str = "hello %s", args=("world",)) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_sampling_filter_keeps_share_per_logger():
+    """Test that sampled loggers keep one record in 1/rate, children included, warnings always"""
+    sampling = SamplingFilter(parse_sample_rates("app.api.passes=0.25, app.services=0"))
+
+    kept = [sampling.filter(make_record("app.api.passes")) for _ in range(8)]
+    assert kept.count(True) == 2
+    assert not sampling.filter(make_record("app.services.wallet_service"))
+    assert sampling.filter(make_record("app.services.wallet_service", logging.WARNING))
+    assert sampling.filter(make_record("app.api.keys"))
+
+
+def test_queue_handler_drops_when_full():
+    """Test that a full log queue drops records instead of blocking the caller"""
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    dropped = log_records_dropped.value()
+
+    handler.handle(make_record("app.test"))
+    handler.handle(make_record("app.test"))
+
+    assert log_queue.qsize() == 1
+    assert log_records_dropped.value() == dropped + 1
+    assert log_queue.get_nowait().getMessage() == "hello world"
+
+
+def test_json_formatter_includes_exception():
+    """Test that queued records format as one JSON object with the traceback"""
+    handler = DroppingQueueHandler(queue.Queue())
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record("app.test", logging.ERROR)
+        record.exc_info = sys.exc_info()
+    prepared = handler.prepare(record)
+
+    entry = json.loads(JsonFormatter().format(prepared))
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "app.test"
+    assert entry["message"] == "hello world"
+    assert "ValueError: boom" in entry["exc_info"]
@@ -0,0 +1,140 @@
+# backend/tests/test_metrics.py
+import json
+import subprocess
+import sys
+
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.db.session import db_query_duration, track_query_time
+from app.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from app.utils.query_profiler import db_slow_queries, http_request_db_queries
+from app.utils.request_metrics import http_request_duration, http_requests_total
+from tests.conftest import engine as test_engine
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that observations land in the right buckets and render cumulatively"""
+    histogram = Histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe(value, route="/a")
+
+    assert histogram.count(route="/a") == 4
+    assert histogram.sum(route="/a") == 2.65
+    assert histogram.collect() == [
+        "# HELP test_latency_seconds Test latency",
+        "# TYPE test_latency_seconds histogram",
+        'test_latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'test_latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'test_latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'test_latency_seconds_sum{route="/a"} 2.65',
+        'test_latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_request_metrics_use_route_templates(client, admin_token_headers):
+    """Test that requests are recorded per route template and status, not per raw path"""
+    route = "/api/v1/hotels/{hotel_id}"
+    before = http_request_duration.count(method="GET", route=route)
+    not_found = http_requests_total.value(method="GET", route=route, status="404")
+
+    for hotel_id in ("missing-1", "missing-2"):
+        response = client.get(f"/api/v1/hotels/{hotel_id}", headers=admin_token_headers)
+        assert response.status_code == 404
+        assert float(response.headers["X-Process-Time"]) >= 0
+    client.get("/no/such/path")
+
+    assert http_request_duration.count(method="GET", route=route) == before + 2
+    assert http_requests_total.value(method="GET", route=route, status="404") == not_found + 2
+
+    body = client.get("/metrics").text
+    assert f'http_request_duration_seconds_count{{method="GET",route="{route}"}}' in body
+    assert 'route="<unmatched>",status="404"' in body
+    assert "missing-1" not in body
+    assert "http_requests_in_progress" in body
+
+
+def test_track_query_time():
+    """Test that statements run on an instrumented engine are timed by type"""
+    engine = create_engine("sqlite://")
+    track_query_time(engine)
+    before = db_query_duration.count(operation="select")
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        try:
+            conn.execute(text("SELECT * FROM missing_table"))
+        except Exception:
+            pass
+        conn.execute(text("SELECT 2"))
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+
+    assert db_query_duration.count(operation="select") == before + 2
+    assert db_query_duration.count(operation="other") >= 1
+
+
+def test_sql_profiler_counts_queries_per_route(client, admin_token_headers, monkeypatch):
+    """Test that the profiler reports per-request query counts in headers, metrics and the slow log"""
+    track_query_time(test_engine)
+    route = "/api/v1/hotels/{hotel_id}"
+    response = client.get("/api/v1/hotels/missing", headers=admin_token_headers)
+    assert "X-DB-Query-Count" not in response.headers
+
+    monkeypatch.setattr(settings, "SQL_PROFILER_ENABLED", True)
+    monkeypatch.setattr(settings, "SQL_PROFILER_HEADERS", True)
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    requests_before = http_request_db_queries.count(route=route)
+    slow_before = db_slow_queries.value(route=route)
+
+    response = client.get("/api/v1/hotels/missing", headers=admin_token_headers)
+
+    assert response.status_code == 404
+    query_count = int(response.headers["X-DB-Query-Count"])
+    assert query_count >= 1
+    assert float(response.headers["X-DB-Time-Ms"]) > 0
+    assert http_request_db_queries.count(route=route) == requests_before + 1
+    assert db_slow_queries.value(route=route) == slow_before + query_count
+
+
+def test_metrics_add_up_across_workers(tmp_path):
+    """Test that a shared registry renders every worker's counters, and only live workers' gauges"""
+    def worker_registry():
+        registry = MetricsRegistry()
+        registry.register(Counter("test_requests_total", "Requests", ("route",)))
+        registry.register(Histogram("test_seconds", "Latency", buckets=(1,)))
+        registry.register(Gauge("test_in_progress", "In progress"))
+        return registry
+
+    other = worker_registry()
+    other.get("test_requests_total").inc(2, route="/a")
+    other.get("test_seconds").observe(0.5)
+    other.share(str(tmp_path))
+    other.flush()
+
+    # A recycled worker: its counts stay, its gauge is dropped
+    finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead_pid = int(finished.stdout)
+    (tmp_path / f"metrics-{dead_pid}-old.json").write_text(json.dumps({
+        "pid": dead_pid,
+        "worker": f"{dead_pid}-old",
+        "metrics": {
+            "test_requests_total": [[[["route", "/a"]], 1]],
+            "test_in_progress": [[[], 7]],
+        },
+    }))
+
+    registry = worker_registry()
+    registry.get("test_requests_total").inc(route="/a")
+    registry.get("test_seconds").observe(2)
+    registry.get("test_in_progress").set(3)
+    assert 'test_requests_total{route="/a"} 1' in registry.render()
+
+    registry.share(str(tmp_path))
+    body = registry.render()
+    assert 'test_requests_total{route="/a"} 4' in body
+    assert 'test_seconds_bucket{le="1.0"} 1' in body
+    assert "test_seconds_count 2" in body
+    assert "test_seconds_sum 2.5" in body
+    assert "test_in_progress 3" not in body
+    assert 'test_in_progress{worker="' in body
+    assert "} 7" not in body
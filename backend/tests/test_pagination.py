@@ -0,0 +1,48 @@
+# backend/tests/test_pagination.py
+from app.models.user import User
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from tests.conftest import TestingSessionLocal
+
+
+def test_cursor_round_trip():
+    """Test that cursors decode back to typed sort key values"""
+    cursor = encode_cursor(["2025-01-02T03:04:05", "abc"])
+    values = decode_cursor(cursor, (User.created_at, User.id))
+    assert values[0].year == 2025
+    assert values[1] == "abc"
+
+
+def test_invalid_cursor_is_rejected(client, admin_token_headers):
+    """Test that a malformed cursor returns 400"""
+    response = client.get("/api/v1/users?cursor=not-a-cursor", headers=admin_token_headers)
+    assert response.status_code == 400
+
+
+def test_users_keyset_pagination(client, admin_token_headers):
+    """Test that following cursors visits every user exactly once"""
+    db = TestingSessionLocal()
+    for i in range(5):
+        db.add(User(
+            email=f"page{i}@example.com",
+            first_name="Page",
+            last_name=str(i),
+            hashed_password="x",
+            role="guest",
+        ))
+    db.commit()
+    db.close()
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        url = "/api/v1/users?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=admin_token_headers)
+        assert response.status_code == 200
+        seen.extend(user["email"] for user in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+
+    # 5 guests plus the admin
+    assert len(seen) == 6
+    assert len(set(seen)) == 6
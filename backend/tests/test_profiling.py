@@ -0,0 +1,85 @@
+# backend/tests/test_profiling.py
+import time
+
+from app.api import verify
+from app.main import app
+from app.services.credential_service import get_public_keys
+from app.utils.invalidation import InvalidationBus
+from app.utils.sampling_profiler import SamplingProfiler, find_route, profiler
+
+ROUTE = "/api/v1/verify/credential-keys"
+
+
+def slow_public_keys():
+    time.sleep(0.03)
+    return get_public_keys()
+
+
+def test_profiler_samples_route_stacks(client, admin_token_headers, monkeypatch):
+    """Test that a profile session samples one in N requests and serves collapsed stacks"""
+    monkeypatch.setattr(verify, "get_public_keys", slow_public_keys)
+
+    response = client.post("/api/v1/admin/profiler", json={"route": ROUTE})
+    assert response.status_code == 401
+    response = client.post("/api/v1/admin/profiler", json={"route": "/nope"}, headers=admin_token_headers)
+    assert response.status_code == 404
+
+    response = client.post(
+        "/api/v1/admin/profiler",
+        json={"route": ROUTE, "sample_every": 2, "interval_ms": 1, "duration_seconds": 30},
+        headers=admin_token_headers,
+    )
+    assert response.status_code == 201
+    assert response.json()["active"]
+    response = client.post("/api/v1/admin/profiler", json={"route": ROUTE}, headers=admin_token_headers)
+    assert response.status_code == 409
+
+    try:
+        for _ in range(6):
+            assert client.get(ROUTE).status_code == 200
+        client.get("/health")
+    finally:
+        status = client.post("/api/v1/admin/profiler/stop", headers=admin_token_headers).json()
+
+    assert not status["active"]
+    assert status["requests_seen"] == 6
+    assert status["requests_profiled"] == 3
+    assert status["samples"] > 0
+
+    stacks = client.get("/api/v1/admin/profiler/stacks", headers=admin_token_headers).text
+    lines = stacks.splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith(f"GET {ROUTE};app.api.verify:read_credential_keys")
+        assert int(count) > 0
+    assert any("tests.test_profiling:slow_public_keys" in line for line in lines)
+    profiler.session = None
+
+
+def test_profile_sessions_span_workers(tmp_path):
+    """Test that a session started in one worker runs in the others and their stacks are merged"""
+    bus = InvalidationBus()
+    workers = [SamplingProfiler(), SamplingProfiler()]
+    for worker in workers:
+        worker.share(bus, app.routes, str(tmp_path))
+    here, other = workers
+
+    session = here.start(find_route(app.routes, ROUTE, "GET"), "GET", 1, 30, 0.001)
+    assert other.session is not None and other.session.id == session.id
+    assert other.session.active
+    with other.session._lock:
+        other.session.requests_seen = 2
+        other.session.requests_profiled = 2
+        other.session.samples = 5
+        other.session.stacks[f"GET {ROUTE};app.api.verify:read_credential_keys"] = 5
+
+    here.stop()
+    assert not other.session.active
+
+    status = here.status(session)
+    assert not status["active"]
+    assert status["requests_seen"] == 2
+    assert status["samples"] == 5
+    assert status["distinct_stacks"] == 1
+    assert here.collapsed(session) == f"GET {ROUTE};app.api.verify:read_credential_keys 5\n"
@@ -0,0 +1,55 @@
+# backend/tests/test_qr_cache.py
+from app.utils import qr_cache
+from app.utils.cache import LRUCache
+from app.utils.qr_cache import QRCodeCache
+
+
+def test_lru_cache_evicts_by_bytes():
+    """Test that the LRU cache honours its byte budget"""
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.get("a")  # "a" becomes most recently used
+    cache.set("c", b"12345")
+
+    assert cache.get("a") == b"12345"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"12345"
+    assert cache.size_bytes == 10
+
+
+def test_qr_code_rendered_once_per_url(monkeypatch, tmp_path):
+    """Test that repeated lookups for the same URL skip rendering"""
+    renders = []
+    real_render = qr_cache.render_qr_png
+
+    def counting_render(*args, **kwargs):
+        renders.append(args)
+        return real_render(*args, **kwargs)
+
+    monkeypatch.setattr(qr_cache, "render_qr_png", counting_render)
+
+    cache = QRCodeCache(max_entries=8, max_bytes=1024 * 1024, disk_dir=str(tmp_path))
+    first = cache.get_png("https://example.com/pass/1")
+    second = cache.get_png("https://example.com/pass/1")
+
+    assert first == second
+    assert first.startswith(b"\x89PNG")
+    assert len(renders) == 1
+
+    # Different rendering parameters are cached separately
+    cache.get_png("https://example.com/pass/1", box_size=5)
+    assert len(renders) == 2
+
+
+def test_qr_code_disk_tier_survives_restart(monkeypatch, tmp_path):
+    """Test that a fresh cache instance reads PNGs back from disk"""
+    QRCodeCache(max_entries=8, max_bytes=1024 * 1024, disk_dir=str(tmp_path)).get_png("https://example.com/k")
+
+    def fail_render(*args, **kwargs):
+        raise AssertionError("QR code should have been served from disk")
+
+    monkeypatch.setattr(qr_cache, "render_qr_png", fail_render)
+
+    restarted = QRCodeCache(max_entries=8, max_bytes=1024 * 1024, disk_dir=str(tmp_path))
+    assert restarted.get_png("https://example.com/k").startswith(b"\x89PNG")
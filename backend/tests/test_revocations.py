@@ -0,0 +1,129 @@
+# backend/tests/test_revocations.py
+import struct
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.models.digital_key import DigitalKey
+from app.models.key_revocation import KeyRevocation, RevocationFeed
+from app.models.reservation import Reservation, ReservationStatus
+from app.services.key_service import activate_key, deactivate_key
+from app.services.revocation_service import _create_feed, prune_revocations
+from tests.conftest import KEY_UUIDS, TestingSessionLocal
+
+
+def revocations(client, hotel_id, **params):
+    return client.get("/api/v1/verify/revocations", params={"hotel_id": hotel_id, **params})
+
+
+def test_revocation_feed_snapshot_and_delta(client, hotel_keys):
+    """Test that revokes and restores are published as versioned deltas"""
+    hotel_id, key_ids = hotel_keys()
+    db = TestingSessionLocal()
+    deactivate_key(db, key_ids[0])
+    deactivate_key(db, key_ids[1])
+
+    response = revocations(client, hotel_id)
+    assert response.status_code == 200
+    assert response.json() == {
+        "hotel_id": hotel_id, "version": 2, "full": True, "added": sorted(KEY_UUIDS[:2]), "removed": [],
+    }
+    assert response.headers["etag"] == 'W/"2"'
+    assert revocations(client, hotel_id, since=2).status_code == 304
+    assert client.get(
+        "/api/v1/verify/revocations", params={"hotel_id": hotel_id}, headers={"If-None-Match": 'W/"2"'}
+    ).status_code == 304
+
+    # Deactivating again changes nothing
+    deactivate_key(db, key_ids[0])
+    activate_key(db, key_ids[1])
+    deactivate_key(db, key_ids[2])
+    db.close()
+
+    delta = revocations(client, hotel_id, since=2).json()
+    assert delta["version"] == 4
+    assert delta["full"] is False
+    assert delta["added"] == [KEY_UUIDS[2]]
+    assert delta["removed"] == [KEY_UUIDS[1]]
+
+
+def test_binary_feed_applied_by_offline_verifier(client, hotel_keys, offline_verifier):
+    """Test that a lock keeps its deny-set current from binary snapshots and deltas"""
+    hotel_id, key_ids = hotel_keys()
+    db = TestingSessionLocal()
+    deactivate_key(db, key_ids[0])
+
+    snapshot = revocations(client, hotel_id, format="binary")
+    assert snapshot.headers["content-type"] == "application/octet-stream"
+    assert struct.unpack(">BBQII", snapshot.content[:18]) == (1, 0, 1, 1, 0)
+    assert snapshot.content[18:] == uuid.UUID(KEY_UUIDS[0]).bytes
+
+    verifier = offline_verifier.OfflineVerifier("LOCK-401", {})
+    assert verifier.apply_revocation_feed(snapshot.content)
+    assert not verifier.apply_revocation_feed(snapshot.content)
+
+    activate_key(db, key_ids[0])
+    deactivate_key(db, key_ids[1])
+    deactivate_key(db, key_ids[2])
+    db.close()
+
+    delta = revocations(client, hotel_id, since=1, format="binary").content
+    # Header plus three 16-byte key ids
+    assert len(delta) == 18 + 3 * 16
+    assert struct.unpack(">BBQII", delta[:18]) == (1, 1, 4, 2, 1)
+    assert delta[18:50] == b"".join(sorted(uuid.UUID(key_uuid).bytes for key_uuid in KEY_UUIDS[1:]))
+    assert verifier.apply_revocation_feed(delta)
+    assert verifier.revocation_version == 4
+    assert verifier.revoked_count == 2
+
+
+def test_check_out_revokes_keys(client, admin_token_headers, hotel_keys):
+    """Test that checking out adds the reservation's keys to the feed"""
+    hotel_id, key_ids = hotel_keys()
+    db = TestingSessionLocal()
+    reservation_id = db.get(DigitalKey, key_ids[0]).reservation_id
+    db.get(Reservation, reservation_id).status = ReservationStatus.CHECKED_IN
+    db.commit()
+    db.close()
+
+    response = client.patch(f"/api/v1/reservations/{reservation_id}/check-out", headers=admin_token_headers)
+    assert response.status_code == 200
+    assert revocations(client, hotel_id).json()["added"] == sorted(KEY_UUIDS)
+
+
+def test_prune_revocations(client, hotel_keys):
+    """Test that entries past their validity are removed, then compacted away"""
+    hotel_id, key_ids = hotel_keys()
+    db = TestingSessionLocal()
+    deactivate_key(db, key_ids[0])
+    deactivate_key(db, key_ids[1])
+
+    later = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(days=2)
+    assert prune_revocations(db, now=later, retention_seconds=86400) == {"expired": 2, "deleted": 0}
+    delta = revocations(client, hotel_id, since=2).json()
+    assert delta["version"] == 3
+    assert delta["removed"] == sorted(KEY_UUIDS[:2])
+
+    assert prune_revocations(db, now=later + timedelta(days=2), retention_seconds=86400) == {"expired": 0, "deleted": 2}
+    assert db.query(KeyRevocation).count() == 0
+    db.close()
+
+    # Clients behind the compacted history get a full snapshot
+    snapshot = revocations(client, hotel_id, since=1).json()
+    assert snapshot["full"] is True
+    assert snapshot["added"] == []
+    assert revocations(client, hotel_id, since=3).status_code == 304
+
+
+def test_feed_creation_tolerates_a_concurrent_first_revoke(client, hotel_keys):
+    """Test that creating a hotel's feed row is a no-op when another transaction just created it"""
+    hotel_id, key_ids = hotel_keys()
+    other = TestingSessionLocal()
+    other.add(RevocationFeed(hotel_id=hotel_id, version=0, compacted_version=0))
+    other.commit()
+    other.close()
+
+    db = TestingSessionLocal()
+    _create_feed(db, hotel_id)
+    deactivate_key(db, key_ids[0])
+    assert db.query(RevocationFeed).filter(RevocationFeed.hotel_id == hotel_id).one().version == 1
+    db.close()
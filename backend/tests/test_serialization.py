@@ -0,0 +1,58 @@
+# backend/tests/test_serialization.py
+import json
+from datetime import datetime
+
+from sqlalchemy.orm import joinedload
+
+from app.models.digital_key import DigitalKey, KeyStatus
+from app.models.reservation import Reservation
+from app.schemas.digital_key import DigitalKey as DigitalKeySchema
+from app.schemas.reservation import Reservation as ReservationSchema
+from app.utils import serialization
+from app.utils.pagination import NEXT_CURSOR_HEADER
+from tests.conftest import KEY_UUIDS, TestingSessionLocal
+
+
+def schema_json(schema, objects):
+    """What a response_model produces for ORM objects"""
+    return [schema.model_validate(obj).model_dump(mode="json") for obj in objects]
+
+
+def test_list_endpoints_match_response_schemas(client, admin_token_headers, hotel_keys):
+    """Test that the projected key and reservation lists render exactly as the schemas would"""
+    hotel_keys()
+    db = TestingSessionLocal()
+    try:
+        keys = db.query(DigitalKey).order_by(DigitalKey.created_at.desc(), DigitalKey.id.desc()).all()
+        expected_keys = schema_json(DigitalKeySchema, keys)
+        reservations = db.query(Reservation).options(joinedload(Reservation.room)).all()
+        expected_reservations = schema_json(ReservationSchema, reservations)
+    finally:
+        db.close()
+
+    assert expected_keys[0]["reservation"]["room"]["hotel"]["name"] == "Test Hotel"
+    response = client.get("/api/v1/reservations", headers=admin_token_headers)
+    assert response.status_code == 200
+    assert response.json() == expected_reservations
+
+    pages = []
+    cursor = None
+    for _ in range(len(KEY_UUIDS)):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/keys", params=params, headers=admin_token_headers)
+        assert response.status_code == 200
+        pages.extend(response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+    assert pages == expected_keys
+
+
+def test_fast_json_falls_back_to_json(monkeypatch):
+    """Test that the standard library renders the same content when orjson is missing"""
+    content = [{"id": "k1", "status": KeyStatus.ACTIVE, "valid_from": datetime(2026, 1, 2, 3, 4, 5, 678)}]
+    rendered = serialization.FastJSONResponse(content).body
+    monkeypatch.setattr(serialization, "orjson", None)
+    fallback = serialization.FastJSONResponse(content).body
+    assert json.loads(fallback) == json.loads(rendered)
+    assert json.loads(fallback)[0] == {"id": "k1", "status": "active", "valid_from": "2026-01-02T03:04:05.000678"}
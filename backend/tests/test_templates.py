@@ -0,0 +1,42 @@
+# backend/tests/test_templates.py
+from app.config import settings
+from app.services.template_service import TemplateRegistry, templates_dir
+
+
+def test_registry_precompiles_all_templates():
+    """Test that warming compiles every template in the templates directory"""
+    registry = TemplateRegistry(templates_dir)
+    assert registry.warm() == len(list(templates_dir.glob("*.html")))
+    assert "email_key.html" in registry._templates
+
+
+def test_render_for_hotel_binds_branding_once(monkeypatch):
+    """Test that hotel branding is loaded once and reused for every render"""
+    registry = TemplateRegistry(templates_dir)
+    loads = []
+
+    def fake_load(hotel_id):
+        loads.append(hotel_id)
+        return {"hotel_name": "Seaside Inn", "hotel_logo_url": "", "hotel_website": "https://seaside.example"}
+
+    monkeypatch.setattr(registry, "_load_hotel_context", fake_load)
+
+    for _ in range(3):
+        html = registry.render_for_hotel(
+            "email_download.html", "hotel-1", guest_name="Ada", download_url="https://x/dl"
+        )
+
+    assert loads == ["hotel-1"]
+    assert "Seaside Inn" in html
+    assert "Hello Ada" in html
+
+    registry.invalidate_hotel("hotel-1")
+    registry.render_for_hotel("email_download.html", "hotel-1", guest_name="Ada", download_url="u")
+    assert loads == ["hotel-1", "hotel-1"]
+
+
+def test_render_without_hotel_uses_default_branding():
+    """Test that emails without a hotel fall back to the configured hotel name"""
+    registry = TemplateRegistry(templates_dir)
+    html = registry.render_for_hotel("welcome_email.html", first_name="Ada")
+    assert f"Welcome to {settings.HOTEL_NAME}" in html
@@ -1,6 +1,15 @@
 # backend/tests/test_users.py
+import threading
+
 import pytest
 from fastapi.testclient import TestClient
+from jose import jwt
+
+from app import security
+from app.config import settings
+from app.models.user import User
+from app.utils.worker_pool import BoundedWorkerPool, PoolSaturatedError
+from tests.conftest import TestingSessionLocal
 
 
 def test_read_users_me(client, user_token_headers, db_user):
@@ -146,3 +155,65 @@ def test_login_access_token(client, db_user, test_user):
     login_data["password"] = "wrong-password"
     response = client.post("/api/v1/auth/login", data=login_data)
     assert response.status_code == 401  # Unauthorized
+
+
+def test_access_token_subject_is_user_id(client, admin_token_headers, db_admin):
+    """Test that access tokens identify the user by id"""
+    token = admin_token_headers["Authorization"].split(" ", 1)[1]
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    assert payload["sub"] == db_admin.id
+
+
+def test_admin_permission_check_uses_cached_principal(client, admin_token_headers, monkeypatch):
+    """Test that repeated admin requests resolve the user without the database"""
+    security.invalidate_user_principal()
+    assert client.get("/api/v1/users", headers=admin_token_headers).status_code == 200
+
+    def fail_lookup(db, subject):
+        raise AssertionError("principal should have been served from the cache")
+
+    monkeypatch.setattr(security, "get_user_by_subject", fail_lookup)
+    assert client.get("/api/v1/users", headers=admin_token_headers).status_code == 200
+
+
+def test_delete_user_invalidates_principal(client, admin_token_headers, user_token_headers, db_user):
+    """Test that a deactivated user is rejected immediately"""
+    assert client.get("/api/v1/users/me", headers=user_token_headers).status_code == 200
+
+    response = client.delete(f"/api/v1/users/{db_user.id}", headers=admin_token_headers)
+    assert response.status_code == 204
+
+    response = client.get("/api/v1/users/me", headers=user_token_headers)
+    assert response.status_code == 403
+
+
+def test_login_rehashes_outdated_password_hash(client, db_user, test_user):
+    """Test that logging in upgrades a hash created with different bcrypt rounds"""
+    db = TestingSessionLocal()
+    user = db.get(User, db_user.id)
+    user.hashed_password = security.pwd_context.copy(bcrypt__rounds=4).hash(test_user["password"])
+    db.commit()
+
+    login_data = {"username": test_user["email"], "password": test_user["password"]}
+    response = client.post("/api/v1/auth/login", data=login_data)
+    assert response.status_code == 200
+
+    db.refresh(user)
+    assert not security.pwd_context.needs_update(user.hashed_password)
+    assert security.pwd_context.verify(test_user["password"], user.hashed_password)
+    db.close()
+
+
+def test_password_pool_rejects_when_saturated():
+    """Test that the bounded password pool rejects jobs beyond its backlog"""
+    pool = BoundedWorkerPool("test_pool", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        pool.submit(release.wait)
+        pool.submit(release.wait)
+        with pytest.raises(PoolSaturatedError):
+            pool.submit(release.wait)
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.queue_depth == 0
@@ -0,0 +1,69 @@
+# backend/tests/test_verification.py
+from datetime import datetime, timedelta, timezone
+
+from app.models.digital_key import DigitalKey
+from app.models.key_event import KeyEvent
+from app.services.key_service import deactivate_key
+from tests.conftest import KEY_UUIDS, TestingSessionLocal
+
+
+def test_verify_key_batch(client, hotel_keys):
+    """Test that batched taps get the same decisions as single verification"""
+    _, key_ids = hotel_keys()
+    db = TestingSessionLocal()
+    deactivate_key(db, key_ids[2])
+    db.close()
+
+    taps = [
+        {"key_uuid": KEY_UUIDS[0], "lock_id": "LOCK-401"},
+        {"key_uuid": KEY_UUIDS[0], "lock_id": "LOCK-999"},
+        {"key_uuid": KEY_UUIDS[2], "lock_id": "LOCK-401"},
+        {"key_uuid": "missing-key", "lock_id": "LOCK-401"},
+        {"key_uuid": KEY_UUIDS[0], "lock_id": "LOCK-401"},
+    ]
+    response = client.post("/api/v1/verify/keys", json={"taps": taps})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [(result["is_valid"], result["reason"]) for result in results] == [
+        (True, None), (False, "lock_mismatch"), (False, "key_inactive"), (False, "key_not_found"), (True, None),
+    ]
+    assert results[0]["room_number"] == "401"
+    assert results[0]["guest_name"] == "Guest User"
+
+    for tap in taps:
+        single = client.post("/api/v1/verify/key", json=tap).json()
+        assert single["is_valid"] == results[taps.index(tap)]["is_valid"]
+
+    db = TestingSessionLocal()
+    assert db.get(DigitalKey, key_ids[0]).access_count == 4
+    assert db.query(KeyEvent).filter(KeyEvent.lock_id == "LOCK-999").count() == 2
+    db.close()
+
+
+def test_verify_key_batch_limit(client, monkeypatch):
+    """Test that oversized batches are rejected"""
+    monkeypatch.setattr("app.api.verify.settings.KEY_VERIFICATION_MAX_BATCH", 2)
+    taps = [{"key_uuid": "k", "lock_id": "L"}] * 3
+    assert client.post("/api/v1/verify/keys", json={"taps": taps}).status_code == 413
+
+
+def test_validity_window_is_utc_on_every_path(client, hotel_keys):
+    """Test that single and batched verification agree on validity bounds, read as UTC"""
+    _, key_ids = hotel_keys()
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    db = TestingSessionLocal()
+    # Ends in 30 minutes UTC, which is already past in Europe/Paris local time
+    db.get(DigitalKey, key_ids[0]).valid_until = now + timedelta(minutes=30)
+    # Starts in 30 minutes UTC, which is already past in Europe/Paris local time
+    db.get(DigitalKey, key_ids[1]).valid_from = now + timedelta(minutes=30)
+    db.get(DigitalKey, key_ids[2]).valid_until = now - timedelta(minutes=1)
+    db.commit()
+    db.close()
+
+    taps = [{"key_uuid": key_uuid, "lock_id": "LOCK-401"} for key_uuid in KEY_UUIDS]
+    expected = [True, False, False]
+    batch = client.post("/api/v1/verify/keys", json={"taps": taps}).json()["results"]
+    assert [result["is_valid"] for result in batch] == expected
+    assert [result["reason"] for result in batch[1:]] == ["outside_validity_period"] * 2
+    single = [client.post("/api/v1/verify/key", json=tap).json()["is_valid"] for tap in taps]
+    assert single == expected
@@ -3,6 +3,14 @@ import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { API_URL } from '../config';
 
+// Event details are stored as a JSON object, e.g. {"reason": "key_inactive"}
+const formatDetails = (details) => {
+  if (typeof details !== 'object') return details;
+  return Object.entries(details)
+    .map(([name, value]) => `${name.replace(/_/g, ' ')}: ${typeof value === 'object' ? JSON.stringify(value) : value}`)
+    .join(', ');
+};
+
 function KeyEventsList({ keyId }) {
   const [events, setEvents] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -190,7 +198,7 @@ function KeyEventsList({ keyId }) {
                           </p>
                           {event.details && (
                             <p className="mt-0.5 text-sm text-gray-500">
-                              {event.details}
+                              {formatDetails(event.details)}
                             </p>
                           )}
                         </div>
@@ -1,10 +1,11 @@
 # nfc_simulator/app.py
 import os
-import requests
-import json
 import logging
-import time
+import threading
+from collections import OrderedDict, deque
 from datetime import datetime
+
+import httpx
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
 from flask_socketio import SocketIO, emit
 
@@ -23,17 +24,101 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 API_URL = os.getenv('API_URL', 'http://backend:8000/api/v1')
 DEFAULT_DEVICE_INFO = os.getenv('DEVICE_INFO', 'NFC Simulator')
 DEFAULT_LOCATION = os.getenv('LOCATION', 'Main Entrance')
+HISTORY_SIZE = int(os.getenv('HISTORY_SIZE', 100))
+MAX_LOCKS = int(os.getenv('MAX_LOCKS', 1000))
+# Scans in flight against the backend, also the connection pool size
+SCAN_CONCURRENCY = int(os.getenv('SCAN_CONCURRENCY', 20))
+
+# One keep-alive connection pool shared by every scan
+http_client = httpx.Client(
+    base_url=API_URL,
+    timeout=10,
+    limits=httpx.Limits(max_connections=SCAN_CONCURRENCY, max_keepalive_connections=SCAN_CONCURRENCY),
+)
+scan_slots = threading.BoundedSemaphore(SCAN_CONCURRENCY)
+
+# Simulated locks by lock ID
+locks = OrderedDict()
+
+# Most recent verifications first; older entries fall off the end
+verification_history = deque(maxlen=HISTORY_SIZE)
+history_lock = threading.Lock()
+
+def history_snapshot():
+    """Copy of the history that is safe to iterate while scans keep recording"""
+    with history_lock:
+        return list(verification_history)
+
+def verify_key(key_uuid, lock_id, device_info=DEFAULT_DEVICE_INFO, location=DEFAULT_LOCATION):
+    """
+    Verify a key with the backend API and record the result in the history
+
+    Returns:
+        The history entry
+
+    Raises:
+        httpx.HTTPError: If the backend can't be reached
+    """
+    with scan_slots:
+        response = http_client.post('/verify/key', json={
+            'key_uuid': key_uuid,
+            'lock_id': lock_id,
+            'device_info': device_info,
+            'location': location
+        })
+    result = response.json()
+
+    verification_entry = {
+        'timestamp': datetime.now().isoformat(),
+        'key_uuid': key_uuid,
+        'lock_id': lock_id,
+        'result': result,
+        'status': 'success' if result.get('is_valid', False) else 'error'
+    }
+    with history_lock:
+        verification_history.appendleft(verification_entry)
+    return verification_entry
+
+def scan_and_emit(key_uuid, lock_id, device_info, location, sid, results=None):
+    """Background scan: broadcast the result, or send the error to the client that asked"""
+    try:
+        verification_entry = verify_key(key_uuid, lock_id, device_info, location)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.error(f"Error verifying key: {e}")
+        socketio.emit('error', {'message': f'Error communicating with API: {str(e)}', 'lock_id': lock_id}, to=sid)
+        return
+    if results is not None:
+        results.append(verification_entry)
+    socketio.emit('verification_result', verification_entry)
 
-# Store simulated locks
-locks = []
+def scan_all_locks(key_uuid, device_info, sid):
+    """Scan one key on every lock, SCAN_CONCURRENCY at a time, emitting each result as it arrives"""
+    targets = deque(locks.values())
+    total = len(targets)
+    results = []
 
-# Store verification history
-verification_history = []
+    def worker():
+        while True:
+            try:
+                lock = targets.popleft()
+            except IndexError:
+                return
+            scan_and_emit(key_uuid, lock['lock_id'], device_info, lock['location'], sid, results)
+
+    workers = [socketio.start_background_task(worker) for _ in range(min(SCAN_CONCURRENCY, total))]
+    for task in workers:
+        task.join()
+    socketio.emit('scan_all_complete', {
+        'key_uuid': key_uuid,
+        'locks': total,
+        'granted': sum(1 for entry in results if entry['status'] == 'success'),
+        'failed': total - len(results),
+    }, to=sid)
 
 @app.route('/')
 def index():
     """Render the main NFC simulator interface"""
-    return render_template('index.html', locks=locks, history=verification_history)
+    return render_template('index.html', locks=list(locks.values()), history=history_snapshot())
 
 @app.route('/locks', methods=['GET', 'POST'])
 def manage_locks():
@@ -48,28 +133,30 @@ def manage_locks():
             return redirect(url_for('manage_locks'))
         
         # Check if lock already exists
-        for lock in locks:
-            if lock['lock_id'] == lock_id:
-                flash(f'Lock ID {lock_id} already exists', 'error')
-                return redirect(url_for('manage_locks'))
+        if lock_id in locks:
+            flash(f'Lock ID {lock_id} already exists', 'error')
+            return redirect(url_for('manage_locks'))
+        
+        if len(locks) >= MAX_LOCKS:
+            flash(f'At most {MAX_LOCKS} locks can be simulated', 'error')
+            return redirect(url_for('manage_locks'))
         
         # Add new lock
-        locks.append({
+        locks[lock_id] = {
             'lock_id': lock_id,
             'location': location,
             'description': description,
             'created_at': datetime.now().isoformat()
-        })
+        }
         flash(f'Lock {lock_id} added successfully', 'success')
         return redirect(url_for('manage_locks'))
     
-    return render_template('locks.html', locks=locks)
+    return render_template('locks.html', locks=list(locks.values()))
 
 @app.route('/locks/<lock_id>/delete', methods=['POST'])
 def delete_lock(lock_id):
     """Delete a simulated lock"""
-    global locks
-    locks = [lock for lock in locks if lock['lock_id'] != lock_id]
+    locks.pop(lock_id, None)
     flash(f'Lock {lock_id} deleted successfully', 'success')
     return redirect(url_for('manage_locks'))
 
@@ -88,39 +175,15 @@ def simulate_nfc():
         
         try:
             # Verify key with the backend API
-            response = requests.post(
-                f"{API_URL}/verify/key",
-                json={
-                    'key_uuid': key_uuid,
-                    'lock_id': lock_id,
-                    'device_info': device_info,
-                    'location': location
-                }
-            )
-            
-            result = response.json()
-            
-            # Add to verification history
-            verification_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'key_uuid': key_uuid,
-                'lock_id': lock_id,
-                'result': result,
-                'status': 'success' if result.get('is_valid', False) else 'error'
-            }
-            verification_history.insert(0, verification_entry)
-            
-            # Keep history limited to last 100 entries
-            if len(verification_history) > 100:
-                verification_history.pop()
+            verification_entry = verify_key(key_uuid, lock_id, device_info, location)
             
             # Emit event to connected clients
             socketio.emit('verification_result', verification_entry)
             
             return render_template(
                 'simulate.html',
-                locks=locks,
-                result=result,
+                locks=list(locks.values()),
+                result=verification_entry['result'],
                 form_data={
                     'key_uuid': key_uuid,
                     'lock_id': lock_id,
@@ -129,14 +192,14 @@ def simulate_nfc():
                 }
             )
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
             logger.error(f"Error verifying key: {e}")
             flash(f'Error communicating with API: {str(e)}', 'error')
             return redirect(url_for('simulate_nfc'))
     
     # For GET requests, show the form
     lock_id = request.args.get('lock_id', '')
-    return render_template('simulate.html', locks=locks, lock_id=lock_id)
+    return render_template('simulate.html', locks=list(locks.values()), lock_id=lock_id)
 
 @app.route('/api/verify', methods=['POST'])
 def api_verify_key():
@@ -150,38 +213,19 @@ def api_verify_key():
     
     try:
         # Verify key with the backend API
-        response = requests.post(
-            f"{API_URL}/verify/key",
-            json={
-                'key_uuid': data.get('key_uuid'),
-                'lock_id': data.get('lock_id'),
-                'device_info': data.get('device_info', DEFAULT_DEVICE_INFO),
-                'location': data.get('location', DEFAULT_LOCATION)
-            }
+        verification_entry = verify_key(
+            data.get('key_uuid'),
+            data.get('lock_id'),
+            data.get('device_info', DEFAULT_DEVICE_INFO),
+            data.get('location', DEFAULT_LOCATION)
         )
         
-        result = response.json()
-        
-        # Add to verification history
-        verification_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'key_uuid': data.get('key_uuid'),
-            'lock_id': data.get('lock_id'),
-            'result': result,
-            'status': 'success' if result.get('is_valid', False) else 'error'
-        }
-        verification_history.insert(0, verification_entry)
-        
-        # Keep history limited to last 100 entries
-        if len(verification_history) > 100:
-            verification_history.pop()
-        
         # Emit event to connected clients
         socketio.emit('verification_result', verification_entry)
         
-        return jsonify(result)
+        return jsonify(verification_entry['result'])
         
-    except requests.RequestException as e:
+    except (httpx.HTTPError, ValueError) as e:
         logger.error(f"Error verifying key: {e}")
         return jsonify({
             'error': 'API communication error',
@@ -191,13 +235,13 @@ def api_verify_key():
 @app.route('/history')
 def view_history():
     """View verification history"""
-    return render_template('history.html', history=verification_history)
+    return render_template('history.html', history=history_snapshot())
 
 @app.route('/history/clear', methods=['POST'])
 def clear_history():
     """Clear verification history"""
-    global verification_history
-    verification_history = []
+    with history_lock:
+        verification_history.clear()
     flash('History cleared successfully', 'success')
     return redirect(url_for('view_history'))
 
@@ -218,65 +262,54 @@ def handle_scan_key(data):
     lock_id = data.get('lock_id')
     if key_uuid and lock_id:
         logger.info(f'Scanning key {key_uuid} for lock {lock_id}')
-        
-        try:
-            # Verify key with the backend API
-            response = requests.post(
-                f"{API_URL}/verify/key",
-                json={
-                    'key_uuid': key_uuid,
-                    'lock_id': lock_id,
-                    'device_info': data.get('device_info', DEFAULT_DEVICE_INFO),
-                    'location': data.get('location', DEFAULT_LOCATION)
-                }
-            )
-            
-            result = response.json()
-            
-            # Add to verification history
-            verification_entry = {
-                'timestamp': datetime.now().isoformat(),
-                'key_uuid': key_uuid,
-                'lock_id': lock_id,
-                'result': result,
-                'status': 'success' if result.get('is_valid', False) else 'error'
-            }
-            verification_history.insert(0, verification_entry)
-            
-            # Keep history limited to last 100 entries
-            if len(verification_history) > 100:
-                verification_history.pop()
-            
-            # Emit result to all clients
-            emit('verification_result', verification_entry, broadcast=True)
-            
-        except requests.RequestException as e:
-            logger.error(f"Error verifying key: {e}")
-            emit('error', {'message': f'Error communicating with API: {str(e)}'})
+        # Verify in the background so the Socket.IO loop keeps serving other clients
+        socketio.start_background_task(
+            scan_and_emit,
+            key_uuid,
+            lock_id,
+            data.get('device_info', DEFAULT_DEVICE_INFO),
+            data.get('location', DEFAULT_LOCATION),
+            request.sid
+        )
     else:
         emit('error', {'message': 'Key UUID and Lock ID are required'})
 
+@socketio.on('scan_all_locks')
+def handle_scan_all_locks(data):
+    """Scan one key on every simulated lock; results are emitted as they complete"""
+    key_uuid = data.get('key_uuid')
+    if not key_uuid:
+        emit('error', {'message': 'Key UUID is required'})
+        return
+    if not locks:
+        emit('error', {'message': 'No locks to scan'})
+        return
+    logger.info(f'Scanning key {key_uuid} on {len(locks)} locks')
+    socketio.start_background_task(
+        scan_all_locks, key_uuid, data.get('device_info', DEFAULT_DEVICE_INFO), request.sid
+    )
+
 if __name__ == '__main__':
     # Add some default locks
     if not locks:
-        locks.append({
+        locks['LOCK-A123B456'] = {
             'lock_id': 'LOCK-A123B456',
             'location': 'Main Entrance',
             'description': 'Front Door',
             'created_at': datetime.now().isoformat()
-        })
-        locks.append({
+        }
+        locks['LOCK-B789C012'] = {
             'lock_id': 'LOCK-B789C012',
             'location': 'Room 101',
             'description': 'Standard Room',
             'created_at': datetime.now().isoformat()
-        })
-        locks.append({
+        }
+        locks['LOCK-D345E678'] = {
             'lock_id': 'LOCK-D345E678',
             'location': 'Room 201',
             'description': 'Deluxe Room',
             'created_at': datetime.now().isoformat()
-        })
+        }
     
     # Run the Flask application with SocketIO
     port = int(os.getenv('PORT', 5000))
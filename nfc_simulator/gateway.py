@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Lock gateway simulation
+
+A gateway sits between many locks and the backend. Instead of one
+/verify/key request per tap it collects taps for a short window (or until a
+batch is full) and verifies them with a single /verify/keys request. Verdicts
+are cached per (key, lock) for a few seconds, and identical taps inside one
+window share a single upstream check, so a guest tapping twice at a door
+reaches the backend once. Taps answered locally are uploaded as access logs
+like offline decisions, so the event trail stays complete.
+
+run_comparison() replays the same tap trace through hundreds of NFCSimulator
+locks twice, once calling the backend per tap and once through a gateway, and
+reports upstream requests, latency and any verdicts that differ.
+"""
+
+import concurrent.futures
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from tabulate import tabulate
+
+from load_test import LoadRun, SeededKey, new_histogram, parse_mix
+from offline_verifier import AccessLogBuffer, Verdict
+from simulator import NFCSimulator
+
+logger = logging.getLogger("nfc_simulator.gateway")
+
+DEFAULT_WINDOW_MS = 50
+DEFAULT_MAX_BATCH = 200
+DEFAULT_CACHE_TTL = 5.0
+# Expired cache entries are swept once the cache grows past this
+CACHE_SWEEP_SIZE = 10_000
+# Recent taps a repeated tap is drawn from
+REPEAT_WINDOW = 50
+
+
+@dataclass
+class GatewayStats:
+    taps: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    batches: int = 0
+    log_uploads: int = 0
+
+    @property
+    def upstream_requests(self) -> int:
+        return self.batches + self.log_uploads
+
+
+class Gateway:
+    """Aggregate taps from many locks into batched /verify/keys requests"""
+
+    def __init__(
+        self,
+        api_url: str,
+        window: float = DEFAULT_WINDOW_MS / 1000,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        device_info: str = "NFC Gateway",
+        location: str = "Gateway",
+    ):
+        """
+        Args:
+            api_url: Backend API base URL
+            window: Seconds to wait for more taps after the first one of a batch
+            max_batch: Taps per upstream request
+            cache_ttl: Seconds a verdict is reused for the same key and lock (0 disables)
+        """
+        self.api_url = api_url
+        self.window = window
+        self.max_batch = max_batch
+        self.cache_ttl = cache_ttl
+        self.session = requests.Session()
+        self.stats = GatewayStats()
+        self.access_logs = AccessLogBuffer(api_url, self.session, None, device_info, location)
+
+        self._cache: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+        self._inflight: Dict[Tuple[str, str], concurrent.futures.Future] = {}
+        self._pending: List[Tuple[Dict, concurrent.futures.Future]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="gateway-uplink", daemon=True)
+        self._thread.start()
+
+    def verify(self, lock_id: str, key_uuid: str, device_info: Optional[str] = None,
+               location: Optional[str] = None, timeout: float = 30) -> Dict:
+        """Verify a tap, blocking until its batch comes back (or answering from the cache)"""
+        cache_key = (key_uuid, lock_id)
+        result = future = None
+        with self._lock:
+            self.stats.taps += 1
+            cached = self._cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                self.stats.cache_hits += 1
+                result, shared = cached[1], True
+            else:
+                future = self._inflight.get(cache_key)
+                shared = future is not None
+                if shared:
+                    self.stats.coalesced += 1
+                else:
+                    future = concurrent.futures.Future()
+                    self._inflight[cache_key] = future
+                    tap = {"key_uuid": key_uuid, "lock_id": lock_id, "device_info": device_info, "location": location}
+                    self._pending.append((tap, future))
+                    if len(self._pending) == 1 or len(self._pending) >= self.max_batch:
+                        self._wakeup.notify()
+
+        if future is not None:
+            result = future.result(timeout)
+        if not shared:
+            return result
+        # The backend didn't see this tap; report it like an offline decision
+        self.access_logs.record(Verdict(result["is_valid"], result.get("reason") or "cached", key_uuid), lock_id=lock_id)
+        return {**result, "cached": True}
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopped:
+                    self._wakeup.wait()
+                if not self._pending:
+                    return
+                # Let the window fill up unless the batch is already full
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch and not self._stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wakeup.wait(remaining)
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self._send(batch)
+            if len(self.access_logs) >= self.access_logs.max_batch:
+                self._upload_logs()
+
+    def _send(self, batch: List[Tuple[Dict, concurrent.futures.Future]]) -> None:
+        try:
+            response = self.session.post(f"{self.api_url}/verify/keys", json={"taps": [tap for tap, _ in batch]})
+            response.raise_for_status()
+            results = response.json()["results"]
+            cacheable = self.cache_ttl > 0
+        except (requests.RequestException, ValueError, KeyError) as e:
+            logger.error(f"Gateway uplink failed for {len(batch)} taps: {e}")
+            results = [{"is_valid": False, "message": f"Gateway uplink error: {e}", "reason": "uplink_error"}] * len(batch)
+            cacheable = False
+
+        now = time.monotonic()
+        with self._lock:
+            self.stats.batches += 1
+            for (tap, _), result in zip(batch, results):
+                cache_key = (tap["key_uuid"], tap["lock_id"])
+                self._inflight.pop(cache_key, None)
+                if cacheable:
+                    self._cache[cache_key] = (now + self.cache_ttl, result)
+            if len(self._cache) > CACHE_SWEEP_SIZE:
+                self._cache = {key: entry for key, entry in self._cache.items() if entry[0] > now}
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _upload_logs(self) -> None:
+        if len(self.access_logs):
+            self.access_logs.flush()
+            with self._lock:
+                self.stats.log_uploads += 1
+
+    def close(self) -> None:
+        """Send pending taps, stop the uplink thread and upload buffered access logs"""
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify()
+        self._thread.join()
+        self._upload_logs()
+
+
+def build_trace(keys: List[SeededKey], mix: str, taps: int, repeat_ratio: float, seed: Optional[int]) -> List[Tuple[str, str]]:
+    """
+    Tap sequence of (lock_id, key_uuid)
+
+    A repeat_ratio share of taps repeats one of the last few taps, like a
+    guest tapping again at the same door.
+    """
+    rng = random.Random(seed)
+    generator = LoadRun(keys, parse_mix(mix), rng)
+    trace = []
+    for _ in range(taps):
+        if trace and rng.random() < repeat_ratio:
+            trace.append(rng.choice(trace[-REPEAT_WINDOW:]))
+        else:
+            _, key_uuid, lock_id = generator.next_tap()
+            trace.append((lock_id, key_uuid))
+    return trace
+
+
+def replay(api_url: str, trace: List[Tuple[str, str]], rate: float, concurrency: int,
+           gateway: Optional[Gateway] = None) -> Dict:
+    """
+    Replay a trace open-loop through one NFCSimulator per lock
+
+    Returns:
+        Verdicts in trace order, latency histogram and elapsed seconds
+    """
+    locks = {}
+    for lock_id, _ in trace:
+        if lock_id not in locks:
+            locks[lock_id] = NFCSimulator(api_url, lock_id, "NFC load test", "Load test")
+            if gateway:
+                locks[lock_id].attach_gateway(gateway)
+
+    histogram = new_histogram()
+    verdicts: List[Optional[bool]] = [None] * len(trace)
+
+    def tap(index: int, due: float) -> None:
+        lock_id, key_uuid = trace[index]
+        verdicts[index] = locks[lock_id].verify_key(key_uuid)["is_valid"]
+        histogram.record_value(max(int((time.perf_counter() - due) * 1_000_000), 1))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        futures = []
+        for index in range(len(trace)):
+            due = start + index / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(tap, index, due))
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    return {"verdicts": verdicts, "histogram": histogram, "elapsed": elapsed, "locks": len(locks)}
+
+
+def run_comparison(
+    api_url: str,
+    keys: List[SeededKey],
+    rate: float,
+    duration: float,
+    concurrency: int,
+    mix: str,
+    repeat_ratio: float = 0.2,
+    window_ms: float = DEFAULT_WINDOW_MS,
+    max_batch: int = DEFAULT_MAX_BATCH,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+    seed: Optional[int] = None,
+) -> str:
+    """Replay one trace per tap and through a gateway; returns the report"""
+    trace = build_trace(keys, mix, int(rate * duration), repeat_ratio, seed)
+
+    # One log line per tap would drown the report
+    simulator_logger = logging.getLogger("nfc_simulator")
+    level = simulator_logger.level
+    simulator_logger.setLevel(logging.WARNING)
+    try:
+        per_tap = replay(api_url, trace, rate, concurrency)
+        gateway = Gateway(api_url, window=window_ms / 1000, max_batch=max_batch, cache_ttl=cache_ttl)
+        try:
+            batched = replay(api_url, trace, rate, concurrency, gateway)
+        finally:
+            gateway.close()
+    finally:
+        simulator_logger.setLevel(level)
+
+    stats = gateway.stats
+    mismatches = sum(1 for a, b in zip(per_tap["verdicts"], batched["verdicts"]) if a != b)
+    rows = []
+    for mode, run, requests_sent, hits in (
+        ("per-tap", per_tap, len(trace), "-"),
+        ("gateway", batched, stats.upstream_requests, f"{stats.cache_hits} + {stats.coalesced} coalesced"),
+    ):
+        histogram = run["histogram"]
+        rows.append([
+            mode, len(trace), requests_sent, f"{requests_sent / len(trace):.3f}", hits,
+            sum(1 for verdict in run["verdicts"] if verdict),
+        ] + [f"{histogram.get_value_at_percentile(p) / 1000:.1f}" for p in (50, 95, 99)] + [
+            f"{len(trace) / run['elapsed']:.1f}",
+        ])
+    table = tabulate(rows, headers=[
+        "Mode", "Taps", "Upstream requests", "Requests/tap", "Cache hits", "Granted",
+        "p50 ms", "p95 ms", "p99 ms", "Taps/s",
+    ])
+    return (
+        f"{table}\n\n{per_tap['locks']} locks, {len(trace)} taps at {rate:g}/s, {repeat_ratio:.0%} repeats; "
+        f"gateway window {window_ms:g} ms, batch {max_batch}, cache {cache_ttl:g}s: "
+        f"{stats.batches} batches, {stats.log_uploads} access log uploads.\n"
+        f"Verdicts differing from per-tap mode: {mismatches}"
+    )
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Load generation for the key verification endpoint
+
+Seeds a hotel with N rooms (one lock each), reservations and keys through the
+API, then fires taps at /verify/key from an asyncio client at a fixed target
+rate. Each tap is one of:
+    valid       an active key at its own lock (expected: granted)
+    expired     a key whose reservation has ended (expected: denied)
+    wrong_lock  an active key at another room's lock (expected: denied)
+    unknown     a random key UUID (expected: denied)
+
+Taps are scheduled open-loop: latency is measured from the moment a tap was
+due, not from when a connection became free, so a slow backend shows up in
+the percentiles instead of silently lowering the request rate. Latencies are
+recorded in HDR histograms (microseconds, 3 significant digits).
+
+Run through simulator.py --load; see the README for the options.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import httpx
+from hdrh.histogram import HdrHistogram
+from tabulate import tabulate
+
+logger = logging.getLogger("nfc_simulator.load")
+
+TAP_KINDS = ("valid", "expired", "wrong_lock", "unknown")
+DEFAULT_MIX = "valid=0.7,expired=0.1,wrong_lock=0.1,unknown=0.1"
+# Share of seeded keys whose reservation is already over
+EXPIRED_KEY_RATIO = 0.1
+SEED_CONCURRENCY = 8
+
+HISTOGRAM_MAX_US = 60_000_000
+HISTOGRAM_DIGITS = 3
+
+
+@dataclass
+class SeededKey:
+    key_uuid: str
+    lock_id: str
+    expired: bool
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse a tap mix like "valid=0.7,unknown=0.3" into normalized weights"""
+    weights = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in TAP_KINDS:
+            raise ValueError(f"Unknown tap kind {kind!r}, expected one of {', '.join(TAP_KINDS)}")
+        weights[kind] = float(weight)
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Tap mix weights must add up to more than 0")
+    return {kind: weight / total for kind, weight in weights.items() if weight > 0}
+
+
+def new_histogram() -> HdrHistogram:
+    return HdrHistogram(1, HISTOGRAM_MAX_US, HISTOGRAM_DIGITS)
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> None:
+    response = await client.post("/auth/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def seed_keys(
+    client: httpx.AsyncClient,
+    count: int,
+    admin_email: str,
+    admin_password: str,
+    pass_type: str = "google",
+) -> List[SeededKey]:
+    """
+    Create a hotel, one room and lock per key, reservations and keys
+
+    Every key belongs to a single load-test guest; roughly EXPIRED_KEY_RATIO
+    of them get a reservation that ended yesterday.
+    """
+    await _login(client, admin_email, admin_password)
+    run_id = uuid.uuid4().hex[:8]
+
+    response = await client.post("/hotels", json={
+        "name": f"Load Test Hotel {run_id}", "address": "1 Benchmark Road", "city": "Paris",
+        "state": "IDF", "country": "France", "phone_number": "+33100000000",
+    })
+    response.raise_for_status()
+    hotel_id = response.json()["id"]
+
+    response = await client.post("/users", json={
+        "email": f"load-{run_id}@example.com", "first_name": "Load", "last_name": "Test",
+        "password": uuid.uuid4().hex, "role": "guest",
+    })
+    response.raise_for_status()
+    guest_id = response.json()["id"]
+
+    now = datetime.now(timezone.utc)
+    expired_every = round(1 / EXPIRED_KEY_RATIO)
+    semaphore = asyncio.Semaphore(SEED_CONCURRENCY)
+
+    async def seed_one(index: int) -> SeededKey:
+        expired = index % expired_every == expired_every - 1
+        lock_id = f"LOAD-{run_id}-{index:05d}"
+        check_in = now - timedelta(days=3 if expired else 1)
+        check_out = now - timedelta(days=1) if expired else now + timedelta(days=2)
+        async with semaphore:
+            response = await client.post("/rooms", json={
+                "hotel_id": hotel_id, "room_number": str(1000 + index), "nfc_lock_id": lock_id,
+            })
+            response.raise_for_status()
+            response = await client.post("/reservations", json={
+                "user_id": guest_id, "room_id": response.json()["id"],
+                "check_in": check_in.isoformat(), "check_out": check_out.isoformat(),
+            })
+            response.raise_for_status()
+            response = await client.post("/keys", json={
+                "reservation_id": response.json()["id"], "pass_type": pass_type,
+            })
+            response.raise_for_status()
+        return SeededKey(response.json()["key_uuid"], lock_id, expired)
+
+    keys = await asyncio.gather(*(seed_one(index) for index in range(count)))
+    logger.info(f"Seeded {count} keys in hotel {hotel_id} ({sum(key.expired for key in keys)} expired)")
+    return list(keys)
+
+
+def load_keys(path: str) -> List[SeededKey]:
+    with open(path) as f:
+        return [SeededKey(**entry) for entry in json.load(f)]
+
+
+def save_keys(path: str, keys: List[SeededKey]) -> None:
+    with open(path, "w") as f:
+        json.dump([asdict(key) for key in keys], f, indent=1)
+
+
+class LoadRun:
+    """One open-loop run against /verify/key"""
+
+    def __init__(self, keys: List[SeededKey], mix: Dict[str, float], rng: random.Random):
+        self.valid = [key for key in keys if not key.expired]
+        self.expired = [key for key in keys if key.expired]
+        self.locks = [key.lock_id for key in keys]
+        if not self.valid:
+            raise ValueError("At least one unexpired key is needed")
+        if "expired" in mix and not self.expired:
+            raise ValueError("The tap mix asks for expired keys but none were seeded")
+
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.rng = rng
+        self.histograms = {kind: new_histogram() for kind in self.kinds}
+        self.overall = new_histogram()
+        self.errors = {kind: 0 for kind in self.kinds}
+        self.unexpected = {kind: 0 for kind in self.kinds}
+
+    def next_tap(self):
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        if kind == "valid":
+            key = self.rng.choice(self.valid)
+            return kind, key.key_uuid, key.lock_id
+        if kind == "expired":
+            key = self.rng.choice(self.expired)
+            return kind, key.key_uuid, key.lock_id
+        if kind == "wrong_lock":
+            key = self.rng.choice(self.valid)
+            lock_id = self.rng.choice(self.locks)
+            if lock_id == key.lock_id:
+                lock_id = f"{lock_id}-X"
+            return kind, key.key_uuid, lock_id
+        return kind, str(uuid.uuid4()), self.rng.choice(self.locks)
+
+    async def tap(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, due: float) -> None:
+        kind, key_uuid, lock_id = self.next_tap()
+        async with semaphore:
+            try:
+                response = await client.post("/verify/key", json={
+                    "key_uuid": key_uuid, "lock_id": lock_id,
+                    "device_info": "NFC load test", "location": "Load test",
+                })
+                response.raise_for_status()
+                if response.json()["is_valid"] != (kind == "valid"):
+                    self.unexpected[kind] += 1
+            except (httpx.HTTPError, ValueError, KeyError) as e:
+                logger.debug(f"Tap failed: {e}")
+                self.errors[kind] += 1
+        latency_us = min(max(int((time.perf_counter() - due) * 1_000_000), 1), HISTOGRAM_MAX_US)
+        self.histograms[kind].record_value(latency_us)
+        self.overall.record_value(latency_us)
+
+    async def run(self, api_url: str, rate: float, duration: float, concurrency: int) -> float:
+        """
+        Send rate taps per second for duration seconds
+
+        Returns:
+            Elapsed seconds until the last response
+        """
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        total = int(rate * duration)
+        pending = set()
+        async with httpx.AsyncClient(base_url=api_url, limits=limits, timeout=30) as client:
+            start = time.perf_counter()
+            for index in range(total):
+                due = start + index / rate
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                task = asyncio.create_task(self.tap(client, semaphore, due))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            return time.perf_counter() - start
+
+    def report(self, elapsed: float, rate: float) -> str:
+        rows = []
+        for kind, histogram in [*self.histograms.items(), ("all", self.overall)]:
+            count = histogram.get_total_count()
+            errors = sum(self.errors.values()) if kind == "all" else self.errors[kind]
+            unexpected = sum(self.unexpected.values()) if kind == "all" else self.unexpected[kind]
+            rows.append([kind, count, errors, unexpected] + [
+                f"{histogram.get_value_at_percentile(percentile) / 1000:.1f}" for percentile in (50, 95, 99)
+            ] + [f"{histogram.get_max_value() / 1000:.1f}"])
+        table = tabulate(rows, headers=["Taps", "Count", "Errors", "Unexpected", "p50 ms", "p95 ms", "p99 ms", "max ms"])
+        completed = self.overall.get_total_count()
+        return f"{table}\n\nThroughput: {completed / elapsed:.1f} taps/s (target {rate:g}) over {elapsed:.1f}s"
+
+    def save_histograms(self, path: str) -> None:
+        """Write each histogram as "<kind> <base64 HDR encoding>", one per line"""
+        with open(path, "w") as f:
+            for kind, histogram in [*self.histograms.items(), ("all", self.overall)]:
+                f.write(f"{kind} {histogram.encode().decode('ascii')}\n")
+
+
+async def get_keys(
+    api_url: str,
+    keys: int,
+    admin_email: Optional[str] = None,
+    admin_password: Optional[str] = None,
+    keys_file: Optional[str] = None,
+    pass_type: str = "google",
+) -> List[SeededKey]:
+    """Load seeded keys from keys_file, or seed them (and save them there if given)"""
+    if keys_file and os.path.exists(keys_file):
+        seeded = load_keys(keys_file)
+        logger.info(f"Loaded {len(seeded)} keys from {keys_file}")
+        return seeded
+    if not admin_email or not admin_password:
+        raise ValueError("Seeding keys needs --admin-email and --admin-password")
+    async with httpx.AsyncClient(base_url=api_url, timeout=60) as client:
+        seeded = await seed_keys(client, keys, admin_email, admin_password, pass_type)
+    if keys_file:
+        save_keys(keys_file, seeded)
+    return seeded
+
+
+async def run_load_test(
+    api_url: str,
+    keys: int,
+    rate: float,
+    duration: float,
+    concurrency: int,
+    mix: str = DEFAULT_MIX,
+    admin_email: Optional[str] = None,
+    admin_password: Optional[str] = None,
+    keys_file: Optional[str] = None,
+    histogram_file: Optional[str] = None,
+    pass_type: str = "google",
+    seed: Optional[int] = None,
+) -> LoadRun:
+    """
+    Seed keys (or reuse keys_file) and run one load test, printing the report
+
+    Seeded keys are written to keys_file when it doesn't exist yet, so later
+    runs against the same database skip seeding.
+    """
+    weights = parse_mix(mix)
+    seeded = await get_keys(api_url, keys, admin_email, admin_password, keys_file, pass_type)
+    load = LoadRun(seeded, weights, random.Random(seed))
+    logger.info(f"Sending {rate:g} taps/s for {duration:g}s with up to {concurrency} in flight")
+    elapsed = await load.run(api_url, rate, duration, concurrency)
+    print()
+    print(load.report(elapsed, rate))
+    if histogram_file:
+        load.save_histograms(histogram_file)
+        logger.info(f"Histograms written to {histogram_file}")
+    return load
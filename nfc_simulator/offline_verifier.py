@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Offline verification of hotel key credentials
+
+Keys carry an Ed25519-signed credential (Google Wallet nfcInfo message, Apple
+pass userInfo) binding the key UUID to one lock and a validity window. A lock
+holding the backend's public keys can check a tap locally without a network
+round trip, deny keys on the hotel's revocation list, and upload its decisions
+to the backend in batches. Uploads are signed with the secret shared with the
+backend (ACCESS_LOG_SECRET): header X-Access-Log-Signature: sha256=<hex
+HMAC-SHA256 of the request body>.
+
+The revocation list is polled from /verify/revocations?format=binary, passing
+the last applied version as since so that only changes are transferred:
+    format 1 byte | kind 1 byte (0 snapshot, 1 delta) | version uint64 |
+    added count uint32 | removed count uint32 |
+    added key UUIDs, 16 bytes each | removed key UUIDs, 16 bytes each
+
+Credential layout (all integers big-endian), unpadded base64url:
+    version 1 byte | kid 4 bytes | key_uuid 16 bytes |
+    valid_from uint32 | valid_until uint32 | lock_id length 1 byte + UTF-8 |
+    Ed25519 signature 64 bytes over everything before it
+
+Only depends on `cryptography`, so it can run on lock controllers.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+logger = logging.getLogger("nfc_simulator.offline")
+
+CREDENTIAL_VERSION = 1
+SIGNATURE_SIZE = 64
+_HEADER = struct.Struct(">B4s16sII")
+
+REVOCATION_FEED_FORMAT = 1
+REVOCATION_KIND_SNAPSHOT = 0
+_FEED_HEADER = struct.Struct(">BBQII")
+UUID_SIZE = 16
+
+# Tolerated drift between the lock clock and the backend clock
+DEFAULT_CLOCK_SKEW_SECONDS = 60
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+@dataclass(frozen=True)
+class Verdict:
+    """Result of checking one tap"""
+    granted: bool
+    reason: str
+    key_uuid: Optional[str] = None
+
+
+class OfflineVerifier:
+    """Validate key credentials for one lock without contacting the backend"""
+
+    def __init__(self, lock_id: str, public_keys: Dict[str, bytes], clock_skew: int = DEFAULT_CLOCK_SKEW_SECONDS):
+        """
+        Args:
+            lock_id: ID of the lock this verifier runs on
+            public_keys: Raw 32-byte Ed25519 public keys by hex kid
+            clock_skew: Seconds of tolerance on the validity window
+        """
+        self.lock_id = lock_id
+        self.clock_skew = clock_skew
+        self._keys = {
+            bytes.fromhex(kid): Ed25519PublicKey.from_public_bytes(raw)
+            for kid, raw in public_keys.items()
+        }
+        self._revoked = frozenset()
+        self.revocation_version = 0
+
+    @classmethod
+    def from_key_set(cls, lock_id: str, key_set: Dict, **kwargs) -> "OfflineVerifier":
+        """Build a verifier from the /verify/credential-keys response"""
+        return cls(
+            lock_id,
+            {key["kid"]: _b64decode(key["public_key"]) for key in key_set["keys"] if key["alg"] == "Ed25519"},
+            **kwargs,
+        )
+
+    def update_revocations(self, version: int, key_uuids: Iterable[str]) -> bool:
+        """Replace the deny-set if the list is newer; returns whether it changed"""
+        if version <= self.revocation_version:
+            return False
+        # Swapped in one assignment so concurrent verify() calls see either list
+        self._revoked = frozenset(uuid.UUID(key_uuid).bytes for key_uuid in key_uuids)
+        self.revocation_version = version
+        return True
+
+    def apply_revocation_feed(self, data: bytes) -> bool:
+        """
+        Apply a binary revocation snapshot or delta
+
+        A delta is only applied on top of the version it was requested with,
+        so a stale or reordered response is ignored.
+
+        Returns:
+            Whether the deny-set changed
+        """
+        if len(data) < _FEED_HEADER.size:
+            raise ValueError("Revocation feed too short")
+        feed_format, kind, version, added, removed = _FEED_HEADER.unpack_from(data)
+        if feed_format != REVOCATION_FEED_FORMAT:
+            raise ValueError(f"Unsupported revocation feed format: {feed_format}")
+        if len(data) != _FEED_HEADER.size + (added + removed) * UUID_SIZE:
+            raise ValueError("Revocation feed length mismatch")
+        if version <= self.revocation_version:
+            return False
+
+        offset = _FEED_HEADER.size
+        added_keys = {data[i:i + UUID_SIZE] for i in range(offset, offset + added * UUID_SIZE, UUID_SIZE)}
+        offset += added * UUID_SIZE
+        removed_keys = {data[i:i + UUID_SIZE] for i in range(offset, offset + removed * UUID_SIZE, UUID_SIZE)}
+
+        if kind == REVOCATION_KIND_SNAPSHOT:
+            revoked = frozenset(added_keys)
+        else:
+            revoked = (self._revoked - removed_keys) | added_keys
+        self._revoked = revoked
+        self.revocation_version = version
+        return True
+
+    @property
+    def revoked_count(self) -> int:
+        return len(self._revoked)
+
+    def verify(self, credential: str, now: Optional[float] = None) -> Verdict:
+        """
+        Check a tapped credential
+
+        Args:
+            credential: Credential read from the NFC message
+            now: Current time as a UNIX timestamp, defaults to the lock clock
+
+        Returns:
+            Verdict with the decision and a short reason code
+        """
+        try:
+            data = _b64decode(credential)
+        except ValueError:
+            return Verdict(False, "malformed")
+        if len(data) < _HEADER.size + 1 + SIGNATURE_SIZE:
+            return Verdict(False, "malformed")
+
+        payload, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+        version, kid, key_bytes, valid_from, valid_until = _HEADER.unpack_from(payload)
+        lock_length = payload[_HEADER.size]
+        if version != CREDENTIAL_VERSION or len(payload) != _HEADER.size + 1 + lock_length:
+            return Verdict(False, "malformed")
+
+        public_key = self._keys.get(kid)
+        if public_key is None:
+            return Verdict(False, "unknown_signing_key")
+        try:
+            public_key.verify(signature, payload)
+        except InvalidSignature:
+            return Verdict(False, "bad_signature")
+
+        key_uuid = str(uuid.UUID(bytes=key_bytes))
+        if payload[_HEADER.size + 1:].decode("utf-8") != self.lock_id:
+            return Verdict(False, "wrong_lock", key_uuid)
+        now = time.time() if now is None else now
+        if now + self.clock_skew < valid_from or now - self.clock_skew > valid_until:
+            return Verdict(False, "outside_validity_period", key_uuid)
+        if key_bytes in self._revoked:
+            return Verdict(False, "revoked", key_uuid)
+        return Verdict(True, "granted", key_uuid)
+
+
+class AccessLogBuffer:
+    """Collect offline decisions and upload them to the backend in batches"""
+
+    def __init__(
+        self,
+        api_url: str,
+        session,
+        lock_id: str,
+        device_info: str,
+        location: str,
+        max_batch: int = 500,
+        secret: Optional[str] = None,
+    ):
+        """
+        Args:
+            api_url: Backend API base URL
+            session: requests.Session (or compatible) used for uploads
+            max_batch: Entries sent per request
+            secret: Upload signing secret (defaults to the ACCESS_LOG_SECRET environment variable)
+        """
+        self.api_url = api_url
+        self.session = session
+        self.lock_id = lock_id
+        self.device_info = device_info
+        self.location = location
+        self.max_batch = max_batch
+        self.secret = secret if secret is not None else os.getenv("ACCESS_LOG_SECRET", "")
+        self._entries: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, verdict: Verdict, timestamp: Optional[datetime] = None, lock_id: Optional[str] = None) -> None:
+        """Buffer one decision; lock_id overrides the buffer's lock (gateways serve many)"""
+        entry = {
+            "key_uuid": verdict.key_uuid,
+            "lock_id": lock_id or self.lock_id,
+            "timestamp": (timestamp or datetime.now(timezone.utc)).isoformat(),
+            "granted": verdict.granted,
+            "reason": None if verdict.granted else verdict.reason,
+            "device_info": self.device_info,
+            "location": self.location,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def flush(self) -> int:
+        """
+        Upload buffered entries; entries that fail to upload are kept for the next flush
+
+        Returns:
+            Number of entries the backend accepted
+        """
+        with self._lock:
+            pending, self._entries = self._entries, []
+
+        accepted = 0
+        for start in range(0, len(pending), self.max_batch):
+            batch = pending[start:start + self.max_batch]
+            try:
+                body = json.dumps({"entries": batch}).encode("utf-8")
+                signature = hmac.new(self.secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+                response = self.session.post(
+                    f"{self.api_url}/verify/access-logs",
+                    data=body,
+                    headers={"Content-Type": "application/json", "X-Access-Log-Signature": f"sha256={signature}"},
+                )
+                response.raise_for_status()
+                accepted += response.json()["accepted"]
+            except Exception as e:
+                logger.warning(f"Access log upload failed, keeping {len(pending) - start} entries: {e}")
+                with self._lock:
+                    self._entries = pending[start:] + self._entries
+                break
+        return accepted
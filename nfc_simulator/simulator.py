@@ -18,6 +18,8 @@ from datetime import datetime
 import logging
 from tabulate import tabulate
 
+from offline_verifier import AccessLogBuffer, OfflineVerifier
+
 
 # Configure logging
 logging.basicConfig(
@@ -34,6 +36,10 @@ DEFAULT_API_URL = "https://cc1d-2a01-e0a-159-2b50-2d64-56ca-b251-5192.ngrok-free
 DEFAULT_LOCK_ID = "LOCK-A123B456"
 DEFAULT_DEVICE_INFO = "NFC Simulator v1.0"
 DEFAULT_LOCATION = "Main Entrance"
+# Offline decisions buffered before they are uploaded
+DEFAULT_LOG_BATCH = 50
+# Same default as load_test.DEFAULT_MIX, which is only imported for --load
+DEFAULT_MIX = "valid=0.7,expired=0.1,wrong_lock=0.1,unknown=0.1"
 
 
 class NFCSimulator:
@@ -47,9 +53,78 @@ class NFCSimulator:
         self.location = location
         self.session = requests.Session()
         self.access_history = []
-        
+        self.hotel_id = None
+        self.offline_verifier = None
+        self.access_logs = None
+        self.gateway = None
+
+    def enable_offline(self, hotel_id, log_batch=DEFAULT_LOG_BATCH):
+        """Verify credentials locally, fetching the signing keys and revocation list once."""
+        response = self.session.get(f"{self.api_url}/verify/credential-keys")
+        response.raise_for_status()
+        self.hotel_id = hotel_id
+        self.offline_verifier = OfflineVerifier.from_key_set(self.lock_id, response.json())
+        self.access_logs = AccessLogBuffer(self.api_url, self.session, self.lock_id, self.device_info, self.location)
+        self.log_batch = log_batch
+        self.sync()
+
+    def sync(self):
+        """Refresh the revocation list and upload buffered access logs."""
+        if not self.offline_verifier:
+            return
+        params = {"hotel_id": self.hotel_id, "format": "binary"}
+        if self.offline_verifier.revocation_version:
+            # Only fetch what changed since the last applied version
+            params["since"] = self.offline_verifier.revocation_version
+        response = self.session.get(f"{self.api_url}/verify/revocations", params=params)
+        if response.status_code == 200 and self.offline_verifier.apply_revocation_feed(response.content):
+            logger.info(f"Revocation list v{self.offline_verifier.revocation_version}: "
+                        f"{self.offline_verifier.revoked_count} keys ({len(response.content)} bytes)")
+        uploaded = self.access_logs.flush()
+        if uploaded:
+            logger.info(f"Uploaded {uploaded} access logs")
+
+    def verify_offline(self, credential):
+        """Verify a credential locally and buffer the decision for upload."""
+        verdict = self.offline_verifier.verify(credential)
+        self.access_logs.record(verdict)
+        if len(self.access_logs) >= self.log_batch:
+            self.sync()
+
+        result = {
+            "is_valid": verdict.granted,
+            "message": "Access granted" if verdict.granted else f"Denied offline: {verdict.reason}",
+        }
+        self.access_history.append({
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "key_uuid": verdict.key_uuid or credential,
+            "is_valid": verdict.granted,
+            "message": result["message"],
+            "guest_name": "N/A",
+            "room_number": "N/A"
+        })
+        return result
+
+    def attach_gateway(self, gateway):
+        """Send taps through a shared gateway instead of calling the backend directly."""
+        self.gateway = gateway
+
     def verify_key(self, key_uuid):
-        """Verify a key with the backend API."""
+        """Verify a key with the backend API, or locally if it is a credential and offline mode is on."""
+        if self.offline_verifier and not self._is_uuid(key_uuid):
+            return self.verify_offline(key_uuid)
+        if self.gateway:
+            result = self.gateway.verify(self.lock_id, key_uuid, self.device_info, self.location)
+            self.access_history.append({
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "key_uuid": key_uuid,
+                "is_valid": result["is_valid"],
+                "message": result["message"],
+                "guest_name": result.get("guest_name") or "N/A",
+                "room_number": result.get("room_number") or "N/A"
+            })
+            return result
+
         url = f"{self.api_url}/verify/key"
         
         # Prepare the payload
@@ -93,6 +168,14 @@ class NFCSimulator:
             logger.error(f"Request error: {str(e)}")
             return {"is_valid": False, "message": f"Connection error: {str(e)}"}
     
+    @staticmethod
+    def _is_uuid(value):
+        try:
+            uuid.UUID(value)
+            return True
+        except ValueError:
+            return False
+
     def simulate_key_tap(self, key_uuid):
         """Simulate a key tap on the NFC reader."""
         print("\n======================================")
@@ -103,7 +186,8 @@ class NFCSimulator:
         
         print("Verifying with backend...", end="", flush=True)
         result = self.verify_key(key_uuid)
-        time.sleep(1)  # Simulate verification delay
+        if not self.offline_verifier:
+            time.sleep(1)  # Simulate verification delay
         
         print("\r", end="")
         if result["is_valid"]:
@@ -170,6 +254,7 @@ class NFCSimulator:
                     print("  config           - Show current configuration")
                     print("  set lock <id>    - Change the lock ID")
                     print("  set location <l> - Change the location")
+                    print("  sync             - Refresh revocations and upload access logs (offline mode)")
                     print("  exit/quit        - Exit the simulator")
                 
                 elif cmd.lower().startswith("scan "):
@@ -183,6 +268,9 @@ class NFCSimulator:
                 elif cmd.lower() == "history":
                     self.show_access_history()
                 
+                elif cmd.lower() == "sync":
+                    self.sync()
+                
                 elif cmd.lower() == "config":
                     print("\nCurrent Configuration:")
                     print(f"API URL: {self.api_url}")
@@ -207,8 +295,8 @@ class NFCSimulator:
             except Exception as e:
                 print(f"Error: {str(e)}")
         
-        # if close_db:
-        #     db.close()
+        # Don't lose decisions made since the last upload
+        self.sync()
 
 
 def parse_arguments():
@@ -227,8 +315,47 @@ def parse_arguments():
     parser.add_argument("--location", default=DEFAULT_LOCATION,
                         help=f"Device location (default: {DEFAULT_LOCATION})")
     
+    parser.add_argument("--offline", metavar="HOTEL_ID", default=None,
+                        help="Verify key credentials locally for this hotel and upload access logs in batches")
+    
+    load = parser.add_argument_group("load testing", "Seed keys and benchmark /verify/key (see load_test.py)")
+    load.add_argument("--load", action="store_true",
+                      help="Run a load test instead of simulating a single lock")
+    load.add_argument("--keys", type=int, default=100,
+                      help="Keys (and locks) to seed (default: 100)")
+    load.add_argument("--rate", type=float, default=50,
+                      help="Target taps per second (default: 50)")
+    load.add_argument("--duration", type=float, default=30,
+                      help="Test duration in seconds (default: 30)")
+    load.add_argument("--concurrency", type=int, default=20,
+                      help="Maximum taps in flight (default: 20)")
+    load.add_argument("--mix", default=DEFAULT_MIX,
+                      help=f"Tap mix as kind=weight pairs (default: {DEFAULT_MIX})")
+    load.add_argument("--admin-email", default=os.getenv("LOAD_ADMIN_EMAIL"),
+                      help="Admin account used for seeding (default: $LOAD_ADMIN_EMAIL)")
+    load.add_argument("--admin-password", default=os.getenv("LOAD_ADMIN_PASSWORD"),
+                      help="Admin password used for seeding (default: $LOAD_ADMIN_PASSWORD)")
+    load.add_argument("--keys-file", default=None,
+                      help="Reuse the seeded keys in this JSON file, or save them there after seeding")
+    load.add_argument("--histograms", default=None,
+                      help="Write the HDR histograms (base64 encoded) to this file")
+    load.add_argument("--seed", type=int, default=None,
+                      help="Random seed for the tap sequence")
+    
+    gateway = parser.add_argument_group("gateway", "Compare per-tap verification with a batching gateway (see gateway.py)")
+    gateway.add_argument("--gateway", action="store_true",
+                         help="Replay the same taps per tap and through a gateway, and compare")
+    gateway.add_argument("--window-ms", type=float, default=50,
+                         help="Gateway batching window in milliseconds (default: 50)")
+    gateway.add_argument("--max-batch", type=int, default=200,
+                         help="Taps per gateway request (default: 200)")
+    gateway.add_argument("--cache-ttl", type=float, default=5,
+                         help="Seconds the gateway reuses a verdict for the same key and lock, 0 to disable (default: 5)")
+    gateway.add_argument("--repeat-ratio", type=float, default=0.2,
+                         help="Share of taps repeating a recent tap at the same lock (default: 0.2)")
+    
     parser.add_argument("key_uuid", nargs="?", default=None,
-                        help="Optional key UUID to verify. If not provided, interactive mode is started.")
+                        help="Optional key UUID or credential to verify. If not provided, interactive mode is started.")
     
     return parser.parse_args()
 
@@ -237,6 +364,47 @@ def main():
     """Main function to run the NFC simulator."""
     args = parse_arguments()
     
+    if args.gateway:
+        import asyncio
+        from gateway import run_comparison
+        from load_test import get_keys
+        
+        keys = asyncio.run(get_keys(args.api, args.keys, args.admin_email, args.admin_password, args.keys_file))
+        print(run_comparison(
+            api_url=args.api,
+            keys=keys,
+            rate=args.rate,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            mix=args.mix,
+            repeat_ratio=args.repeat_ratio,
+            window_ms=args.window_ms,
+            max_batch=args.max_batch,
+            cache_ttl=args.cache_ttl,
+            seed=args.seed,
+        ))
+        return
+    
+    if args.load:
+        # httpx and hdrhistogram are only needed for load testing
+        import asyncio
+        from load_test import run_load_test
+        
+        asyncio.run(run_load_test(
+            api_url=args.api,
+            keys=args.keys,
+            rate=args.rate,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            mix=args.mix,
+            admin_email=args.admin_email,
+            admin_password=args.admin_password,
+            keys_file=args.keys_file,
+            histogram_file=args.histograms,
+            seed=args.seed,
+        ))
+        return
+    
     # Create simulator
     simulator = NFCSimulator(
         api_url=args.api,
@@ -245,9 +413,13 @@ def main():
         location=args.location
     )
     
+    if args.offline:
+        simulator.enable_offline(args.offline)
+    
     # If key UUID provided, verify it and exit
     if args.key_uuid:
         simulator.simulate_key_tap(args.key_uuid)
+        simulator.sync()
     else:
         # Otherwise, run in interactive mode
         simulator.run_interactive_mode()